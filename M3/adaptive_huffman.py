@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+from typing import Iterable
+
+from bitstring import Bits
+
+# Width of an unseen symbol sent as a raw Unicode code point (max 0x10FFFF).
+CODE_POINT_BITS = 21
+
+
+class AdaptiveHuffmanCodec:
+    """Single-pass codec for an adaptive Huffman code (Vitter's algorithm).
+
+    Unlike HuffmanCodec, no frequency map is needed up front. Encoder and decoder both
+    start from a tree containing only the NYT ("not yet transmitted") leaf and update
+    it after every symbol, so the code always matches the counts seen so far.
+    The first occurrence of a symbol is sent as the NYT code word followed by
+    the symbol itself in a fixed number of bits.
+
+    Examples
+    --------
+    >>> test_string = "David Huffman invented Huffman coding at MIT in 1952."
+    >>> codec = AdaptiveHuffmanCodec()
+    >>> adaptive_encoding = codec.encode(test_string)
+    >>> codec.decode(adaptive_encoding)
+    'David Huffman invented Huffman coding at MIT in 1952.'
+
+    Knowing the alphabet shortens the encoding of new symbols:
+    >>> codec = AdaptiveHuffmanCodec(alphabet=sorted(set(test_string)))
+    >>> len(codec.encode(test_string)) < len(adaptive_encoding)
+    True
+    >>> codec.encode("y = 19x + 52 + c")
+    Traceback (most recent call last):
+      ...
+    ValueError: Unsupported symbol: 'y'
+    """
+
+    def __init__(self, alphabet: Iterable[str] | None = None):
+        """Constructs an AdaptiveHuffmanCodec.
+
+        Parameters
+        ----------
+        alphabet : Iterable[str] | None, optional
+            Source alphabet, by default None.
+            If None, any character may be encoded and new symbols are sent as
+            21-bit code points. Otherwise new symbols are sent as their index in
+            the alphabet, using ceil(log2(len(alphabet))) bits.
+        """
+        self.alphabet = None if alphabet is None else list(alphabet)
+        if self.alphabet is None:
+            self.symbol_bits = CODE_POINT_BITS
+        else:
+            self.symbol_bits = max(1, (len(self.alphabet) - 1).bit_length())
+            self.symbol_index = {symbol: i for i, symbol in enumerate(self.alphabet)}
+
+    def encode(self, source_data: Iterable[str]) -> Bits:
+        """Encodes the given source data in a single pass.
+
+        Parameters
+        ----------
+        source_data : Iterable[str]
+            String over source alphabet, or any iterable of its symbols (e.g. a stream).
+
+        Returns
+        -------
+        encoded_bits : Bits
+            Encoded source data.
+
+        Raises
+        ------
+        ValueError
+            If source_data contains symbols which are unsupported by the codec.
+        """
+        tree = _AdaptiveTree()
+        result = []
+        for symbol in source_data:
+            leaf = tree.leaves.get(symbol)
+            if leaf is None:
+                result.append(tree.code_word(tree.nyt))
+                result.append(format(self._symbol_to_int(symbol), f"0{self.symbol_bits}b"))
+            else:
+                result.append(tree.code_word(leaf))
+            tree.update(symbol)
+        return Bits(bin="".join(result))
+
+    def decode(self, encoded_data: Bits) -> str:
+        """Decodes the given string.
+
+        Parameters
+        ----------
+        encoded_data : Bits
+            Bitstring containing some encoded data.
+
+        Returns
+        -------
+        source_data : str
+            Original source data.
+
+        Raises
+        ------
+        ValueError
+            If encoded_data contains bits which could not be decoded.
+        """
+        bits = encoded_data.bin
+        tree = _AdaptiveTree()
+        left, right = tree.left, tree.right
+        result, position = [], 0
+        while position < len(bits):
+            node = tree.order[0]
+            while left[node] != -1:
+                if position == len(bits):
+                    raise ValueError("Could not decode.")
+                node = right[node] if bits[position] == "1" else left[node]
+                position += 1
+            if node == tree.nyt:
+                raw = bits[position:position + self.symbol_bits]
+                if len(raw) < self.symbol_bits:
+                    raise ValueError("Could not decode.")
+                symbol = self._int_to_symbol(int(raw, 2))
+                position += self.symbol_bits
+            else:
+                symbol = tree.symbol[node]
+            result.append(symbol)
+            tree.update(symbol)
+        return "".join(result)
+
+    def _symbol_to_int(self, symbol: str) -> int:
+        if self.alphabet is None:
+            return ord(symbol)
+        try:
+            return self.symbol_index[symbol]
+        except KeyError:
+            raise ValueError(f"Unsupported symbol: {symbol!r}")
+
+    def _int_to_symbol(self, value: int) -> str:
+        try:
+            return chr(value) if self.alphabet is None else self.alphabet[value]
+        except (ValueError, IndexError):
+            raise ValueError("Could not decode.")
+
+
+class _AdaptiveTree:
+    """Huffman tree maintained by Vitter's algorithm.
+
+    Nodes are integer ids into parallel lists. order lists the nodes by decreasing
+    implicit number, so the root is order[0] and the NYT leaf is order[-1].
+    Vitter's invariant keeps weights non-increasing along order and, among nodes of
+    equal weight, internal nodes ahead of leaves. A run of equal-weight nodes of the
+    same kind is a block; its first node in order is the block leader.
+    """
+
+    def __init__(self):
+        self.weight = [0]
+        self.parent = [-1]
+        self.left = [-1]
+        self.right = [-1]
+        self.symbol: list[str | None] = [None]
+        self.order = [0]
+        self.position = [0]
+        self.nyt = 0
+        self.leaves: dict[str, int] = {}
+
+    def code_word(self, node: int) -> str:
+        """Returns the code word of node as a string of '0' and '1'."""
+        bits = []
+        parent, right = self.parent, self.right
+        while parent[node] != -1:
+            bits.append("1" if right[parent[node]] == node else "0")
+            node = parent[node]
+        return "".join(reversed(bits))
+
+    def update(self, symbol: str):
+        """Increments the count of symbol and restores Vitter's invariant.
+
+        Walks from the symbol's leaf to the root, doing one slide and increment per level.
+        """
+        leaf_to_increment = -1
+        q = self.leaves.get(symbol)
+        if q is None:
+            # Split the NYT leaf into a new NYT leaf and a leaf for symbol.
+            q = self.nyt
+            leaf = self._add_node(symbol, q)
+            self.nyt = self._add_node(None, q)
+            self.left[q], self.right[q] = self.nyt, leaf
+            self.leaves[symbol] = leaf
+            leaf_to_increment = leaf
+        else:
+            self._swap(q, self._leader(q))
+            if self.left[self.parent[q]] == self.nyt:
+                leaf_to_increment = q
+                q = self.parent[q]
+        while q != -1:
+            q = self._slide_and_increment(q)
+        if leaf_to_increment != -1:
+            self._slide_and_increment(leaf_to_increment)
+
+    def _add_node(self, symbol: str | None, parent: int) -> int:
+        node = len(self.weight)
+        self.weight.append(0)
+        self.parent.append(parent)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.symbol.append(symbol)
+        self.position.append(len(self.order))
+        self.order.append(node)
+        return node
+
+    def _leader(self, node: int) -> int:
+        """Returns the leader of the block containing the leaf node."""
+        weight, left, order = self.weight, self.left, self.order
+        i = self.position[node]
+        while i > 0 and weight[order[i - 1]] == weight[node] and left[order[i - 1]] == -1:
+            i -= 1
+        return order[i]
+
+    def _slide_and_increment(self, node: int) -> int:
+        """Slides node ahead of the block that must precede it once its weight grows.
+
+        A leaf of weight w moves ahead of the internal nodes of weight w, and
+        an internal node of weight w moves ahead of the leaves of weight w + 1.
+        Returns the next node to process, or -1 after the root.
+        """
+        weight, left, order = self.weight, self.left, self.order
+        is_leaf = left[node] == -1
+        target_weight = weight[node] + (0 if is_leaf else 1)
+        start = end = self.position[node]
+        while (start > 0 and weight[order[start - 1]] == target_weight
+               and (left[order[start - 1]] == -1) != is_leaf):
+            start -= 1
+
+        former_parent = self.parent[node]
+        if start < end:
+            self._rotate(start, end)
+        weight[node] += 1
+        return self.parent[node] if is_leaf else former_parent
+
+    def _slot(self, node: int) -> tuple[int, bool]:
+        parent = self.parent[node]
+        return parent, parent != -1 and self.right[parent] == node
+
+    def _place(self, node: int, slot: tuple[int, bool], position: int):
+        parent, is_right = slot
+        self.parent[node] = parent
+        if is_right:
+            self.right[parent] = node
+        elif parent != -1:
+            self.left[parent] = node
+        self.order[position] = node
+        self.position[node] = position
+
+    def _swap(self, a: int, b: int):
+        """Exchanges the positions of nodes a and b, together with their subtrees."""
+        if a == b:
+            return
+        slot_a, slot_b = self._slot(a), self._slot(b)
+        position_a, position_b = self.position[a], self.position[b]
+        self._place(a, slot_b, position_b)
+        self._place(b, slot_a, position_a)
+
+    def _rotate(self, start: int, end: int):
+        """Moves order[end] to position start, shifting order[start:end] back by one."""
+        nodes = self.order[start:end + 1]
+        slots = [self._slot(node) for node in nodes]
+        for position, node, slot in zip(range(start, end + 1), nodes[-1:] + nodes[:-1], slots):
+            self._place(node, slot, position)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
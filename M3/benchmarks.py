@@ -0,0 +1,240 @@
+"""Throughput benchmarks for the Huffman codecs against zlib and bz2.
+
+Every codec builds its code, encodes and decodes corpora of increasing size.
+For each run, the suite reports throughput of every phase in MB/s, the size of the
+output in bits per source symbol and the peak memory allocated by each phase.
+
+Examples
+--------
+    python3 benchmarks.py                           # 1 KB to 100 MB
+    python3 benchmarks.py --max-size 1000000 --json bench.json
+    python3 benchmarks.py --codecs huffman bytes zlib-huffman --no-memory
+"""
+from __future__ import annotations
+
+import argparse
+import bz2
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import zlib
+from collections import Counter
+from typing import Any, Callable
+
+from bitstring import Bits
+
+from adaptive_huffman import AdaptiveHuffmanCodec
+from huffman import ByteHuffmanCodec, HuffmanCodec
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000]
+
+# The adaptive codec runs well under 1 MB/s, so it is skipped on larger corpora.
+ADAPTIVE_MAX_SIZE = 10_000_000
+
+
+def make_corpus(size: int, seed: int = 0) -> str:
+    """Returns size characters of English-like text with a skewed letter distribution.
+
+    Corpora above 1 MB repeat a 1 MB chunk, which is farther apart than
+    the zlib window and the bz2 block, so the baselines gain nothing from it.
+    """
+    rng = random.Random(seed)
+    letters = "etaoinshrdlcumwfgypbvkjxqz"
+    weights = [1 / (rank + 1) for rank in range(len(letters))]
+    words = ["".join(rng.choices(letters, weights, k=rng.randint(1, 9))) for _ in range(2000)]
+    chunk_size = min(size, 1_000_000)
+    corpus = []
+    length = 0
+    while length <= chunk_size:
+        word = rng.choice(words)
+        corpus.append(word)
+        length += len(word) + 1
+    chunk = " ".join(corpus)[:chunk_size]
+    return (chunk * -(-size // chunk_size))[:size]
+
+
+# A codec is a function from the source data to an (encode, decode) pair.
+# Building the codec is the construction phase, e.g. counting symbols and building the tree.
+Codec = Callable[[Any], tuple[Callable[[Any], Any], Callable[[Any], Any]]]
+
+
+def _huffman(text: str):
+    codec = HuffmanCodec(Counter(text))
+    return codec.encode, codec.decode
+
+
+def _huffman_limited(text: str):
+    codec = HuffmanCodec(Counter(text), max_code_length=15)
+    return codec.encode, codec.decode
+
+
+def _bytes(data: bytes):
+    codec = ByteHuffmanCodec(Counter(data))
+    return codec.encode, codec.decode
+
+
+def _adaptive(text: str):
+    codec = AdaptiveHuffmanCodec()
+    return codec.encode, codec.decode
+
+
+def _zlib(level: int, strategy: int = zlib.Z_DEFAULT_STRATEGY) -> Codec:
+    def build(data: bytes):
+        def encode(data: bytes) -> bytes:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, 15, 9, strategy)
+            return compressor.compress(data) + compressor.flush()
+        return encode, zlib.decompress
+    return build
+
+
+def _bz2(level: int) -> Codec:
+    def build(data: bytes):
+        return (lambda data: bz2.compress(data, level)), bz2.decompress
+    return build
+
+
+# Name -> (codec, whether it works on bytes rather than str).
+# zlib-huffman only entropy codes its input, which makes it the closest match to our codecs.
+CODECS: dict[str, tuple[Codec, bool]] = {
+    "huffman": (_huffman, False),
+    "huffman-15": (_huffman_limited, False),
+    "bytes": (_bytes, True),
+    "adaptive": (_adaptive, False),
+    "zlib-huffman": (_zlib(9, zlib.Z_HUFFMAN_ONLY), True),
+    "zlib-1": (_zlib(1), True),
+    "zlib-6": (_zlib(6), True),
+    "zlib-9": (_zlib(9), True),
+    "bz2-1": (_bz2(1), True),
+    "bz2-9": (_bz2(9), True),
+}
+
+
+def _run(function: Callable, *args, measure_memory: bool) -> tuple[Any, float, int | None]:
+    """Calls function(*args) and returns its result, wall time and peak allocated bytes.
+
+    Memory is measured in a second call, so tracing does not slow down the timed one.
+    """
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _bit_length(encoded: Bits | bytes) -> int:
+    return len(encoded) if isinstance(encoded, Bits) else 8 * len(encoded)
+
+
+def benchmark(name: str, text: str, measure_memory: bool = True) -> dict[str, Any]:
+    """Runs construction, encoding and decoding of one codec on text.
+
+    Parameters
+    ----------
+    name : str
+        Key of the codec in CODECS.
+    text : str
+        ASCII source data. Byte codecs receive it encoded as ASCII.
+    measure_memory : bool, optional
+        Whether to measure peak memory of each phase, by default True.
+
+    Returns
+    -------
+    result : dict[str, Any]
+        Throughput of each phase in MB/s, output size in bits per symbol and,
+        if measured, peak memory of each phase in MB.
+
+    Raises
+    ------
+    AssertionError
+        If decoding does not give back the source data.
+    """
+    codec, uses_bytes = CODECS[name]
+    data = text.encode("ascii") if uses_bytes else text
+    megabytes = len(text) / 1e6
+
+    (encode, decode), construct_time, construct_peak = _run(
+        codec, data, measure_memory=measure_memory)
+    encoded, encode_time, encode_peak = _run(encode, data, measure_memory=measure_memory)
+    decoded, decode_time, decode_peak = _run(decode, encoded, measure_memory=measure_memory)
+    assert decoded == data, f"{name} did not decode its own output"
+
+    result = {
+        "codec": name,
+        "size": len(text),
+        "bits_per_symbol": _bit_length(encoded) / len(text),
+        "construct_mb_s": megabytes / construct_time,
+        "encode_mb_s": megabytes / encode_time,
+        "decode_mb_s": megabytes / decode_time,
+    }
+    if measure_memory:
+        result.update({
+            "construct_peak_mb": construct_peak / 1e6,
+            "encode_peak_mb": encode_peak / 1e6,
+            "decode_peak_mb": decode_peak / 1e6,
+        })
+    return result
+
+
+def run_benchmarks(sizes: list[int] = SIZES, codecs: list[str] | None = None,
+                   measure_memory: bool = True, verbose: bool = False) -> list[dict[str, Any]]:
+    """Benchmarks every codec on a corpus of every size.
+
+    Returns one result per (size, codec) pair; see benchmark.
+    """
+    results = []
+    for size in sizes:
+        text = make_corpus(size)
+        for name in codecs or CODECS:
+            if name == "adaptive" and size > ADAPTIVE_MAX_SIZE:
+                continue
+            result = benchmark(name, text, measure_memory)
+            results.append(result)
+            if verbose:
+                print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result: dict[str, Any]) -> str:
+    line = (f"{result['size']:>11,} {result['codec']:>12}: "
+            f"{result['bits_per_symbol']:6.3f} bits/symbol | MB/s "
+            f"construct {result['construct_mb_s']:9.2f}, "
+            f"encode {result['encode_mb_s']:8.2f}, decode {result['decode_mb_s']:8.2f}")
+    if "encode_peak_mb" in result:
+        line += (f" | peak MB construct {result['construct_peak_mb']:.1f}, "
+                 f"encode {result['encode_peak_mb']:.1f}, decode {result['decode_peak_mb']:.1f}")
+    return line
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="corpus sizes in bytes")
+    parser.add_argument("--max-size", type=int, help="skip corpora larger than this")
+    parser.add_argument("--codecs", nargs="+", choices=list(CODECS), help="codecs to run")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [size for size in args.sizes if args.max_size is None or size <= args.max_size]
+    results = run_benchmarks(sizes, args.codecs, not args.no_memory, verbose=True)
+    if args.json:
+        report = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from bitstring import Bits
+
+from huffman import HuffmanCodec
+
+
+@dataclass
+class EncodedBlocks:
+    """Source data encoded as a sequence of independently decodable blocks.
+
+    Attributes
+    ----------
+    data : Bits
+        Concatenated encodings of all blocks.
+    offsets : list[int]
+        Bit offset in data where each block starts, followed by len(data).
+        Block i occupies data[offsets[i]:offsets[i + 1]].
+    block_size : int
+        Number of source symbols per block. Only the last block may be shorter.
+    length : int
+        Total number of source symbols.
+    frequency_maps : list[dict[str, int]] | None
+        Distribution used to encode each block, or None if all blocks share one code.
+    """
+    data: Bits
+    offsets: list[int]
+    block_size: int
+    length: int
+    frequency_maps: list[dict[str, int]] | None = None
+
+    @property
+    def num_blocks(self) -> int:
+        return len(self.offsets) - 1
+
+
+class BlockHuffmanCodec:
+    """Huffman codec which splits its input into fixed-size blocks.
+
+    Blocks are encoded in a process pool, either with one shared code or with a code
+    built from each block's own distribution. The block index in the output allows
+    decoding any range of blocks without decoding the data before it.
+
+    Examples
+    --------
+    >>> text = "abracadabra" * 10
+    >>> codec = BlockHuffmanCodec(Counter(text), block_size=16, max_workers=1)
+    >>> encoded = codec.encode(text)
+    >>> encoded.num_blocks
+    7
+    >>> codec.decode(encoded) == text
+    True
+    >>> codec.decode(encoded, start=2, stop=4) == text[32:64]
+    True
+
+    Without a frequency map, every block gets its own code:
+    >>> codec = BlockHuffmanCodec(block_size=16, max_workers=1)
+    >>> codec.decode(codec.encode(text), start=6) == text[96:]
+    True
+    """
+
+    def __init__(self, frequency_map: dict[str, float] | None = None, block_size: int = 1 << 16,
+                 max_workers: int | None = None, max_code_length: int | None = None):
+        """Constructs a BlockHuffmanCodec.
+
+        Parameters
+        ----------
+        frequency_map : dict[str, float] | None, optional
+            Distribution of source symbols shared by all blocks, by default None.
+            If None, each block is encoded with a code for its own distribution.
+        block_size : int, optional
+            Number of source symbols per block, by default 65536.
+        max_workers : int | None, optional
+            Number of worker processes, by default None (one per CPU).
+            With a single worker, blocks are encoded in the calling process.
+        max_code_length : int | None, optional
+            Upper bound on the length of any code word, by default None (unbounded).
+        """
+        if block_size < 1:
+            raise ValueError("Block size must be positive.")
+        self.frequency_map = frequency_map
+        self.block_size = block_size
+        self.max_workers = max_workers
+        self.max_code_length = max_code_length
+        self.codec = None if frequency_map is None else HuffmanCodec(frequency_map, max_code_length)
+
+    def encode(self, source_data: str) -> EncodedBlocks:
+        """Encodes the given source data block by block.
+
+        Parameters
+        ----------
+        source_data : str
+            String over source alphabet.
+
+        Returns
+        -------
+        encoded_blocks : EncodedBlocks
+            Encoded source data together with its block index.
+
+        Raises
+        ------
+        ValueError
+            If source_data contains symbols which are unsupported by the shared code.
+        """
+        blocks = [source_data[i:i + self.block_size]
+                  for i in range(0, len(source_data), self.block_size)]
+        if self.max_workers == 1 or len(blocks) <= 1:
+            results = [_encode_block(self.codec, self.max_code_length, block) for block in blocks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                     initargs=(self.frequency_map, self.max_code_length)) as pool:
+                results = list(pool.map(_encode_block_in_worker, blocks))
+
+        offsets = [0]
+        for _, encoding in results:
+            offsets.append(offsets[-1] + len(encoding))
+        return EncodedBlocks(
+            data=Bits().join(encoding for _, encoding in results),
+            offsets=offsets,
+            block_size=self.block_size,
+            length=len(source_data),
+            frequency_maps=None if self.codec else [frequency_map for frequency_map, _ in results],
+        )
+
+    def decode(self, encoded_blocks: EncodedBlocks, start: int = 0, stop: int | None = None) -> str:
+        """Decodes the blocks start, ..., stop - 1.
+
+        Parameters
+        ----------
+        encoded_blocks : EncodedBlocks
+            Blocks produced by a BlockHuffmanCodec with the same parameters.
+        start : int, optional
+            Index of the first block to decode, by default 0.
+        stop : int | None, optional
+            Index one past the last block to decode, by default None (all remaining blocks).
+
+        Returns
+        -------
+        source_data : str
+            Source data of the decoded blocks.
+
+        Raises
+        ------
+        ValueError
+            If the block range is invalid or the blocks contain bits which could not be decoded.
+        """
+        if stop is None:
+            stop = encoded_blocks.num_blocks
+        if not 0 <= start <= stop <= encoded_blocks.num_blocks:
+            raise ValueError(f"Invalid block range: [{start}, {stop}).")
+
+        data, offsets = encoded_blocks.data, encoded_blocks.offsets
+        if encoded_blocks.frequency_maps is None:
+            # All blocks share one code, so the whole range decodes in one pass.
+            length = (min(stop * encoded_blocks.block_size, encoded_blocks.length)
+                      - start * encoded_blocks.block_size)
+            return _decode_block(self.codec, data[offsets[start]:offsets[stop]], length)
+
+        result = []
+        for i in range(start, stop):
+            codec = HuffmanCodec(encoded_blocks.frequency_maps[i], self.max_code_length)
+            length = min(encoded_blocks.block_size,
+                         encoded_blocks.length - i * encoded_blocks.block_size)
+            result.append(_decode_block(codec, data[offsets[i]:offsets[i + 1]], length))
+        return "".join(result)
+
+
+def _encode_block(codec: HuffmanCodec | None, max_code_length: int | None,
+                  block: str) -> tuple[dict[str, int] | None, Bits]:
+    """Encodes a single block, building a code for it unless a shared codec is given."""
+    if codec is not None:
+        return None, codec.encode(block)
+    frequency_map = dict(Counter(block))
+    return frequency_map, HuffmanCodec(frequency_map, max_code_length).encode(block)
+
+
+def _decode_block(codec: HuffmanCodec, encoded_data: Bits, length: int) -> str:
+    """Decodes a single block of the given number of source symbols."""
+    if codec.root.is_leaf:
+        # A code for a single symbol has empty code words.
+        return codec.root.symbol * length
+    return codec.decode(encoded_data)
+
+
+# State of a worker process, set once by _init_worker.
+_worker_codec: HuffmanCodec | None = None
+_worker_max_code_length: int | None = None
+
+
+def _init_worker(frequency_map: dict[str, float] | None, max_code_length: int | None):
+    global _worker_codec, _worker_max_code_length
+    _worker_codec = None if frequency_map is None else HuffmanCodec(frequency_map, max_code_length)
+    _worker_max_code_length = max_code_length
+
+
+def _encode_block_in_worker(block: str) -> tuple[dict[str, int] | None, Bits]:
+    return _encode_block(_worker_codec, _worker_max_code_length, block)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass
 from functools import total_ordering
 
 from bitstring import Bits
 
 import functools
+import heapq
 
 
 
@@ -45,15 +47,27 @@ class HuffmanCodec:
     ValueError: Could not decode.
     """
 
-    def __init__(self, frequency_map: dict[str, float]):
+    def __init__(self, frequency_map: dict[str, float], max_code_length: int | None = None):
         """Constructs a HuffmanCodec for the given distribution of source symbols.
 
         Parameters
         ----------
         frequency_map : dict[str, float]
             Distribution of source symbols
+        max_code_length : int | None, optional
+            Upper bound on the length of any code word, by default None (unbounded).
+            If given, an optimal length-limited code is built with package-merge.
+
+        Raises
+        ------
+        ValueError
+            If max_code_length is too small to give every symbol a code word.
         """
-        self.root = HuffmanCodec._build_tree(frequency_map=frequency_map)
+        if max_code_length is None:
+            self.root = HuffmanCodec._build_tree(frequency_map=frequency_map)
+        else:
+            code_lengths = HuffmanCodec._package_merge(frequency_map, max_code_length)
+            self.root = HuffmanCodec._build_canonical_tree(frequency_map, code_lengths)
         self.code = self._get_code()
 
     def encode(self, source_data: str) -> Bits:
@@ -141,6 +155,97 @@ class HuffmanCodec:
             nodes.append(merged)
         return nodes[0]
 
+    @staticmethod
+    def _package_merge(frequency_map: dict[str, float], max_code_length: int) -> dict[str, int]:
+        """Computes optimal code word lengths bounded by max_code_length.
+
+        Uses the package-merge algorithm (Larmore and Hirschberg, 1990), which runs in
+        O(n * max_code_length) merges for an alphabet of n symbols.
+
+        Parameters
+        ----------
+        frequency_map : dict[str, float]
+            Distribution of source symbols.
+        max_code_length : int
+            Upper bound on the length of any code word.
+
+        Returns
+        -------
+        code_lengths : dict[str, int]
+            Dictionary mapping source symbols to code word lengths.
+
+        Examples
+        --------
+        >>> HuffmanCodec._package_merge({"a": 1, "b": 1, "c": 2, "d": 4, "e": 8}, 3)
+        {'a': 3, 'b': 3, 'c': 3, 'd': 3, 'e': 1}
+        """
+        n = len(frequency_map)
+        if n == 1:
+            return {symbol: 1 for symbol in frequency_map}
+        if max_code_length < 1 or 2 ** max_code_length < n:
+            raise ValueError(f"Cannot build a code for {n} symbols "
+                             f"with code words of at most {max_code_length} bits.")
+
+        # Each item is (weight, symbols it contains); a leaf contains only itself.
+        leaves = sorted((weight, (symbol,)) for symbol, weight in frequency_map.items())
+        items = leaves
+        for _ in range(max_code_length - 1):
+            packages = [(items[i][0] + items[i + 1][0], items[i][1] + items[i + 1][1])
+                        for i in range(0, len(items) - 1, 2)]
+            items = list(heapq.merge(leaves, packages, key=lambda item: item[0]))
+
+        # A symbol's code length is the number of selected items that contain it.
+        code_lengths = dict.fromkeys(frequency_map, 0)
+        for _, symbols in items[:2 * n - 2]:
+            for symbol in symbols:
+                code_lengths[symbol] += 1
+        return code_lengths
+
+    @staticmethod
+    def _build_canonical_tree(frequency_map: dict[str, float],
+                              code_lengths: dict[str, int]) -> TreeNode:
+        """Builds the tree of the canonical prefix code with the given code word lengths.
+
+        Parameters
+        ----------
+        frequency_map : dict[str, float]
+            Distribution of source symbols.
+        code_lengths : dict[str, int]
+            Dictionary mapping source symbols to code word lengths.
+            The lengths must satisfy the Kraft inequality.
+
+        Returns
+        -------
+        TreeNode
+            Root node of resulting tree.
+        """
+        if len(code_lengths) == 1:
+            (symbol, weight), = frequency_map.items()
+            return TreeNode(symbol, weight)
+
+        root = TreeNode(None, 0)
+        code_word, previous_length = 0, 0
+        for symbol, length in sorted(code_lengths.items(), key=lambda item: (item[1], item[0])):
+            code_word <<= length - previous_length
+            previous_length = length
+            weight = frequency_map[symbol]
+
+            node = root
+            node.weight += weight
+            for depth in range(length - 1, 0, -1):
+                if (code_word >> depth) & 1:
+                    node.right = node.right or TreeNode(None, 0)
+                    node = node.right
+                else:
+                    node.left = node.left or TreeNode(None, 0)
+                    node = node.left
+                node.weight += weight
+            if code_word & 1:
+                node.right = TreeNode(symbol, weight)
+            else:
+                node.left = TreeNode(symbol, weight)
+            code_word += 1
+        return root
 
     def _get_code(self) -> dict[str, Bits]:
         """Returns the Huffman code represented by this tree.
@@ -188,6 +293,237 @@ class TreeNode:
         return (self.weight, self.symbol) == (other.weight, other.symbol)
 
 
+# Child entry of a missing branch in the flat tree of ByteHuffmanCodec.
+# Other entries are either an internal node index (>= 0) or ~symbol for a leaf (-1 to -256).
+MISSING = -257
+
+
+class ByteHuffmanCodec:
+    """Codec for a Huffman code over the byte alphabet.
+
+    Encodes bytes-like objects without copying them. Code words and their lengths are
+    kept in 256-entry arrays indexed by byte value, and the tree is stored as flat
+    parallel child arrays, so no objects are created per symbol.
+
+    Examples
+    --------
+    >>> from collections import Counter
+    >>> test_bytes = b"David Huffman invented Huffman coding at MIT in 1952."
+    >>> codec = ByteHuffmanCodec(Counter(test_bytes))
+    >>> huffman_encoding = codec.encode(test_bytes)
+    >>> len(huffman_encoding)
+    226
+    >>> codec.decode(huffman_encoding)
+    b'David Huffman invented Huffman coding at MIT in 1952.'
+    >>> codec.decode(codec.encode(memoryview(test_bytes)[6:13]))
+    b'Huffman'
+
+    As with HuffmanCodec, unfamiliar symbols and undecodable data raise errors:
+    >>> codec.encode(b"y = 19x + 52 + c")
+    Traceback (most recent call last):
+      ...
+    ValueError: Unsupported symbol: b'y'
+    >>> codec.decode(huffman_encoding + Bits(bin="0b1"))
+    Traceback (most recent call last):
+      ...
+    ValueError: Could not decode.
+    """
+
+    def __init__(self, frequency_map: dict[int, float], max_code_length: int | None = None):
+        """Constructs a ByteHuffmanCodec for the given distribution of byte values.
+
+        Parameters
+        ----------
+        frequency_map : dict[int, float]
+            Distribution of byte values, e.g. a Counter of a bytes object.
+        max_code_length : int | None, optional
+            Upper bound on the length of any code word, by default None (unbounded).
+
+        Raises
+        ------
+        ValueError
+            If a symbol is not a byte value, or if some code word would exceed 64 bits.
+        """
+        for symbol in frequency_map:
+            if not 0 <= symbol < 256:
+                raise ValueError(f"Unsupported symbol: {symbol!r}")
+        if max_code_length is None:
+            code_lengths = ByteHuffmanCodec._code_lengths(frequency_map)
+        else:
+            code_lengths = HuffmanCodec._package_merge(frequency_map, max_code_length)
+        if max(code_lengths.values()) > 64:
+            raise ValueError("Code words longer than 64 bits are not supported, "
+                             "use max_code_length.")
+
+        self.code_lengths = array("B", bytes(256))
+        self.code_words = array("Q", bytes(8 * 256))
+        # Internal node i has children left[i] and right[i]; the root is node 0.
+        self.left = array("h", [MISSING])
+        self.right = array("h", [MISSING])
+        code_word, previous_length = 0, 0
+        for symbol in sorted(code_lengths, key=lambda symbol: (code_lengths[symbol], symbol)):
+            length = code_lengths[symbol]
+            code_word <<= length - previous_length
+            previous_length = length
+            self.code_lengths[symbol] = length
+            self.code_words[symbol] = code_word
+
+            node = 0
+            for depth in range(length - 1, 0, -1):
+                children = self.right if (code_word >> depth) & 1 else self.left
+                if children[node] == MISSING:
+                    children[node] = len(self.left)
+                    self.left.append(MISSING)
+                    self.right.append(MISSING)
+                node = children[node]
+            (self.right if code_word & 1 else self.left)[node] = ~symbol
+            code_word += 1
+
+        # Code words as strings of '0' and '1', so that encode can join them in one call.
+        self._bin_code = [format(self.code_words[symbol], f"0{self.code_lengths[symbol]}b")
+                          if symbol in code_lengths else None for symbol in range(256)]
+        self._next_state = None
+        self._output = None
+
+    def encode(self, source_data: bytes | bytearray | memoryview) -> Bits:
+        """Encodes the given source data.
+
+        Parameters
+        ----------
+        source_data : bytes | bytearray | memoryview
+            Bytes over source alphabet.
+
+        Returns
+        -------
+        encoded_bits : Bits
+            Encoded source data.
+
+        Raises
+        ------
+        ValueError
+            If source_data contains symbols which are unsupported by the codec.
+        """
+        source_data = memoryview(source_data).cast("B")
+        try:
+            return Bits(bin="".join(map(self._bin_code.__getitem__, source_data)))
+        except TypeError:
+            symbol = next(symbol for symbol in source_data if self._bin_code[symbol] is None)
+            raise ValueError(f"Unsupported symbol: {bytes([symbol])!r}")
+
+    def decode(self, encoded_data: Bits) -> bytes:
+        """Decodes the given string.
+
+        The encoded data is consumed a byte at a time through a table of
+        (tree node, input byte) -> (next tree node, decoded symbols).
+
+        Parameters
+        ----------
+        encoded_data : Bits
+            Bitstring containing some encoded data.
+
+        Returns
+        -------
+        source_data : bytes
+            Original source data.
+
+        Raises
+        ------
+        ValueError
+            If encoded_data contains bits which could not be decoded.
+        """
+        if self._next_state is None:
+            self._build_decode_table()
+        next_state, output = self._next_state, self._output
+
+        num_bytes, num_tail_bits = divmod(len(encoded_data), 8)
+        data = encoded_data.tobytes()
+        result, state = [], 0
+        for byte in memoryview(data)[:num_bytes]:
+            index = state << 8 | byte
+            state = next_state[index]
+            if state < 0:
+                raise ValueError("Could not decode.")
+            result.append(output[index])
+
+        if num_tail_bits:
+            tail = []
+            state = self._walk(state, data[num_bytes] >> (8 - num_tail_bits), num_tail_bits, tail)
+            result.append(bytes(tail))
+        if state != 0:
+            raise ValueError("Could not decode.")
+        return b"".join(result)
+
+    def _walk(self, node: int, bits: int, num_bits: int, output: list[int]) -> int:
+        """Follows num_bits bits (most significant first) from an internal node.
+
+        Appends decoded symbols to output and returns the node reached, or -1 on a missing branch.
+        """
+        for shift in range(num_bits - 1, -1, -1):
+            child = (self.right if (bits >> shift) & 1 else self.left)[node]
+            if child == MISSING:
+                return -1
+            if child < 0:
+                output.append(~child)
+                node = 0
+            else:
+                node = child
+        return node
+
+    def _build_decode_table(self):
+        """Builds the byte-at-a-time decoding table for every internal node."""
+        num_states = len(self.left)
+        self._next_state = array("h", bytes(2 * (num_states << 8)))
+        self._output = [b""] * (num_states << 8)
+        for state in range(num_states):
+            for byte in range(256):
+                output = []
+                self._next_state[state << 8 | byte] = self._walk(state, byte, 8, output)
+                self._output[state << 8 | byte] = bytes(output)
+
+    @staticmethod
+    def _code_lengths(frequency_map: dict[int, float]) -> dict[int, int]:
+        """Computes Huffman code word lengths without building tree nodes.
+
+        Uses the two-queue construction: after sorting the leaves by weight, merged nodes
+        are created in order of weight, so both queues are plain index ranges.
+
+        Parameters
+        ----------
+        frequency_map : dict[int, float]
+            Distribution of byte values.
+
+        Returns
+        -------
+        code_lengths : dict[int, int]
+            Dictionary mapping byte values to code word lengths.
+        """
+        symbols = sorted(frequency_map, key=frequency_map.__getitem__)
+        n = len(symbols)
+        if n == 1:
+            return {symbols[0]: 1}
+
+        # Nodes 0..n-1 are the sorted leaves, nodes n..2n-2 the merged nodes.
+        weight = [frequency_map[symbol] for symbol in symbols]
+        parent = array("h", bytes(2 * (2 * n - 1)))
+        leaf, merged = 0, n
+        for node in range(n, 2 * n - 1):
+            total = 0
+            for _ in range(2):
+                if leaf < n and (merged == node or weight[leaf] <= weight[merged]):
+                    child, leaf = leaf, leaf + 1
+                else:
+                    child, merged = merged, merged + 1
+                parent[child] = node
+                total += weight[child]
+            weight.append(total)
+
+        # Parents are created after their children, so depths can be filled in reverse.
+        depth = array("B", bytes(2 * n - 1))
+        for node in range(2 * n - 3, -1, -1):
+            depth[node] = depth[parent[node]] + 1
+        return {symbols[i]: depth[i] for i in range(n)}
+
+
 if __name__ == "__main__":
     import doctest
     doctest.testmod()
\ No newline at end of file
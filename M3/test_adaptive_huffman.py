@@ -0,0 +1,76 @@
+from collections import Counter
+
+from bitstring import Bits
+import pytest
+
+import adaptive_huffman
+import huffman
+from test_huffman import TEXTS, EXPECTED_LENGTHS
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_texts(text):
+    codec = adaptive_huffman.AdaptiveHuffmanCodec()
+    assert codec.decode(codec.encode(text)) == text
+
+
+@pytest.mark.parametrize("text,expected_length", zip(TEXTS, EXPECTED_LENGTHS))
+def test_alphabet(text, expected_length):
+    alphabet = sorted(set(text))
+    codec = adaptive_huffman.AdaptiveHuffmanCodec(alphabet)
+    adaptive_encoding = codec.encode(text)
+    # The adaptive code pays for learning the distribution, but not by much.
+    assert len(adaptive_encoding) <= expected_length + len(alphabet) * (codec.symbol_bits + 8)
+    assert codec.decode(adaptive_encoding) == text
+
+
+def test_stream():
+    text = TEXTS[1]
+    codec = adaptive_huffman.AdaptiveHuffmanCodec()
+    assert codec.encode(iter(text)) == codec.encode(text)
+    assert codec.decode(codec.encode(symbol for symbol in text)) == text
+
+
+@pytest.mark.parametrize("text", TEXTS + ["a", "aaaaab", "ab" * 40])
+def test_tree_is_huffman_tree(text):
+    # After every update, the tree must be optimal for the counts seen so far.
+    tree = adaptive_huffman._AdaptiveTree()
+    for i, symbol in enumerate(text):
+        tree.update(symbol)
+        frequency_map = Counter(text[:i + 1])
+        frequency_map[None] = 0  # The NYT leaf.
+        codec = huffman.HuffmanCodec(frequency_map)
+        expected = sum(len(codec.code[s]) * weight for s, weight in frequency_map.items())
+        actual = sum(tree.weight[leaf] * len(tree.code_word(leaf)) for leaf in tree.leaves.values())
+        assert actual == expected
+
+
+def test_empty():
+    codec = adaptive_huffman.AdaptiveHuffmanCodec()
+    assert codec.encode("") == Bits()
+    assert codec.decode(Bits()) == ""
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_encoding_error(text):
+    codec = adaptive_huffman.AdaptiveHuffmanCodec(set(text))
+    text = text[:len(text)//2] + "&" + text[len(text)//2:]
+    with pytest.raises(ValueError, match="Unsupported symbol: '&'"):
+        codec.encode(text)
+
+
+def test_decoding_error():
+    text = "aaaaaabbbbbccccddd"
+    codec = adaptive_huffman.AdaptiveHuffmanCodec("abcd")
+    adaptive_encoding = codec.encode(text)
+
+    with pytest.raises(ValueError, match="Could not decode."):
+        codec.decode(adaptive_encoding + Bits(bin="0b1"))
+
+    with pytest.raises(ValueError, match="Could not decode."):
+        codec.decode(adaptive_encoding[:-1])
+
+
+def test_doctest():
+    import doctest
+    assert doctest.testmod(adaptive_huffman).failed == 0
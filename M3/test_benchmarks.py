@@ -0,0 +1,26 @@
+import json
+
+import pytest
+
+import benchmarks
+
+
+@pytest.mark.parametrize("size", [1_000, 10_000, 2_500_000])
+def test_make_corpus(size):
+    corpus = benchmarks.make_corpus(size)
+    assert len(corpus) == size
+    assert corpus.isascii()
+
+
+def test_run_benchmarks(tmp_path):
+    path = tmp_path / "bench.json"
+    benchmarks.main(["--sizes", "1000", "2000", "--max-size", "1000", "--json", str(path)])
+    with open(path) as f:
+        report = json.load(f)
+    results = report["results"]
+    assert [result["codec"] for result in results] == list(benchmarks.CODECS)
+    for result in results:
+        assert result["size"] == 1000
+        assert result["bits_per_symbol"] > 0
+        assert result["encode_mb_s"] > 0 and result["decode_mb_s"] > 0
+        assert result["encode_peak_mb"] >= 0
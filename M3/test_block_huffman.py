@@ -0,0 +1,64 @@
+from collections import Counter
+
+import pytest
+
+import block_huffman
+from test_huffman import TEXTS
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("shared", [True, False])
+def test_round_trip(text, shared):
+    frequency_map = Counter(text) if shared else None
+    codec = block_huffman.BlockHuffmanCodec(frequency_map, block_size=64, max_workers=2)
+    encoded = codec.encode(text)
+    assert encoded.num_blocks == -(-len(text) // 64)
+    assert encoded.offsets[-1] == len(encoded.data)
+    assert codec.decode(encoded) == text
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_random_access(shared):
+    text = "".join(TEXTS)
+    frequency_map = Counter(text) if shared else None
+    codec = block_huffman.BlockHuffmanCodec(frequency_map, block_size=100, max_workers=1)
+    encoded = codec.encode(text)
+    for start in range(encoded.num_blocks):
+        for stop in (start, start + 1, encoded.num_blocks):
+            assert codec.decode(encoded, start, stop) == text[start * 100:stop * 100]
+
+
+def test_shared_code_matches_huffman_codec():
+    text = TEXTS[2]
+    codec = block_huffman.BlockHuffmanCodec(Counter(text), block_size=128, max_workers=2)
+    encoded = codec.encode(text)
+    assert encoded.data == codec.codec.encode(text)
+
+
+def test_single_symbol_blocks():
+    text = "a" * 50 + "ab" * 25
+    codec = block_huffman.BlockHuffmanCodec(block_size=10, max_workers=1)
+    assert codec.decode(codec.encode(text)) == text
+
+
+def test_empty():
+    codec = block_huffman.BlockHuffmanCodec(Counter("abc"))
+    encoded = codec.encode("")
+    assert encoded.num_blocks == 0
+    assert codec.decode(encoded) == ""
+
+
+def test_errors():
+    with pytest.raises(ValueError, match="Block size must be positive."):
+        block_huffman.BlockHuffmanCodec(block_size=0)
+    codec = block_huffman.BlockHuffmanCodec(Counter("abc"), block_size=2, max_workers=1)
+    encoded = codec.encode("abcabc")
+    with pytest.raises(ValueError, match="Unsupported symbol: 'd'"):
+        codec.encode("abcd")
+    with pytest.raises(ValueError, match=r"Invalid block range: \[2, 4\)."):
+        codec.decode(encoded, 2, 4)
+
+
+def test_doctest():
+    import doctest
+    assert doctest.testmod(block_huffman).failed == 0
@@ -113,3 +113,97 @@ def test_decoding_error():
     bad_encoding1 = Bits(bin="0b0") + huffman_encoding
     with pytest.raises(ValueError, match="Could not decode."):
         codec.decode(bad_encoding1)
+
+
+FIBONACCI = [1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, 233, 377, 610, 987, 1597, 2584, 4181, 6765]
+
+
+def encoded_length(codec, frequency_map):
+    return sum(len(codec.code[symbol]) * weight for symbol, weight in frequency_map.items())
+
+
+@pytest.mark.parametrize("max_code_length", [5, 8, 12, 15])
+def test_max_code_length(max_code_length):
+    # Fibonacci weights give the deepest possible Huffman tree.
+    frequency_map = {chr(ord("a") + i): weight for i, weight in enumerate(FIBONACCI)}
+    text = "".join(symbol * weight for symbol, weight in frequency_map.items())
+    optimal = huffman.HuffmanCodec(frequency_map)
+    assert max(len(word) for word in optimal.code.values()) == len(FIBONACCI) - 1
+
+    codec = huffman.HuffmanCodec(frequency_map, max_code_length=max_code_length)
+    assert max(len(word) for word in codec.code.values()) <= max_code_length
+    assert sum(2 ** -len(word) for word in codec.code.values()) == 1
+    huffman_encoding = codec.encode(text)
+    assert codec.decode(huffman_encoding) == text
+    assert len(huffman_encoding) == encoded_length(codec, frequency_map)
+    if max_code_length >= 12:
+        assert len(huffman_encoding) <= 1.001 * encoded_length(optimal, frequency_map)
+
+
+@pytest.mark.parametrize("text,expected_length", zip(TEXTS, EXPECTED_LENGTHS))
+def test_max_code_length_not_binding(text, expected_length):
+    # A limit above the Huffman tree depth must still produce an optimal code.
+    frequency_map = Counter(text)
+    codec = huffman.HuffmanCodec(frequency_map, max_code_length=len(frequency_map))
+    huffman_encoding = codec.encode(text)
+    assert len(huffman_encoding) <= expected_length
+    assert codec.decode(huffman_encoding) == text
+
+
+def test_max_code_length_too_small():
+    frequency_map = Counter("abcde")
+    with pytest.raises(ValueError, match="Cannot build a code for 5 symbols"):
+        huffman.HuffmanCodec(frequency_map, max_code_length=2)
+
+
+@pytest.mark.parametrize("text,expected_length", zip(TEXTS, EXPECTED_LENGTHS))
+def test_bytes(text, expected_length):
+    data = text.encode("ascii")
+    codec = huffman.ByteHuffmanCodec(Counter(data))
+    huffman_encoding = codec.encode(data)
+    assert len(huffman_encoding) <= expected_length
+    assert codec.decode(huffman_encoding) == data
+    assert codec.encode(memoryview(bytearray(data))) == huffman_encoding
+
+
+@pytest.mark.parametrize("max_code_length", [None, 8, 12])
+def test_bytes_all_values(max_code_length):
+    data = bytes(range(256)) * 3 + bytes(range(0, 256, 7)) * 50
+    codec = huffman.ByteHuffmanCodec(Counter(data), max_code_length=max_code_length)
+    assert max(codec.code_lengths) <= (max_code_length or 64)
+    huffman_encoding = codec.encode(data)
+    assert len(huffman_encoding) == sum(codec.code_lengths[byte] for byte in data)
+    assert codec.decode(huffman_encoding) == data
+    # Every tail length must be handled after the byte-at-a-time loop.
+    for end in range(1, 40):
+        assert codec.decode(codec.encode(data[-end:])) == data[-end:]
+
+
+def test_bytes_matches_str_codec():
+    # Both constructions are optimal, so they give the same total length.
+    frequency_map = {chr(ord("a") + i): weight for i, weight in enumerate(FIBONACCI)}
+    byte_map = {ord(symbol): weight for symbol, weight in frequency_map.items()}
+    codec = huffman.HuffmanCodec(frequency_map)
+    byte_codec = huffman.ByteHuffmanCodec(byte_map)
+    assert (sum(byte_codec.code_lengths[symbol] * weight for symbol, weight in byte_map.items())
+            == encoded_length(codec, frequency_map))
+
+
+def test_bytes_single_symbol():
+    codec = huffman.ByteHuffmanCodec({7: 3})
+    assert codec.decode(codec.encode(b"\x07" * 5)) == b"\x07" * 5
+
+
+def test_bytes_errors():
+    data = b"aaaaaabbbbbccccddd"
+    codec = huffman.ByteHuffmanCodec(Counter(data))
+    with pytest.raises(ValueError, match="Unsupported symbol: b'&'"):
+        codec.encode(data + b"&")
+    with pytest.raises(ValueError, match="Unsupported symbol: 256"):
+        huffman.ByteHuffmanCodec({256: 1})
+
+    huffman_encoding = codec.encode(data)
+    with pytest.raises(ValueError, match="Could not decode."):
+        codec.decode(huffman_encoding + Bits(bin="0b0"))
+    with pytest.raises(ValueError, match="Could not decode."):
+        codec.decode(Bits(bin="0b0") + huffman_encoding)
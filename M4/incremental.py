@@ -0,0 +1,380 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, Sequence, Set, Union
+
+import numpy as np
+
+from raster import drainable_array, format_mask, label_array
+
+
+class IslandIndex:
+    """
+    Islands of a height map, kept up to date while single cells change height.
+
+    After an edit, only the cells whose drainage can change are looked at, and only the
+    islands which gain or lose a cell are relabeled:
+
+    - Drainage. A cell drains if it is at sea level or a strictly lower neighbor drains.
+      The edited cell and its neighbors are recomputed in increasing height order, and
+      any cell whose drainage changes queues the higher neighbors that depend on it.
+    - Land that disappears may split its island. A search starts from every remaining
+      neighbor of the removed cells, and the searches take turns visiting one cell each,
+      merging when they meet. Once a single search is left, every other one has found a
+      whole new island, so the work is proportional to the smaller parts.
+    - Land that appears joins the islands next to it. The smaller islands are relabeled
+      into the largest one.
+
+    The largest island is kept in a heap of island sizes, with ties broken by the first
+    cell in row-major order as in `noahs_ark.largest_island`. First cells are kept up to
+    date along with the labels, and an island is only searched again for its first cell
+    when that cell is removed and the island is tied for the largest.
+
+    Examples
+    --------
+    >>> index = IslandIndex([[1, 1, 0, 1],
+    ...                      [0, 0, 0, 1]])
+    >>> index.largest_size()
+    2
+    >>> index.set_height(0, 2, 1)
+    >>> index.largest_size()
+    5
+    >>> index.set_height(0, 1, -3)
+    >>> index.largest_island(output="list")
+    [[False, False, True, True], [False, False, False, True]]
+    """
+
+    def __init__(self, heights: Union[np.ndarray, Sequence[Sequence[int]]]):
+        """
+        Label the islands of a height map.
+
+        Parameters
+        ----------
+        heights : Union[np.ndarray, Sequence[Sequence[int]]]
+            n x m array of heights
+        """
+        heights = np.asarray(heights)
+        self.shape = self.n, self.m = heights.shape
+        drains = drainable_array(heights)
+        labels, sizes = label_array(drains & (heights > 0))
+
+        self._heights: List[int] = heights.ravel().tolist()
+        self._drains: List[bool] = drains.ravel().tolist()
+        self._labels: List[int] = labels.ravel().tolist()
+        cells = np.flatnonzero(labels)
+        _, first = np.unique(labels.ravel()[cells], return_index=True)
+        # Some cell of every island, to search it from
+        self._anchors: Dict[int, int] = dict(enumerate(cells[first].tolist(), 1))
+        self._sizes: Dict[int, int] = dict(enumerate(sizes[1:].tolist(), 1))
+        self._first_cells: Dict[int, int] = dict(self._anchors)
+        self._next_label = len(sizes)
+        # Entries (-size, label), which are stale once the label has another size
+        self._heap = [(-size, label) for label, size in self._sizes.items()]
+        heapq.heapify(self._heap)
+
+    def height(self, i: int, j: int) -> int:
+        """
+        Return the height of cell (i, j).
+        """
+        return self._heights[i * self.m + j]
+
+    def set_height(self, i: int, j: int, height: int) -> None:
+        """
+        Change the height of cell (i, j) and update the islands.
+
+        Parameters
+        ----------
+        i : int
+            Line number of the cell
+        j : int
+            Column number of the cell
+        height : int
+            New height of the cell
+        """
+        if not (0 <= i < self.n and 0 <= j < self.m):
+            raise IndexError(f"Cell ({i}, {j}) is outside the {self.n} x {self.m} grid.")
+        k = i * self.m + j
+        if self._heights[k] == height:
+            return
+        self._heights[k] = height
+        changed = set(self._update_drains(k))
+        changed.add(k)
+
+        heights, drains, labels = self._heights, self._drains, self._labels
+        removed = [c for c in changed if labels[c] and not (heights[c] > 0 and drains[c])]
+        added = [c for c in changed if not labels[c] and heights[c] > 0 and drains[c]]
+        if removed:
+            self._remove(removed)
+        for c in added:
+            self._add(c)
+
+    def largest_size(self) -> int:
+        """
+        Return the number of cells of the largest island.
+        """
+        label = self._largest_label()
+        return 0 if label == 0 else self._sizes[label]
+
+    def largest_island(self, output: str = "array") -> Union[List[List[bool]], np.ndarray]:
+        """
+        Return the mask of the largest island.
+
+        Parameters
+        ----------
+        output : str
+            Form of the mask, see `raster.format_mask`
+
+        Returns
+        -------
+        mask : Union[List[List[bool]], np.ndarray]
+            Boolean mask of the largest island
+        """
+        label = self._largest_label()
+        mask = np.zeros(self.shape, dtype=bool)
+        if label:
+            mask.ravel()[self._island_cells(label)] = True
+        return format_mask(mask, output)
+
+    def _neighbors(self, k: int) -> List[int]:
+        """
+        The four cells sharing a side with cell k.
+        """
+        m = self.m
+        j = k % m
+        neighbors = []
+        if k >= m:
+            neighbors.append(k - m)
+        if k + m < len(self._heights):
+            neighbors.append(k + m)
+        if j > 0:
+            neighbors.append(k - 1)
+        if j < m - 1:
+            neighbors.append(k + 1)
+        return neighbors
+
+    def _surrounding(self, k: int) -> List[int]:
+        """
+        The eight cells around cell k.
+        """
+        m = self.m
+        j = k % m
+        size = len(self._heights)
+        return [x for di in (-m, 0, m) for dj in (-1, 0, 1) if di or dj
+                for x in (k + di + dj,) if 0 <= x < size and 0 <= j + dj < m]
+
+    def _update_drains(self, k: int) -> List[int]:
+        """
+        Recompute drainage around cell k after its height changed, and return the cells
+        whose drainage changed.
+        """
+        heights, drains = self._heights, self._drains
+        queued = {k, *self._surrounding(k)}
+        heap = [(heights[x], x) for x in queued]
+        heapq.heapify(heap)
+        changed = []
+        while heap:
+            h, x = heapq.heappop(heap)
+            neighbors = self._surrounding(x)
+            new = h <= 0 or any(drains[y] and heights[y] < h for y in neighbors)
+            if new == drains[x]:
+                continue
+            drains[x] = new
+            changed.append(x)
+            # Only strictly higher cells can drain through x.
+            for y in neighbors:
+                if heights[y] > h and y not in queued:
+                    queued.add(y)
+                    heapq.heappush(heap, (heights[y], y))
+        return changed
+
+    def _island_cells(self, label: int) -> List[int]:
+        """
+        All cells of an island, found by a search from its anchor.
+        """
+        labels = self._labels
+        start = self._anchors[label]
+        cells = [start]
+        seen = {start}
+        for c in cells:
+            for y in self._neighbors(c):
+                if labels[y] == label and y not in seen:
+                    seen.add(y)
+                    cells.append(y)
+        return cells
+
+    def _resized(self, label: int) -> None:
+        """
+        Record that an island gained or lost cells.
+        """
+        if self._sizes[label]:
+            heapq.heappush(self._heap, (-self._sizes[label], label))
+        else:
+            del self._sizes[label], self._anchors[label]
+            self._first_cells.pop(label, None)
+
+    def _new_island(self, cells: Iterable[int]) -> int:
+        label = self._next_label
+        self._next_label += 1
+        cells = list(cells)
+        for c in cells:
+            self._labels[c] = label
+        self._sizes[label] = len(cells)
+        self._anchors[label] = cells[0]
+        self._first_cells[label] = min(cells)
+        self._resized(label)
+        return label
+
+    def _add(self, c: int) -> None:
+        """
+        Make cell c land, merging the islands next to it.
+        """
+        labels, sizes = self._labels, self._sizes
+        touching = {labels[y] for y in self._neighbors(c) if labels[y]}
+        if not touching:
+            self._new_island([c])
+            return
+        label = max(touching, key=sizes.__getitem__)
+        first_cells = self._first_cells
+        # The first cell of the merged island is the first of those of its parts and c,
+        # unless one of them is unknown.
+        firsts = [first_cells.get(x) for x in touching] + [c]
+        for other in touching - {label}:
+            for x in self._island_cells(other):
+                labels[x] = label
+            sizes[label] += sizes[other]
+            sizes[other] = 0
+            self._resized(other)
+        labels[c] = label
+        sizes[label] += 1
+        if None in firsts:
+            first_cells.pop(label, None)
+        else:
+            first_cells[label] = min(firsts)
+        self._resized(label)
+
+    def _remove(self, cells: List[int]) -> None:
+        """
+        Make the given cells water, splitting the islands they belonged to.
+        """
+        labels, sizes = self._labels, self._sizes
+        islands: Set[int] = set()
+        for c in cells:
+            islands.add(labels[c])
+            if self._first_cells.get(labels[c]) == c:
+                del self._first_cells[labels[c]]
+            sizes[labels[c]] -= 1
+            labels[c] = 0
+        seeds: Dict[int, Set[int]] = {label: set() for label in islands}
+        for c in cells:
+            for y in self._neighbors(c):
+                if labels[y] in seeds:
+                    seeds[labels[y]].add(y)
+        for label in islands:
+            if seeds[label]:
+                self._split(label, sorted(seeds[label]))
+            else:
+                self._resized(label)
+
+    def _split(self, label: int, seeds: List[int]) -> None:
+        """
+        Relabel the parts of an island which lost cells, given a remaining cell next to
+        the lost cells in each part. The largest part found last keeps the label.
+        """
+        labels = self._labels
+        if len(seeds) == 1:
+            self._anchors[label] = seeds[0]
+            self._resized(label)
+            return
+
+        # One search per seed. Searches that meet are merged in a union-find over seeds.
+        owner = {seed: s for s, seed in enumerate(seeds)}
+        parent = list(range(len(seeds)))
+        queues: List[deque] = [deque([seed]) for seed in seeds]
+        active = set(range(len(seeds)))
+        finished = []
+
+        def find(s: int) -> int:
+            while parent[s] != s:
+                parent[s] = parent[parent[s]]
+                s = parent[s]
+            return s
+
+        while len(active) > 1:
+            for s in sorted(active):
+                if s not in active:
+                    continue
+                if not queues[s]:
+                    active.remove(s)
+                    finished.append(s)
+                    continue
+                c = queues[s].popleft()
+                for y in self._neighbors(c):
+                    if labels[y] != label:
+                        continue
+                    t = owner.get(y)
+                    if t is None:
+                        owner[y] = s
+                        queues[s].append(y)
+                        continue
+                    t = find(t)
+                    if t != s:
+                        # Keep the longer queue, so every cell is moved O(log) times.
+                        if len(queues[t]) > len(queues[s]):
+                            s, t = t, s
+                        parent[t] = s
+                        queues[s].extend(queues[t])
+                        queues[t] = deque()
+                        active.discard(t)
+
+        if active:
+            keeper = active.pop()
+        else:
+            # Every part was found, so the last one keeps the label.
+            keeper = finished.pop()
+        parts: Dict[int, List[int]] = {s: [] for s in finished}
+        for c, s in owner.items():
+            s = find(s)
+            if s in parts:
+                parts[s].append(c)
+        for cells in parts.values():
+            self._sizes[label] -= len(cells)
+            self._new_island(cells)
+        first = self._first_cells.get(label)
+        if first is not None and labels[first] != label:
+            # The first cell went to a new island.
+            del self._first_cells[label]
+        self._anchors[label] = seeds[keeper]
+        self._resized(label)
+
+    def _first_cell(self, label: int) -> int:
+        """
+        First cell of an island in row-major order, searched for if unknown.
+        """
+        if label not in self._first_cells:
+            self._first_cells[label] = min(self._island_cells(label))
+        return self._first_cells[label]
+
+    def _largest_label(self) -> int:
+        """
+        Label of the largest island, or 0 if there is no island.
+        """
+        heap, sizes = self._heap, self._sizes
+        while heap and sizes.get(heap[0][1]) != -heap[0][0]:
+            heapq.heappop(heap)
+        if not heap:
+            return 0
+        size = -heap[0][0]
+        tied = set()
+        while heap and heap[0][0] == -size:
+            _, label = heapq.heappop(heap)
+            if sizes.get(label) == size:
+                tied.add(label)
+        for label in tied:
+            heapq.heappush(heap, (-size, label))
+        if len(tied) == 1:
+            return next(iter(tied))
+        return min(tied, key=self._first_cell)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
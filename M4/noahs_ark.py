@@ -1,6 +1,10 @@
-from typing import List, Tuple, Dict
+from typing import List, Sequence, Tuple, Dict, Union
 from collections import defaultdict, Counter
 
+import numpy as np
+
+from raster import OUTPUTS, format_mask, largest_island_array
+
 
 def get_neighbors(n: int, m: int, i: int, j: int) -> List[Tuple[int, int]]:
     """
@@ -32,7 +36,107 @@ def get_neighbors(n: int, m: int, i: int, j: int) -> List[Tuple[int, int]]:
     return neighbors
 
 
-def largest_island(heights: List[List[int]]) -> List[List[bool]]:
+def label_islands(land: Sequence[bool], n: int, m: int) -> Tuple[List[int], List[int]]:
+    """
+    Label the 4-connected components of land in a grid.
+
+    The grid is flattened in row-major order, so cell (i, j) has index i * m + j and
+    its neighbors are the indices k - m, k + m, k - 1 and k + 1 that lie in the grid.
+    Components are grown with an explicit stack instead of recursion, and every cell
+    is pushed at most once, so this takes O(nm) time regardless of component shape.
+
+    Parameters
+    ----------
+    land : Sequence[bool]
+        Flattened n x m grid, true for land cells
+    n : int
+        Number of rows in the grid
+    m : int
+        Number of columns in the grid
+
+    Returns
+    -------
+        labels : List[int]
+            Component of every cell, numbered from 1 in order of their first cell,
+            or 0 for cells which are not land
+        sizes : List[int]
+            Number of cells in every component, with sizes[0] = 0
+    """
+    size = n * m
+    labels = [0] * size
+    sizes = [0]
+    for start in range(size):
+        if not land[start] or labels[start]:
+            continue
+        comp_id = len(sizes)
+        labels[start] = comp_id
+        stack = [start]
+        comp_size = 0
+        while stack:
+            k = stack.pop()
+            comp_size += 1
+            j = k % m
+            x = k - m
+            if x >= 0 and land[x] and not labels[x]:
+                labels[x] = comp_id
+                stack.append(x)
+            x = k + m
+            if x < size and land[x] and not labels[x]:
+                labels[x] = comp_id
+                stack.append(x)
+            x = k - 1
+            if j > 0 and land[x] and not labels[x]:
+                labels[x] = comp_id
+                stack.append(x)
+            x = k + 1
+            if j < m - 1 and land[x] and not labels[x]:
+                labels[x] = comp_id
+                stack.append(x)
+        sizes.append(comp_size)
+    return labels, sizes
+
+
+def drainable(heights: Sequence[int], n: int, m: int) -> List[bool]:
+    """
+    Find the cells of a grid from which water drains to sea level.
+
+    Water flows from a cell to any of its eight neighbors with strictly smaller height,
+    and cells with height at most zero are at sea level. Reversing the flow, the drainable
+    cells are those reachable from sea level by steps to strictly higher neighbors, so a
+    breadth-first search from all sea level cells at once finds them in O(nm) time.
+
+    Parameters
+    ----------
+    heights : Sequence[int]
+        Flattened n x m grid of heights, in row-major order
+    n : int
+        Number of rows in the grid
+    m : int
+        Number of columns in the grid
+
+    Returns
+    -------
+        drains : List[bool]
+            Flattened grid, true for cells whose water drains to sea level
+    """
+    size = n * m
+    offsets = [(di * m + dj, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+    drains = [h <= 0 for h in heights]
+    queue = [k for k in range(size) if drains[k]]
+    # The loop also visits cells appended to the queue while it runs
+    for k in queue:
+        h = heights[k]
+        j = k % m
+        for offset, dj in offsets:
+            x = k + offset
+            if 0 <= x < size and 0 <= j + dj < m and not drains[x] and heights[x] > h:
+                drains[x] = True
+                queue.append(x)
+    return drains
+
+
+def largest_island(heights: Union[List[List[int]], np.ndarray],
+                   output: str = "list") -> Union[List[List[bool]], np.ndarray]:
     """
     It has been raining for 40 days and 40 nights and the whole world is underwater!
     Contemplating where to finally dock your ark, you want to find the largest island.
@@ -42,66 +146,52 @@ def largest_island(heights: List[List[int]]) -> List[List[bool]]:
 
     Given an array of heights, return a bit-mask of the largest island.
 
+    Lists of lists are processed in pure Python. NumPy heights, or any output other than
+    "list", go through the vectorized `raster.largest_island_array` instead, which never
+    builds a Python object per cell.
+
     Parameters
     ----------
-    heights : List[List[int]]
+    heights : Union[List[List[int]], np.ndarray]
         A topological map of the surrounding land.
         Positive values represent heights above sea level
         and negative values, represent depth below sea level.
         A height of zero is considered underwater
+    output : str
+        Form of the mask: "list" for a list of lists of bools, "array" for an n x m NumPy
+        boolean array, or "packed" for an n x ceil(m / 8) NumPy uint8 array with eight
+        cells per byte along each row, as produced by `np.packbits(mask, axis=1)`
 
     Returns
     -------
-    mask : List[List[bool]]
+    mask : Union[List[List[bool]], np.ndarray]
         Boolean mask of the largest island
     """
-    n, m = len(heights), len(heights[0])
-    visited = [[False for _ in range(m)] for _ in range(n)]
-    component = [[-1 for _ in range(m)] for _ in range(n)]
-    components_size = {}
-    largest_size = 0
-    largest_component = -1
-
-    def dfs(i: int, j: int, comp_id: int):
-        if visited[i][j] or heights[i][j] <= 0:
-            return 0
-        visited[i][j] = True
-        component[i][j] = comp_id
-        size = 1
-        for x, y in get_neighbors(n, m, i, j):
-            if not visited[x][y] and heights[x][y] > 0:
-                size += dfs(x, y, comp_id)
-        return size
-
-    # Initialize component ID and find components sizes
-    comp_id = 0
-    for i in range(n):
-        for j in range(m):
-            if heights[i][j] > 0 and not visited[i][j]:
-                comp_size = dfs(i, j, comp_id)
-                components_size[comp_id] = comp_size
-                if comp_size > largest_size:
-                    largest_size = comp_size
-                    largest_component = comp_id
-                comp_id += 1
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output {output!r}, expected one of {OUTPUTS}.")
+    if output != "list" or isinstance(heights, np.ndarray):
+        return format_mask(largest_island_array(np.asarray(heights)), output)
 
-    # Generate the mask for the largest component
-    mask = [[False for _ in range(m)] for _ in range(n)]
-    for i in range(n):
-        for j in range(m):
-            if component[i][j] == largest_component:
-                mask[i][j] = True
+    n, m = len(heights), len(heights[0])
+    flat_heights = [h for row in heights for h in row]
+    drains = drainable(flat_heights, n, m)
+    land = [h > 0 and drains[k] for k, h in enumerate(flat_heights)]
+    labels, sizes = label_islands(land, n, m)
 
-    return mask
+    # The first component of maximum size, in the order components were found
+    largest_component = max(range(1, len(sizes)), key=sizes.__getitem__, default=-1)
 
+    # Generate the mask for the largest component
+    return [[label == largest_component for label in labels[i * m:(i + 1) * m]]
+            for i in range(n)]
 
-heights = [
-    [0, 1, 1, 0],
-    [1, 2, 2, 1],
-    [1, 2, 3, 2],
-    [0, 1, 2, 1]
-]
 
-largest_island(heights)
+if __name__ == "__main__":
+    heights = [
+        [0, 1, 1, 0],
+        [1, 2, 2, 1],
+        [1, 2, 3, 2],
+        [0, 1, 2, 1]
+    ]
 
-print(largest_island(heights))
+    print(largest_island(heights))
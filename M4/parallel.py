@@ -0,0 +1,217 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from raster import drain_from, drain_padded, label_array
+from tiled import Tile, TileIslands, merge_tile_islands, read_padded
+
+# Name, shape and dtype of a shared array, enough for a worker to attach to it
+SharedSpec = Tuple[str, Tuple[int, ...], str]
+
+
+def largest_island_parallel(heights: Union[np.ndarray, Sequence[Sequence[int]]],
+                            max_workers: Optional[int] = None,
+                            num_bands: Optional[int] = None) -> np.ndarray:
+    """
+    Find the largest island of a height map with a pool of worker processes.
+
+    The map is split into bands of rows. The heights, the drainable cells and the labels
+    live in shared memory, so workers only exchange small summaries with the parent:
+
+    1. Drainage. All bands drain in parallel, each reading one row of its neighbors.
+       A band whose first or last row changed makes that neighbor drain again, until
+       nothing changes. Most maps need a single round.
+    2. Labeling. Every band labels its islands in parallel. The labels that touch across
+       band borders are then merged in one union-find pass in the parent, which only
+       looks at the first and last row of every band.
+    3. Output. Every band marks the cells of the largest island in parallel.
+
+    Parameters
+    ----------
+    heights : Union[np.ndarray, Sequence[Sequence[int]]]
+        n x m array of heights
+    max_workers : Optional[int]
+        Number of worker processes, by default one per CPU.
+        With a single worker, the bands are processed in the calling process.
+    num_bands : Optional[int]
+        Number of row bands, by default max_workers
+
+    Returns
+    -------
+        mask : np.ndarray
+            n x m boolean array, true for the cells of the largest island
+    """
+    heights = np.asarray(heights)
+    n, m = heights.shape
+    max_workers = max_workers or os.cpu_count() or 1
+    num_bands = min(num_bands or max_workers, n)
+    band_rows = -(-n // num_bands)
+    bands = [(r0, min(r0 + band_rows, n), 0, m) for r0 in range(0, n, band_rows)]
+
+    segments = []
+    try:
+        specs = {}
+        # The drainable cells are overwritten with the mask in the last step.
+        for name, dtype in [("heights", heights.dtype), ("drains", np.dtype(bool)),
+                            ("labels", np.dtype(np.int32 if n * m < 2 ** 31 else np.int64))]:
+            segment = shared_memory.SharedMemory(create=True, size=max(n * m * dtype.itemsize, 1))
+            segments.append(segment)
+            specs[name] = (segment.name, (n, m), dtype.str)
+        _init_worker(specs)
+        _shared["heights"][:] = heights
+        _shared["drains"][:] = False
+
+        if max_workers == 1 or len(bands) == 1:
+            mask = _run_bands(bands, map)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(specs,)) as pool:
+                mask = _run_bands(bands, pool.map)
+        return mask.copy()
+    finally:
+        # The arrays must be released before the shared memory they view is closed.
+        mask = None
+        _shared.clear()
+        for segment in _attached:
+            segment.close()
+        _attached.clear()
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+def _run_bands(bands: List[Tile], run_map) -> np.ndarray:
+    """
+    Run the three steps of `largest_island_parallel`, mapping every step over the bands
+    with run_map, and return the shared array holding the mask.
+    """
+    pending = list(range(len(bands)))
+    first = True
+    while pending:
+        again = set()
+        for index, (top_changed, bottom_changed) in zip(
+                pending, run_map(_drain_band, [bands[index] for index in pending],
+                                 [first] * len(pending))):
+            if top_changed and index > 0:
+                again.add(index - 1)
+            if bottom_changed and index < len(bands) - 1:
+                again.add(index + 1)
+        pending = sorted(again)
+        first = False
+
+    islands = {}
+    offset = 0
+    for index, band_islands in enumerate(run_map(_label_band, bands)):
+        islands[index, 0] = band_islands.shifted(offset)
+        offset += band_islands.sizes.size
+    roots, representatives, sizes, first_cells = merge_tile_islands(islands)
+
+    mask = _shared["drains"]
+    mask[:] = False
+    if sizes.size:
+        # The first island of maximum size in row-major order, as in `largest_island`
+        largest = representatives[np.lexsort((first_cells, -sizes))[0]]
+        members = np.flatnonzero(roots == largest)
+        starts = [islands[index, 0].offset for index in range(len(bands))] + [offset]
+        band_members = [members[(members > starts[index]) & (members <= starts[index + 1])]
+                        - starts[index] for index in range(len(bands))]
+        list(run_map(_mask_band, bands, band_members,
+                     [islands[index, 0].sizes.size for index in range(len(bands))]))
+    return mask
+
+
+# State of a worker process, set once by _init_worker: the shared arrays by name
+_shared: Dict[str, np.ndarray] = {}
+_attached: List[shared_memory.SharedMemory] = []
+
+
+def _init_worker(specs: Dict[str, SharedSpec]) -> None:
+    for name, (segment_name, shape, dtype) in specs.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _attached.append(segment)
+        _shared[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _drain_band(band: Tile, first: bool) -> Tuple[bool, bool]:
+    """
+    Drain a band with the current state of the rows around it, and report whether its
+    first and last rows changed. After the first time, only the water which drains
+    through the rows around the band is followed.
+
+    Neighbors may write their rows while this band reads them. Cells only ever start
+    draining, so any mix of old and new values is a valid state to drain from.
+    """
+    heights, drains = _shared["heights"], _shared["drains"]
+    n, m = drains.shape
+    r0, r1, _, _ = band
+    padded_drains = np.zeros((r1 - r0 + 2, m + 2), dtype=bool)
+    a0, a1 = max(r0 - 1, 0), min(r1 + 1, n)
+    padded_drains[a0 - r0 + 1:a1 - r0 + 1, 1:-1] = drains[a0:a1]
+    before = padded_drains[1:-1, 1:-1].copy()
+    if first:
+        drain_padded(read_padded(heights, band), padded_drains)
+    else:
+        border = np.concatenate([np.flatnonzero(padded_drains[0]),
+                                 np.flatnonzero(padded_drains[-1]) + (r1 - r0 + 1) * (m + 2)])
+        drain_from(read_padded(heights, band), padded_drains, border)
+    changed = padded_drains[1:-1, 1:-1] != before
+    if not changed.any():
+        return False, False
+    drains[r0:r1] = padded_drains[1:-1, 1:-1]
+    return bool(changed[0].any()), bool(changed[-1].any())
+
+
+def _label_band(band: Tile) -> TileIslands:
+    """
+    Label the islands of a band from 1 into the shared labels, and summarize them.
+    """
+    heights, drains, labels = _shared["heights"], _shared["drains"], _shared["labels"]
+    r0, r1, _, _ = band
+    band_labels, sizes = label_array(drains[r0:r1] & (heights[r0:r1] > 0))
+    labels[r0:r1] = band_labels
+    return TileIslands.from_labels(band_labels, sizes, band, labels.shape[1])
+
+
+def _mask_band(band: Tile, members: np.ndarray, num_labels: int) -> None:
+    """
+    Mark the cells of a band whose label is one of members.
+    """
+    r0, r1, _, _ = band
+    is_member = np.zeros(num_labels + 1, dtype=bool)
+    is_member[members] = True
+    _shared["drains"][r0:r1] = is_member[_shared["labels"][r0:r1]]
+
+
+def synthetic_heights(n: int, m: int, seed: int = 0) -> np.ndarray:
+    """
+    Generate an n x m height map of rolling hills with noise, with about half of it under water.
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.linspace(0, 8 * np.pi, n, dtype=np.float32)[:, None]
+    cols = np.linspace(0, 8 * np.pi, m, dtype=np.float32)[None, :]
+    heights = np.zeros((n, m), dtype=np.float32)
+    for _ in range(4):
+        a, b, c, d = rng.uniform(0.2, 1.5, size=4)
+        heights += np.sin(a * rows + c) * np.cos(b * cols + d)
+    heights *= 100
+    heights += rng.integers(-20, 20, size=(n, m), dtype=np.int16)
+    return heights.astype(np.int32)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Time largest_island_parallel by core count.")
+    parser.add_argument("--size", type=int, default=20_000, help="rows and columns of the map")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    heights = synthetic_heights(args.size, args.size)
+    for workers in args.workers:
+        start = time.perf_counter()
+        largest_island_parallel(heights, max_workers=workers)
+        print(f"{workers:>3} workers: {time.perf_counter() - start:8.2f} s", flush=True)
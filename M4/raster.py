@@ -0,0 +1,223 @@
+from typing import List, Tuple, Union
+
+import numpy as np
+
+# Forms of a mask returned by `format_mask`
+OUTPUTS = ("list", "array", "packed")
+
+
+def highest(dtype: np.dtype):
+    """
+    Height used for cells outside the grid: no cell is strictly higher, so none drains into it.
+    """
+    dtype = np.dtype(dtype)
+    return np.inf if dtype.kind == 'f' else np.iinfo(dtype).max
+
+
+def drain_padded(heights: np.ndarray, drains: np.ndarray) -> None:
+    """
+    Mark the cells of a grid from which water drains to sea level, in place.
+
+    Both arrays have a border of one cell around the grid, which is only read.
+    It holds either cells of neighboring tiles, with their current drains value, or
+    cells outside the map, with height `highest(dtype)` and drains False.
+
+    Cells are visited in increasing height order. A cell drains if it is at sea level or
+    one of its eight neighbors is strictly lower and drains, and all such neighbors have
+    been decided by the time the cell is visited. Cells of equal height cannot drain into
+    each other, so each height level is one vectorized step, and the whole pass takes
+    O(nm log nm) time for the sort. Cells already marked in drains stay marked.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        (n + 2) x (m + 2) array of heights, including the border
+    drains : np.ndarray
+        C-contiguous (n + 2) x (m + 2) boolean array, updated in place
+    """
+    if not drains.flags.c_contiguous:
+        raise ValueError("drains must be C-contiguous to be updated in place.")
+    rows, cols = heights.shape
+    flat_heights = heights.ravel()
+    flat_drains = drains.ravel()
+
+    interior = np.arange(rows * cols).reshape(rows, cols)[1:-1, 1:-1].ravel()
+    order = interior[np.argsort(flat_heights[interior], kind='stable')]
+    sorted_heights = flat_heights[order]
+
+    sea_level = np.searchsorted(sorted_heights, 0, side='right')
+    flat_drains[order[:sea_level]] = True
+    order, sorted_heights = order[sea_level:], sorted_heights[sea_level:]
+
+    offsets = [di * cols + dj for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+    level_starts = np.flatnonzero(np.diff(sorted_heights)) + 1
+    for level in np.split(order, level_starts):
+        if not level.size:
+            continue
+        height = flat_heights[level[0]]
+        drained = flat_drains[level]
+        for offset in offsets:
+            neighbors = level + offset
+            drained |= flat_drains[neighbors] & (flat_heights[neighbors] < height)
+        flat_drains[level] = drained
+
+
+def drain_from(heights: np.ndarray, drains: np.ndarray, sources: np.ndarray) -> None:
+    """
+    Mark the cells of a grid which drain through new draining cells, in place.
+
+    Used after `drain_padded` once more cells of the border turn out to drain. Water
+    from a cell drains through any strictly lower neighbor that drains, so this floods
+    upward from the sources, one vectorized step per ring of newly draining cells.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        (n + 2) x (m + 2) array of heights, including the border
+    drains : np.ndarray
+        C-contiguous (n + 2) x (m + 2) boolean array, updated in place
+    sources : np.ndarray
+        Flat indices of draining cells, anywhere in the padded grid, to flood from
+    """
+    if not drains.flags.c_contiguous:
+        raise ValueError("drains must be C-contiguous to be updated in place.")
+    rows, cols = heights.shape
+    flat_heights = heights.ravel()
+    flat_drains = drains.ravel()
+    inside = np.zeros((rows, cols), dtype=bool)
+    inside[1:-1, 1:-1] = True
+    inside = inside.ravel()
+
+    offsets = [di * cols + dj for di in (-1, 0, 1) for dj in (-1, 0, 1) if di or dj]
+    frontier = np.asarray(sources)
+    while frontier.size:
+        found = []
+        for offset in offsets:
+            neighbors = frontier + offset
+            # Steps off either side of a row wrap around onto the border, which is skipped.
+            in_grid = (neighbors >= 0) & (neighbors < inside.size)
+            cells, neighbors = frontier[in_grid], neighbors[in_grid]
+            new = inside[neighbors] & ~flat_drains[neighbors]
+            cells, neighbors = cells[new], neighbors[new]
+            found.append(neighbors[flat_heights[neighbors] > flat_heights[cells]])
+        frontier = np.unique(np.concatenate(found))
+        flat_drains[frontier] = True
+
+
+def drainable_array(heights: np.ndarray) -> np.ndarray:
+    """
+    Find the cells of a grid from which water drains to sea level.
+
+    Vectorized counterpart of `noahs_ark.drainable`; see `drain_padded`.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        n x m array of heights
+
+    Returns
+    -------
+        drains : np.ndarray
+            n x m boolean array, true for cells whose water drains to sea level
+    """
+    n, m = heights.shape
+    padded = np.full((n + 2, m + 2), highest(heights.dtype), dtype=heights.dtype)
+    padded[1:-1, 1:-1] = heights
+    drains = np.zeros((n + 2, m + 2), dtype=bool)
+    drain_padded(padded, drains)
+    return drains[1:-1, 1:-1]
+
+
+def label_array(land: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Label the 4-connected components of land in a grid.
+
+    Vectorized counterpart of `noahs_ark.label_islands`, with the same numbering.
+    Every cell starts as its own tree. Each round hooks the larger root of every edge
+    between two trees onto the smaller one, then shortcuts every cell to its root.
+    Every tree with a neighboring tree merges in each round, so a component typically
+    needs O(log nm) rounds of O(nm) vectorized work. Each component ends up rooted at
+    its first cell.
+
+    Parameters
+    ----------
+    land : np.ndarray
+        n x m boolean array, true for land cells
+
+    Returns
+    -------
+        labels : np.ndarray
+            n x m array with the component of every cell, numbered from 1 in order of
+            their first cell, or 0 for cells which are not land
+        sizes : np.ndarray
+            Number of cells in every component, with sizes[0] = 0
+    """
+    n, m = land.shape
+    cells = np.arange(n * m).reshape(n, m)
+    # Edges from every land cell to the land cells to its right and below
+    right = cells[:, :-1][land[:, :-1] & land[:, 1:]]
+    down = cells[:-1][land[:-1] & land[1:]]
+    u = np.concatenate([right, down])
+    v = np.concatenate([right + 1, down + m])
+
+    parent = cells.ravel()
+    while u.size:
+        root_u, root_v = parent[u], parent[v]
+        between_trees = root_u != root_v
+        u, v = u[between_trees], v[between_trees]
+        root_u, root_v = root_u[between_trees], root_v[between_trees]
+        np.minimum.at(parent, np.maximum(root_u, root_v), np.minimum(root_u, root_v))
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    land_cells = np.flatnonzero(land)
+    roots = parent[land_cells]
+    first_cells = np.unique(roots)
+    labels = np.zeros(n * m, dtype=np.int32 if n * m < 2 ** 31 else np.int64)
+    labels[land_cells] = np.searchsorted(first_cells, roots) + 1
+    sizes = np.bincount(labels, minlength=first_cells.size + 1)
+    sizes[0] = 0
+    return labels.reshape(n, m), sizes
+
+
+def largest_island_array(heights: np.ndarray) -> np.ndarray:
+    """
+    Find the largest island of a height map.
+
+    Vectorized counterpart of `noahs_ark.largest_island`, with the same tie-breaking.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        n x m array of heights
+
+    Returns
+    -------
+        mask : np.ndarray
+            n x m boolean array, true for the cells of the largest island
+    """
+    land = drainable_array(heights)
+    land &= heights > 0
+    labels, sizes = label_array(land)
+    if sizes.size == 1:
+        return np.zeros(heights.shape, dtype=bool)
+    # Components are numbered in order of their first cell, and argmax takes the first maximum.
+    return labels == np.argmax(sizes)
+
+
+def format_mask(mask: np.ndarray, output: str) -> Union[List[List[bool]], np.ndarray]:
+    """
+    Convert an n x m boolean mask to one of OUTPUTS: "list" for a list of lists of bools,
+    "array" for the array itself, or "packed" for an n x ceil(m / 8) uint8 array with
+    eight cells per byte along each row, as produced by `np.packbits(mask, axis=1)`.
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"Unknown output {output!r}, expected one of {OUTPUTS}.")
+    if output == "array":
+        return mask
+    if output == "packed":
+        return np.packbits(mask, axis=1)
+    return mask.tolist()
@@ -0,0 +1,100 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from raster import drainable_array, label_array
+
+
+def stats_dtype(heights_dtype: np.dtype) -> np.dtype:
+    """
+    Row type of the table returned by `island_stats`.
+    """
+    return np.dtype([
+        ("label", np.int64),
+        ("area", np.int64),
+        # Bounding box, with inclusive bounds
+        ("min_row", np.int64), ("min_col", np.int64),
+        ("max_row", np.int64), ("max_col", np.int64),
+        ("max_height", heights_dtype),
+        ("centroid_row", np.float64), ("centroid_col", np.float64),
+    ])
+
+
+def island_stats(heights: Union[np.ndarray, Sequence[Sequence[int]]],
+                 k: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Label the islands of a height map and describe the k largest ones.
+
+    Every statistic is a reduction over the land cells grouped by island, computed with
+    `np.bincount` or `ufunc.at` from the one labeling pass, so no island is visited on
+    its own.
+
+    Parameters
+    ----------
+    heights : Union[np.ndarray, Sequence[Sequence[int]]]
+        n x m array of heights
+    k : Optional[int]
+        Number of islands to describe, by default all of them
+
+    Returns
+    -------
+        labels : np.ndarray
+            n x m array with the rank of the island of every cell, 1 for the largest island,
+            or 0 for cells which are not land, in the smallest unsigned integer type that fits.
+            Islands of equal size are ranked by their first cell in row-major order, so
+            labels == 1 is the mask of `noahs_ark.largest_island`.
+        stats : np.ndarray
+            Structured array with one row per island of rank 1 to k, with the fields of
+            `stats_dtype`: label (the rank), area, bounding box, max_height and centroid
+
+    Examples
+    --------
+    >>> labels, stats = island_stats([[1, 0, 2],
+    ...                               [0, 0, 3],
+    ...                               [0, 0, 0]], k=1)
+    >>> labels
+    array([[2, 0, 1],
+           [0, 0, 1],
+           [0, 0, 0]], dtype=uint8)
+    >>> stats["label"], stats["area"], stats["max_height"], stats["centroid_row"]
+    (array([1]), array([2]), array([3]), array([0.5]))
+    """
+    heights = np.asarray(heights)
+    n, m = heights.shape
+    land = drainable_array(heights)
+    land &= heights > 0
+    labels, sizes = label_array(land)
+    num_islands = sizes.size - 1
+
+    cells = np.flatnonzero(land)
+    cell_labels = labels.ravel()[cells]
+    rows, cols = np.divmod(cells, m)
+
+    # Largest first; the stable sort keeps islands of equal size in order of their first cell.
+    ranked = np.argsort(-sizes[1:], kind='stable') + 1
+    rank = np.zeros(sizes.size, dtype=np.min_scalar_type(num_islands))
+    rank[ranked] = np.arange(1, num_islands + 1)
+    ranked = ranked[:k]
+
+    def reduce(ufunc: np.ufunc, values: np.ndarray, initial) -> np.ndarray:
+        result = np.full(sizes.size, initial, dtype=values.dtype)
+        ufunc.at(result, cell_labels, values)
+        return result[ranked]
+
+    stats = np.zeros(ranked.size, dtype=stats_dtype(heights.dtype))
+    stats["label"] = rank[ranked]
+    stats["area"] = sizes[ranked]
+    stats["min_row"] = reduce(np.minimum, rows, n)
+    stats["min_col"] = reduce(np.minimum, cols, m)
+    stats["max_row"] = reduce(np.maximum, rows, -1)
+    stats["max_col"] = reduce(np.maximum, cols, -1)
+    stats["max_height"] = reduce(np.maximum, heights.ravel()[cells],
+                                 heights.min() if heights.size else 0)
+    stats["centroid_row"] = np.bincount(cell_labels, rows, sizes.size)[ranked] / sizes[ranked]
+    stats["centroid_col"] = np.bincount(cell_labels, cols, sizes.size)[ranked] / sizes[ranked]
+    return rank[labels], stats
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
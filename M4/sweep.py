@@ -0,0 +1,164 @@
+from typing import List, Sequence, Union
+
+import numpy as np
+
+from raster import drainable_array, format_mask
+
+
+class IslandSweep:
+    """
+    Largest island of a height map at every water level, from a single sweep over its cells.
+
+    At water level h, the cells with height at most h are under water, and the islands are
+    the 4-connected components of the remaining cells which drain to the sea today (see
+    `noahs_ark.largest_island`). At level 0 this is exactly `largest_island`.
+
+    Cells are added in decreasing height order to a union-find, so the islands at level h
+    are the components once every cell higher than h is added. Adding a cell creates a node
+    of a merge tree, whose children are the previous nodes of the components it joins.
+    A node stands for an island from its own height down to its parent's, and its subtree
+    holds the cells of that island. The tree is laid out in preorder, so the cells of any
+    island are a contiguous range.
+
+    Preprocessing takes O(nm log nm) time, dominated by the sort. Finding the largest island
+    at a level takes O(log nm) time, and its mask O(nm) time to allocate.
+
+    Examples
+    --------
+    >>> sweep = IslandSweep([[1, 2, 1],
+    ...                      [0, 0, 0],
+    ...                      [3, 0, 1]])
+    >>> sweep.largest_size(0), sweep.largest_size(1), sweep.largest_size(3)
+    (3, 1, 0)
+    >>> sweep.largest_island(1, output="list")
+    [[False, True, False], [False, False, False], [False, False, False]]
+    >>> sweep.largest_island(2, output="list")
+    [[False, False, False], [False, False, False], [True, False, False]]
+    """
+
+    def __init__(self, heights: Union[np.ndarray, Sequence[Sequence[int]]]):
+        """
+        Sweep the cells of a height map.
+
+        Parameters
+        ----------
+        heights : Union[np.ndarray, Sequence[Sequence[int]]]
+            n x m array of heights
+        """
+        heights = np.asarray(heights)
+        self.shape = n, m = heights.shape
+        flat_heights = heights.ravel()
+        cells = np.flatnonzero(drainable_array(heights) & (heights > 0))
+        order = cells[np.argsort(flat_heights[cells], kind='stable')[::-1]]
+
+        size = n * m
+        present = bytearray(size)
+        # Union-find parent of every cell. The root of a component is always the last cell
+        # added to it, which is also its current merge tree node.
+        components = list(range(size))
+        parent = [-1] * size
+        island_sizes = [0] * size
+        first_cells = list(range(size))
+
+        def find(x: int) -> int:
+            while components[x] != x:
+                components[x] = components[components[x]]
+                x = components[x]
+            return x
+
+        # Merge tree node holding the largest island after each height, in decreasing order
+        levels: List[int] = []
+        largest: List[int] = []
+        best_size, best_first, best = 0, size, -1
+        order_heights = flat_heights[order].tolist()
+        for position, k in enumerate(order.tolist()):
+            present[k] = 1
+            island_size, first = 1, k
+            j = k % m
+            for x in (k - m if k >= m else -1, k + m if k + m < size else -1,
+                      k - 1 if j > 0 else -1, k + 1 if j < m - 1 else -1):
+                if x < 0 or not present[x]:
+                    continue
+                root = find(x)
+                if root == k:
+                    continue
+                parent[root] = k
+                island_size += island_sizes[root]
+                first = min(first, first_cells[root])
+                components[root] = k
+            island_sizes[k] = island_size
+            first_cells[k] = first
+            # Islands only grow as the water falls, so the largest one only changes when a
+            # new node beats it; any node that absorbs it is larger.
+            if island_size > best_size or (island_size == best_size and first < best_first):
+                best_size, best_first, best = island_size, first, k
+            height = order_heights[position]
+            if position + 1 == len(order_heights) or order_heights[position + 1] != height:
+                levels.append(height)
+                largest.append(best)
+
+        # Lay out the tree in preorder.
+        nodes = order[np.argsort(np.asarray(parent)[order], kind='stable')]
+        node_parents = np.asarray(parent)[nodes]
+        child_starts = np.searchsorted(node_parents, np.arange(-1, size + 1))
+        self._preorder = np.empty(cells.size, dtype=np.int64)
+        self._start = np.zeros(size, dtype=np.int64)
+        stack = nodes[:child_starts[1]].tolist()[::-1]
+        position = 0
+        while stack:
+            node = stack.pop()
+            self._preorder[position] = node
+            self._start[node] = position
+            position += 1
+            stack.extend(nodes[child_starts[node + 1]:child_starts[node + 2]].tolist()[::-1])
+
+        # Levels in increasing order, with the largest island just below each one
+        self._levels = np.array(levels[::-1])
+        self._largest = np.array(largest[::-1], dtype=np.int64)
+        self._sizes = np.array(island_sizes, dtype=np.int64)
+
+    def _largest_node(self, level: float) -> int:
+        """
+        Merge tree node of the largest island at the given water level, or -1 if none.
+        """
+        if level < 0:
+            raise ValueError("The water level must be at least 0.")
+        # The cells above water are those added before the first height at most level.
+        index = np.searchsorted(self._levels, level, side='right')
+        return -1 if index == self._levels.size else int(self._largest[index])
+
+    def largest_size(self, level: float = 0) -> int:
+        """
+        Return the number of cells of the largest island when the water rises to level.
+        """
+        node = self._largest_node(level)
+        return 0 if node == -1 else int(self._sizes[node])
+
+    def largest_island(self, level: float = 0,
+                       output: str = "array") -> Union[List[List[bool]], np.ndarray]:
+        """
+        Return the mask of the largest island when the water rises to level.
+
+        Parameters
+        ----------
+        level : float
+            Water level, at least 0
+        output : str
+            Form of the mask, see `raster.format_mask`
+
+        Returns
+        -------
+        mask : Union[List[List[bool]], np.ndarray]
+            Boolean mask of the largest island
+        """
+        node = self._largest_node(level)
+        mask = np.zeros(self.shape, dtype=bool)
+        if node != -1:
+            start = self._start[node]
+            mask.ravel()[self._preorder[start:start + self._sizes[node]]] = True
+        return format_mask(mask, output)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+import pytest
+
+from incremental import IslandIndex
+from parallel import synthetic_heights
+from raster import largest_island_array
+from test_noahs_ark import TIMEOUT
+from test_raster import random_heights
+
+
+def test_random_edits():
+    for seed in range(30):
+        rng = random.Random(seed)
+        heights = np.array(random_heights(12, 15, seed))
+        index = IslandIndex(heights)
+        for _ in range(50):
+            i, j, height = rng.randrange(12), rng.randrange(15), rng.randint(-2, 7)
+            index.set_height(i, j, height)
+            heights[i, j] = height
+            expected = largest_island_array(heights)
+            assert index.height(i, j) == height
+            assert index.largest_size() == expected.sum()
+            assert (index.largest_island() == expected).all()
+            # First cells kept along with the edits are the first in row-major order.
+            for label, first in index._first_cells.items():
+                assert first == min(index._island_cells(label))
+
+
+def test_split_and_merge():
+    heights = [[1, 1, 1, 1, 1],
+               [0, 0, 0, 0, 0]]
+    index = IslandIndex(heights)
+    index.set_height(0, 1, 0)
+    assert index.largest_island(output="list") == [[False, False, True, True, True],
+                                                   [False, False, False, False, False]]
+    index.set_height(0, 3, 0)
+    # Three islands of one cell: the first one wins.
+    assert index.largest_island(output="list")[0] == [True, False, False, False, False]
+    index.set_height(0, 1, 1)
+    index.set_height(0, 3, 1)
+    assert index.largest_size() == 5
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+def test_many_edits():
+    # Each edit only looks at a small region, so this is much faster than recomputing.
+    heights = synthetic_heights(600, 600)
+    index = IslandIndex(heights)
+    rng = random.Random(0)
+    for _ in range(500):
+        i, j = rng.randrange(600), rng.randrange(600)
+        heights[i, j] += rng.randint(-30, 30)
+        index.set_height(i, j, int(heights[i, j]))
+    assert (index.largest_island() == largest_island_array(heights)).all()
+
+
+def test_query_after_edit_is_local():
+    # One island of 40,000 cells, a pyramid in the sea. Queries after edits which
+    # shrink and grow it must not search the whole island again.
+    i, j = np.mgrid[0:200, 0:200]
+    heights = np.pad(np.minimum(np.minimum(i, 199 - i), np.minimum(j, 199 - j)) + 1, 1)
+    index = IslandIndex(heights)
+    searches = []
+    island_cells = index._island_cells
+    index._island_cells = lambda label: searches.append(label) or island_cells(label)
+    rng = random.Random(0)
+    for _ in range(50):
+        i, j = rng.randrange(2, 200), rng.randrange(2, 200)
+        height = index.height(i, j)
+        index.set_height(i, j, 0)
+        assert index.largest_size() == 40_000 - 1
+        index.set_height(i, j, height)
+        assert index.largest_size() == 40_000
+    # Removing its first cell does not either, as the island is not tied.
+    index.set_height(1, 1, 0)
+    assert index.largest_size() == 40_000 - 1
+    assert searches == []
+    # Only building the mask does.
+    assert index.largest_island()[1, 2]
+    assert len(searches) == 1
+
+
+def test_outside_grid():
+    with pytest.raises(IndexError):
+        IslandIndex([[1, 0]]).set_height(1, 0, 2)
@@ -1,7 +1,8 @@
 import os
+import numpy as np
 import pytest
 
-from noahs_ark import largest_island
+from noahs_ark import drainable, label_islands, largest_island
 
 
 INPUT_PREFIX = "input"
@@ -55,3 +56,67 @@ def test_solve(file_io):
     mask = largest_island(heights)
 
     assert mask == expected_mask
+
+
+def snake(n, m):
+    """A single one-cell-wide path winding through an n x m grid."""
+    return [[1 if i % 2 == 0 or j == (m - 1 if i % 4 == 1 else 0) else 0 for j in range(m)]
+            for i in range(n)]
+
+
+def test_label_islands():
+    land = [True, True, False,
+            False, False, True,
+            True, False, True]
+    labels, sizes = label_islands(land, 3, 3)
+    assert labels == [1, 1, 0,
+                      0, 0, 2,
+                      3, 0, 2]
+    assert sizes == [0, 2, 2, 1]
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+def test_label_islands_no_recursion():
+    # A DFS would need one stack frame per cell of this path.
+    n = m = 1000
+    heights = snake(n, m)
+    labels, sizes = label_islands([h > 0 for row in heights for h in row], n, m)
+    assert sizes == [0, sum(map(sum, heights))]
+
+
+def test_no_island():
+    assert largest_island([[0, -1], [0, 0]]) == [[False, False], [False, False]]
+
+
+def test_drainable():
+    # Example from the README. The 1s at (1, 4) and (2, 2) have no lower neighbor,
+    # so they are lakes, and so is any cell that only drains into a lake.
+    n, m, heights = read_input(os.path.join(dir_path, "example00.txt"))
+    drains = drainable([h for row in heights for h in row], n, m)
+    assert [''.join('1' if drains[i * m + j] else '0' for j in range(m)) for i in range(n)] == [
+        "11100",
+        "11100",
+        "11000",
+        "00011",
+        "00111",
+    ]
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+def test_solve_array(file_io):
+    n, m, heights, expected_mask = file_io
+    mask = largest_island(np.array(heights), output="array")
+    assert mask.dtype == bool
+    assert mask.tolist() == expected_mask
+
+    packed = largest_island(heights, output="packed")
+    assert packed.shape == (n, (m + 7) // 8)
+    assert np.unpackbits(packed, axis=1, count=m).astype(bool).tolist() == expected_mask
+
+
+def test_output_modes():
+    heights = [[0, 1, 1, 0], [1, 2, 2, 1], [1, 2, 3, 2], [0, 1, 2, 1]]
+    assert largest_island(np.array(heights)) == largest_island(heights)
+    assert not largest_island(np.zeros((2, 3)), output="array").any()
+    with pytest.raises(ValueError):
+        largest_island(heights, output="bits")
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from noahs_ark import largest_island
+from parallel import largest_island_parallel, synthetic_heights
+from test_noahs_ark import TIMEOUT, files, input_files, read_input, read_output
+from test_raster import random_heights
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+@pytest.mark.parametrize("input_file, output_file", files, ids=input_files)
+def test_solve_parallel(input_file, output_file):
+    _, _, heights = read_input(input_file)
+    expected = [[c == '1' for c in line] for line in read_output(output_file)]
+    assert largest_island_parallel(heights, max_workers=2, num_bands=5).tolist() == expected
+
+
+def test_many_bands():
+    # Bands of one row, processed in the calling process.
+    for seed in range(10):
+        heights = random_heights(23, 31, seed)
+        assert largest_island_parallel(heights, max_workers=1, num_bands=23).tolist() == \
+            largest_island(heights)
+
+
+def test_synthetic():
+    heights = synthetic_heights(300, 200)
+    assert largest_island_parallel(heights, max_workers=3, num_bands=7).tolist() == \
+        largest_island(heights.tolist())
+
+
+def test_no_island():
+    assert not largest_island_parallel(np.zeros((4, 5), dtype=int), max_workers=2).any()
@@ -0,0 +1,46 @@
+import random
+
+import numpy as np
+
+from noahs_ark import drainable, label_islands
+from raster import drain_from, drainable_array, highest, label_array
+from test_noahs_ark import files, read_input
+
+
+def random_heights(n, m, seed):
+    rng = random.Random(seed)
+    return [[rng.randint(-2, 6) for _ in range(m)] for _ in range(n)]
+
+
+def test_drainable_array():
+    grids = [read_input(input_file)[2] for input_file, _ in files[:12]]
+    grids += [random_heights(17, 23, seed) for seed in range(20)]
+    for heights in grids:
+        n, m = len(heights), len(heights[0])
+        expected = drainable([h for row in heights for h in row], n, m)
+        assert drainable_array(np.array(heights)).ravel().tolist() == expected
+
+
+def test_label_array():
+    for seed in range(20):
+        land = np.array(random_heights(19, 21, seed)) > 1
+        labels, sizes = label_array(land)
+        expected_labels, expected_sizes = label_islands(land.ravel().tolist(), *land.shape)
+        assert labels.ravel().tolist() == expected_labels
+        assert sizes.tolist() == expected_sizes
+
+
+def test_label_array_empty():
+    labels, sizes = label_array(np.zeros((3, 4), dtype=bool))
+    assert not labels.any()
+    assert sizes.tolist() == [0]
+
+
+def test_drain_from():
+    # Flooding upward from the sea reaches every cell which drains.
+    for seed in range(10):
+        heights = np.array(random_heights(15, 16, seed))
+        padded = np.pad(heights, 1, constant_values=highest(heights.dtype))
+        drains = np.pad(heights <= 0, 1)
+        drain_from(padded, drains, np.flatnonzero(drains))
+        assert (drains[1:-1, 1:-1] == drainable_array(heights)).all()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from raster import largest_island_array
+from stats import island_stats
+from test_noahs_ark import files, read_input
+from test_raster import random_heights
+
+
+def check_stats(heights, labels, stats):
+    for row in stats:
+        island = labels == row["label"]
+        cells = np.argwhere(island)
+        assert len(cells) == row["area"]
+        assert cells.min(axis=0).tolist() == [row["min_row"], row["min_col"]]
+        assert cells.max(axis=0).tolist() == [row["max_row"], row["max_col"]]
+        assert heights[island].max() == row["max_height"]
+        assert np.allclose(cells.mean(axis=0), [row["centroid_row"], row["centroid_col"]])
+
+
+def test_island_stats():
+    grids = [np.array(random_heights(20, 25, seed)) for seed in range(20)]
+    grids += [np.array(read_input(input_file)[2]) for input_file, _ in files[:10]]
+    for heights in grids:
+        labels, stats = island_stats(heights)
+        assert ((labels == 1) == largest_island_array(heights)).all()
+        assert stats["label"].tolist() == list(range(1, labels.max() + 1))
+        assert stats["area"].tolist() == sorted(stats["area"], reverse=True)
+        check_stats(heights, labels, stats)
+
+
+def test_top_k():
+    heights = np.array(random_heights(30, 30, 0))
+    labels, stats = island_stats(heights, k=3)
+    assert len(stats) == 3
+    assert (stats == island_stats(heights)[1][:3]).all()
+    assert labels.dtype == np.uint8
+
+
+def test_no_island():
+    labels, stats = island_stats(-np.ones((3, 4), dtype=int), k=5)
+    assert not labels.any()
+    assert len(stats) == 0
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from noahs_ark import largest_island
+from raster import drainable_array, label_array
+from sweep import IslandSweep
+from test_noahs_ark import TIMEOUT, files, input_files, read_input
+from test_raster import random_heights
+
+
+def largest_above(heights, level):
+    """The largest island at a water level, relabeling from scratch."""
+    labels, sizes = label_array(drainable_array(heights) & (heights > level))
+    if sizes.size == 1:
+        return np.zeros(heights.shape, dtype=bool)
+    return labels == np.argmax(sizes)
+
+
+def test_random_levels():
+    for seed in range(20):
+        heights = np.array(random_heights(21, 27, seed))
+        sweep = IslandSweep(heights)
+        for level in [0, 0.5, 1, 2, 3, 4, 5, 6, 7]:
+            expected = largest_above(heights, level)
+            assert sweep.largest_size(level) == expected.sum()
+            assert (sweep.largest_island(level) == expected).all()
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+@pytest.mark.parametrize("input_file", input_files[-4:])
+def test_sweep_levels(input_file):
+    _, _, heights = read_input(input_file)
+    sweep = IslandSweep(heights)
+    assert sweep.largest_island(0, output="list") == largest_island(heights)
+    heights = np.array(heights)
+    for level in np.quantile(heights[heights > 0], [0.1, 0.5, 0.9]):
+        assert (sweep.largest_island(level) == largest_above(heights, level)).all()
+
+
+def test_negative_level():
+    with pytest.raises(ValueError):
+        IslandSweep([[1]]).largest_size(-1)
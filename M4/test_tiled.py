@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pytest
+
+from noahs_ark import largest_island
+from test_noahs_ark import TIMEOUT, files, read_input, read_output, snake
+from test_raster import random_heights
+from tiled import (TileIslands, largest_island_tiled, merge_tile_islands, open_heights,
+                   unpack_mask)
+
+
+def run_tiled(tmp_path, heights, tile_shape):
+    heights_path = str(tmp_path / "heights.npy")
+    np.save(heights_path, np.array(heights, dtype=np.int32))
+    out_path = str(tmp_path / "mask.npy")
+    largest_island_tiled(open_heights(heights_path), out_path, tile_shape, work_dir=str(tmp_path))
+    return unpack_mask(np.load(out_path), len(heights[0])).tolist()
+
+
+# Tiny tiles make thousands of tiles on the large fixtures, so they only run on small ones.
+SMALL_TILE_MAX_CELLS = 20_000
+
+
+def tiled_cases():
+    cases = []
+    for input_file, output_file in files:
+        with open(input_file) as f:
+            n, m = [int(i) for i in f.readline().split()]
+        tile_shapes = [(64, 64), (37, 56)] + [(5, 8)] * (n * m <= SMALL_TILE_MAX_CELLS)
+        for rows, cols in tile_shapes:
+            name = f"{os.path.basename(input_file)}-{rows}x{cols}"
+            cases.append(pytest.param(input_file, output_file, (rows, cols), id=name))
+    return cases
+
+
+@pytest.mark.execution_timeout(TIMEOUT)
+@pytest.mark.parametrize("input_file, output_file, tile_shape", tiled_cases())
+def test_solve_tiled(tmp_path, input_file, output_file, tile_shape):
+    _, _, heights = read_input(input_file)
+    expected = [[c == '1' for c in line] for line in read_output(output_file)]
+    assert run_tiled(tmp_path, heights, tile_shape) == expected
+
+
+def test_random_tiled(tmp_path):
+    for seed in range(10):
+        heights = random_heights(29, 37, seed)
+        assert run_tiled(tmp_path, heights, (4, 8)) == largest_island(heights)
+
+
+def test_merge_tile_islands():
+    # Islands 1 and 2 of the left tile both touch island 4 of the right tile.
+    # Islands 3 and 5 are off the seam.
+    empty = np.zeros(3, dtype=np.int64)
+    left = TileIslands(0, np.array([2, 3, 4]), np.array([0, 20, 1]),
+                       empty, empty, empty, np.array([1, 0, 2]))
+    right = TileIslands(3, np.array([5, 6]), np.array([3, 4]),
+                        empty, empty, np.array([4, 0, 4]), empty)
+    roots, representatives, sizes, first_cells = merge_tile_islands({(0, 0): left, (0, 1): right})
+    assert roots.tolist() == [0, 1, 1, 3, 1, 5]
+    assert representatives.tolist() == [1, 3, 5]
+    assert sizes.tolist() == [2 + 3 + 5, 4, 6]
+    assert first_cells.tolist() == [0, 1, 4]
+
+
+def test_drainage_across_seams(tmp_path):
+    # Water runs down a winding path that crosses every seam many times,
+    # and only reaches the sea at its far end.
+    n, m = 30, 40
+    path = snake(n, m)
+    cells = [(i, j if i % 4 != 2 else m - 1 - j) for i in range(n) for j in range(m)
+             if path[i][j if i % 4 != 2 else m - 1 - j]]
+    heights = [[1000] * m for _ in range(n)]
+    for height, (i, j) in enumerate(reversed(cells)):
+        heights[i][j] = height
+    expected = largest_island(heights)
+    assert sum(map(sum, expected)) > n * m // 2
+    assert run_tiled(tmp_path, heights, (3, 8)) == expected
+
+
+def test_raw_raster(tmp_path):
+    heights = np.array(random_heights(13, 20, 0), dtype=np.int16)
+    path = str(tmp_path / "heights.raw")
+    heights.tofile(path)
+    out_path = str(tmp_path / "mask.npy")
+    mask = largest_island_tiled(open_heights(path, heights.shape, np.int16), out_path, (4, 8))
+    assert unpack_mask(mask, 20).tolist() == largest_island(heights.tolist())
+
+
+def test_invalid_tiles(tmp_path):
+    with pytest.raises(ValueError):
+        largest_island_tiled(np.ones((4, 4)), str(tmp_path / "mask.npy"), (4, 4))
+    with pytest.raises(ValueError):
+        open_heights(str(tmp_path / "heights.raw"))
@@ -0,0 +1,328 @@
+import tempfile
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from raster import drain_from, drain_padded, highest, label_array
+
+# Bounds (first row, end row, first column, end column) of a tile
+Tile = Tuple[int, int, int, int]
+
+
+def open_heights(path: str, shape: Optional[Tuple[int, int]] = None,
+                 dtype: Optional[np.dtype] = None) -> np.ndarray:
+    """
+    Memory-map a height map stored as a .npy file or as a raw raster.
+
+    Parameters
+    ----------
+    path : str
+        Path of the height map. Files ending in .npy carry their own shape and dtype.
+    shape : Optional[Tuple[int, int]]
+        Number of rows and columns of a raw raster
+    dtype : Optional[np.dtype]
+        Type of the heights in a raw raster, e.g. np.int16 or np.int32
+
+    Returns
+    -------
+        heights : np.ndarray
+            Read-only memory-mapped n x m array of heights
+    """
+    if path.endswith(".npy"):
+        return np.load(path, mmap_mode="r")
+    if shape is None or dtype is None:
+        raise ValueError("A raw raster needs a shape and a dtype.")
+    return np.memmap(path, dtype=dtype, mode="r", shape=shape)
+
+
+def unpack_mask(packed: np.ndarray, m: int) -> np.ndarray:
+    """
+    Expand a mask with eight cells per byte along each row into an n x m boolean array.
+    """
+    return np.unpackbits(packed, axis=1, count=m).astype(bool)
+
+
+def largest_island_tiled(heights: np.ndarray, out_path: str,
+                         tile_shape: Tuple[int, int] = (1024, 1024),
+                         work_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Find the largest island of a height map too large to process in memory.
+
+    The map is processed one tile at a time, so memory use depends on the tile size
+    rather than the map size. Works in three passes over the tiles:
+
+    1. Drainage. Each tile drains with its one-cell halo from the neighboring tiles held
+       fixed, and tiles whose border changed make their neighbors drain again, until
+       nothing changes. The drainable cells are kept in a temporary bit-packed file.
+    2. Labeling. Each tile labels its islands, and labels that touch across a tile seam
+       are merged with a union-find over the labels on the tile borders only.
+    3. Output. Each tile is labeled again and the cells of the largest island are
+       written to the output file.
+
+    Parameters
+    ----------
+    heights : np.ndarray
+        n x m array of heights, usually memory-mapped with `open_heights`
+    out_path : str
+        Path of the .npy file to write the mask to
+    tile_shape : Tuple[int, int]
+        Number of rows and columns of a tile. The number of columns must be a multiple of 8.
+    work_dir : Optional[str]
+        Directory for temporary files, by default the system temporary directory
+
+    Returns
+    -------
+        mask : np.ndarray
+            Memory-mapped n x ceil(m / 8) array of bytes, holding the mask of the largest
+            island with eight cells per byte along each row (see `unpack_mask`)
+    """
+    tile_rows, tile_cols = tile_shape
+    if tile_rows < 1 or tile_cols < 1 or tile_cols % 8:
+        raise ValueError("Tiles must have at least one row and a multiple of 8 columns.")
+    n, m = heights.shape
+    tiles = {(r0 // tile_rows, c0 // tile_cols): (r0, min(r0 + tile_rows, n),
+                                                  c0, min(c0 + tile_cols, m))
+             for r0 in range(0, n, tile_rows) for c0 in range(0, m, tile_cols)}
+
+    with tempfile.TemporaryFile(dir=work_dir) as drains_file:
+        drains = np.memmap(drains_file, dtype=np.uint8, mode="w+", shape=(n, (m + 7) // 8))
+        drain_tiles(heights, drains, tiles)
+
+        islands = {}
+        offset = 0
+        for index in sorted(tiles):
+            _, islands[index] = label_tile(heights, drains, tiles[index], offset)
+            offset += islands[index].sizes.size
+        roots, representatives, sizes, first_cells = merge_tile_islands(islands)
+
+        mask = np.lib.format.open_memmap(out_path, mode="w+", dtype=np.uint8,
+                                         shape=(n, (m + 7) // 8))
+        if sizes.size:
+            # The first island of maximum size in row-major order, as in `largest_island`
+            largest = representatives[np.lexsort((first_cells, -sizes))[0]]
+            for index, tile in tiles.items():
+                labels, _ = label_tile(heights, drains, tile, islands[index].offset)
+                write_bits(mask, tile[0], tile[2], roots[labels] == largest)
+        mask.flush()
+    return mask
+
+
+def read_padded(heights: np.ndarray, tile: Tile) -> np.ndarray:
+    """
+    Read the heights of a tile with a one-cell border, padding outside the map with `highest`.
+    """
+    r0, r1, c0, c1 = tile
+    n, m = heights.shape
+    padded = np.full((r1 - r0 + 2, c1 - c0 + 2), highest(heights.dtype), dtype=heights.dtype)
+    a0, a1, b0, b1 = max(r0 - 1, 0), min(r1 + 1, n), max(c0 - 1, 0), min(c1 + 1, m)
+    padded[a0 - r0 + 1:a1 - r0 + 1, b0 - c0 + 1:b1 - c0 + 1] = heights[a0:a1, b0:b1]
+    return padded
+
+
+def read_bits(packed: np.ndarray, m: int, tile: Tile) -> np.ndarray:
+    """
+    Read the bits of a tile with a one-cell border from an n x ceil(m / 8) bit-packed array.
+    Cells outside the map are False.
+    """
+    r0, r1, c0, c1 = tile
+    n = packed.shape[0]
+    padded = np.zeros((r1 - r0 + 2, c1 - c0 + 2), dtype=bool)
+    a0, a1, b0, b1 = max(r0 - 1, 0), min(r1 + 1, n), max(c0 - 1, 0), min(c1 + 1, m)
+    bits = np.unpackbits(packed[a0:a1, b0 // 8:(b1 + 7) // 8], axis=1)
+    padded[a0 - r0 + 1:a1 - r0 + 1, b0 - c0 + 1:b1 - c0 + 1] = bits[:, b0 % 8:b0 % 8 + b1 - b0]
+    return padded
+
+
+def write_bits(packed: np.ndarray, r0: int, c0: int, bits: np.ndarray) -> None:
+    """
+    Write a block of bits starting at row r0 and column c0, a multiple of 8, into a
+    bit-packed array. The block must end on a multiple of 8 columns or at the end of the row.
+    """
+    packed[r0:r0 + bits.shape[0], c0 // 8:c0 // 8 + (bits.shape[1] + 7) // 8] = \
+        np.packbits(bits, axis=1)
+
+
+def drain_tiles(heights: np.ndarray, drains: np.ndarray, tiles: Dict[Tuple[int, int], Tile],
+                pending: Optional[List[Tuple[int, int]]] = None) -> None:
+    """
+    Mark the drainable cells of a tiled map in the bit-packed array drains.
+
+    A tile drains with the current state of its halo. If this changes a cell on its
+    border, the neighboring tiles on that side are drained again, since their halo
+    changed. Cells only ever start draining, so this reaches a fixed point, which is the
+    drainable set of the whole map. After its first pass, a tile only follows the water
+    which drains through its halo.
+    """
+    m = heights.shape[1]
+    pending = sorted(tiles) if pending is None else pending
+    drained_once = set()
+    while pending:
+        again = set()
+        for index in pending:
+            again.discard(index)
+            tile = tiles[index]
+            padded_drains = read_bits(drains, m, tile)
+            before = padded_drains[1:-1, 1:-1].copy()
+            if index in drained_once:
+                ring = np.ones(padded_drains.shape, dtype=bool)
+                ring[1:-1, 1:-1] = False
+                drain_from(read_padded(heights, tile), padded_drains,
+                           np.flatnonzero(ring & padded_drains))
+            else:
+                drain_padded(read_padded(heights, tile), padded_drains)
+                drained_once.add(index)
+            after = padded_drains[1:-1, 1:-1]
+            changed = before != after
+            if not changed.any():
+                continue
+            write_bits(drains, tile[0], tile[2], after)
+            i, j = index
+            sides = [(-1, changed[0].any()), (1, changed[-1].any())]
+            for di, row_changed in sides:
+                if row_changed:
+                    again.update((i + di, j + dj) for dj in (-1, 0, 1))
+            for dj, column_changed in [(-1, changed[:, 0].any()), (1, changed[:, -1].any())]:
+                if column_changed:
+                    again.update((i + di, j + dj) for di in (-1, 0, 1))
+        pending = sorted(again & tiles.keys())
+
+
+class TileIslands(NamedTuple):
+    """
+    Summary of the islands of one tile: what is needed to merge them across seams.
+
+    The islands of the tile have labels offset + 1, ..., offset + len(sizes),
+    so labels are unique in the map.
+    """
+    offset: int
+    # Number of cells and row-major index in the map of the first cell of each island
+    sizes: np.ndarray
+    first_cells: np.ndarray
+    # Labels of the cells on the border rows and columns of the tile, 0 for no island
+    top: np.ndarray
+    bottom: np.ndarray
+    left: np.ndarray
+    right: np.ndarray
+
+    @classmethod
+    def from_labels(cls, labels: np.ndarray, sizes: np.ndarray, tile: Tile,
+                    m: int) -> "TileIslands":
+        """
+        Summarize the labels of a tile numbered from 1, as returned by `label_array`.
+        """
+        r0, _, c0, _ = tile
+        cols = labels.shape[1]
+        cells = np.flatnonzero(labels)
+        _, first = np.unique(labels.ravel()[cells], return_index=True)
+        first = cells[first]
+        return cls(0, sizes[1:], (r0 + first // cols) * m + c0 + first % cols,
+                   labels[0].copy(), labels[-1].copy(), labels[:, 0].copy(), labels[:, -1].copy())
+
+    def shifted(self, offset: int) -> "TileIslands":
+        """
+        The same summary with labels numbered from offset + 1.
+        """
+        def shift(border: np.ndarray) -> np.ndarray:
+            return np.where(border > 0, border.astype(np.int64) + (offset - self.offset), 0)
+        return self._replace(offset=offset, top=shift(self.top), bottom=shift(self.bottom),
+                             left=shift(self.left), right=shift(self.right))
+
+
+def label_tile(heights: np.ndarray, drains: np.ndarray, tile: Tile,
+               offset: int = 0) -> Tuple[np.ndarray, TileIslands]:
+    """
+    Label the islands of a tile, numbering them from offset + 1.
+
+    Returns
+    -------
+        labels : np.ndarray
+            Island of every cell of the tile, or 0 for cells which are not land
+        islands : TileIslands
+            Summary of the islands of the tile
+    """
+    r0, r1, c0, c1 = tile
+    m = heights.shape[1]
+    land = read_bits(drains, m, tile)[1:-1, 1:-1] & (np.asarray(heights[r0:r1, c0:c1]) > 0)
+    labels, sizes = label_array(land)
+    islands = TileIslands.from_labels(labels, sizes, tile, m).shifted(offset)
+    labels = labels.astype(np.int64)
+    labels[labels > 0] += offset
+    return labels, islands
+
+
+def merge_tile_islands(islands: Dict[Tuple[int, int], TileIslands]
+                       ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Merge islands that touch across tile seams.
+
+    Joins the labels of land cells that are adjacent across a seam in a union-find over
+    the labels on seams only, held in a NumPy array.
+    Only the rows and columns on tile borders are looked at.
+
+    Parameters
+    ----------
+    islands : Dict[Tuple[int, int], TileIslands]
+        Islands of every tile, keyed by the tile's row and column in the tiling
+
+    Returns
+    -------
+        roots : np.ndarray
+            roots[label] is the representative label of the island containing label,
+            with roots[0] = 0
+        representatives : np.ndarray
+            Representative label of every island, in increasing order
+        sizes : np.ndarray
+            Number of cells of every island, indexed like representatives
+        first_cells : np.ndarray
+            Row-major index of the first cell of every island, indexed like representatives
+    """
+    tiles = sorted(islands)
+    num_labels = sum(islands[index].sizes.size for index in tiles)
+
+    # Pairs of labels of land cells adjacent across a seam
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    for i, j in tiles:
+        tile = islands[i, j]
+        seams = []
+        if (i, j + 1) in islands:
+            seams.append((tile.right, islands[i, j + 1].left))
+        if (i + 1, j) in islands:
+            seams.append((tile.bottom, islands[i + 1, j].top))
+        for a, b in seams:
+            touching = (a > 0) & (b > 0)
+            pairs.append(np.stack([a[touching], b[touching]], axis=1).astype(np.int64))
+    pairs = np.unique(np.concatenate(pairs), axis=0)
+
+    # The union-find only holds the labels on seams, numbered 0, 1, ... in increasing
+    # order, so the smaller index of two is also the smaller label.
+    seam_labels, pairs = np.unique(pairs, return_inverse=True)
+    pairs = pairs.reshape(-1, 2)
+    parent = np.arange(seam_labels.size, dtype=np.int64)
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for x, y in pairs.tolist():
+        x, y = find(x), find(y)
+        if x != y:
+            parent[max(x, y)] = min(x, y)
+    # Point every seam label at its root
+    while True:
+        grandparent = parent[parent]
+        if np.array_equal(grandparent, parent):
+            break
+        parent = grandparent
+
+    # Labels off the seams are their own roots.
+    roots = np.arange(num_labels + 1, dtype=np.int64)
+    roots[seam_labels] = seam_labels[parent]
+    sizes = np.concatenate([islands[index].sizes for index in tiles] + [[]])
+    first_cells = np.concatenate([islands[index].first_cells for index in tiles] + [[]])
+    representatives, island_of_label = np.unique(roots[1:], return_inverse=True)
+    island_sizes = np.bincount(island_of_label, weights=sizes, minlength=representatives.size)
+    island_first_cells = np.full(representatives.size, np.iinfo(np.int64).max)
+    np.minimum.at(island_first_cells, island_of_label, first_cells.astype(np.int64))
+    return roots, representatives, island_sizes.astype(np.int64), island_first_cells
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Hashable, Sequence
+
+import networkx as nx
+import numpy as np
+
+from dial import dial_csr
+from graph import CSRGraph
+
+# Name, shape and dtype of a shared array, enough for a worker to attach to it
+SharedSpec = tuple[str, tuple[int, ...], str]
+
+# Sources given to a worker at a time
+CHUNK_SIZE = 16
+
+
+def dial_distance_matrix(
+    G: nx.Graph | CSRGraph, sources: Sequence[Hashable] | None = None,
+    max_edge_weight: int | None = None, max_workers: int | None = None
+) -> np.ndarray:
+    """Compute shortest path distances from many sources with a pool of worker processes.
+
+    The graph is converted to CSR form once and placed in shared memory with the
+    distance matrix, so workers only receive the indices of their sources, and every
+    worker builds the lists it relaxes edges over once for all its sources.
+
+    Parameters
+    ----------
+    G : nx.Graph | CSRGraph
+        A graph with bounded positive integer edge weights.
+    sources : Optional[Sequence[Hashable]], optional
+        The source vertices, by default every vertex (all pairs).
+    max_edge_weight : Optional[int], optional
+        Maximum edge weight in G, by default None.
+        Will be calculated once in Theta(E) time if not provided.
+    max_workers : Optional[int], optional
+        Number of worker processes, by default one per CPU.
+        With a single worker, the sources are processed in the calling process.
+
+    Returns
+    -------
+    distance : np.ndarray
+        len(sources) x V array, whose row i holds the distances from sources[i] to the
+        vertices in the order of G.nodes, np.inf if unreachable.
+
+    Examples
+    --------
+    >>> G = nx.path_graph(4)
+    >>> nx.set_edge_attributes(G, 2, "weight")
+    >>> dial_distance_matrix(G, sources=[0, 3], max_workers=1)
+    array([[0., 2., 4., 6.],
+           [6., 4., 2., 0.]])
+    """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    if max_edge_weight is None:
+        max_edge_weight = graph.max_edge_weight
+    indices = list(range(graph.num_nodes)) if sources is None \
+        else [graph.index[source] for source in sources]
+    max_workers = max_workers or os.cpu_count() or 1
+    chunks = [(start, indices[start:start + CHUNK_SIZE])
+              for start in range(0, len(indices), CHUNK_SIZE)]
+
+    segments = []
+    try:
+        specs = {}
+        arrays = {"offsets": graph.offsets, "targets": graph.targets, "weights": graph.weights,
+                  "distances": np.empty((len(indices), graph.num_nodes))}
+        for name, array in arrays.items():
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            segments.append(segment)
+            specs[name] = (segment.name, array.shape, array.dtype.str)
+        _init_worker(specs, max_edge_weight)
+        for name in ("offsets", "targets", "weights"):
+            _shared[name][:] = arrays[name]
+
+        if max_workers == 1 or len(chunks) == 1:
+            list(map(_run_sources, *zip(*chunks)))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(specs, max_edge_weight)) as pool:
+                list(pool.map(_run_sources, *zip(*chunks)))
+        return _shared["distances"].copy()
+    finally:
+        # The arrays must be released before the shared memory they view is closed.
+        global _graph
+        _graph = None
+        _shared.clear()
+        for segment in _attached:
+            segment.close()
+        _attached.clear()
+        for segment in segments:
+            segment.close()
+            segment.unlink()
+
+
+# State of a worker process, set once by _init_worker: the shared arrays by name,
+# and the graph they hold with its maximum edge weight
+_shared: dict[str, np.ndarray] = {}
+_attached: list[shared_memory.SharedMemory] = []
+_graph: CSRGraph | None = None
+_max_edge_weight = 0
+
+
+def _init_worker(specs: dict[str, SharedSpec], max_edge_weight: int) -> None:
+    global _graph, _max_edge_weight
+    for name, (segment_name, shape, dtype) in specs.items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        _attached.append(segment)
+        _shared[name] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    nodes = list(range(len(_shared["offsets"]) - 1))
+    _graph = CSRGraph(_shared["offsets"], _shared["targets"], _shared["weights"],
+                      nodes, dict(zip(nodes, nodes)))
+    _max_edge_weight = max_edge_weight
+
+
+def _run_sources(start: int, sources: list[int]) -> None:
+    """Fill the rows of the distance matrix from start on with the distances from sources."""
+    distances = _shared["distances"]
+    for row, source in enumerate(sources, start):
+        distances[row] = dial_csr(_graph, source, _max_edge_weight)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
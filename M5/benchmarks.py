@@ -0,0 +1,269 @@
+"""Scaling benchmarks for the Dial backends against Dijkstra's algorithm on a binary heap.
+
+Every backend computes single-source shortest paths on random graphs from the two
+families of utils.py, with V vertices, density from a tree to a complete graph and
+maximum edge weight W. For each run, the suite reports the time and the peak memory
+allocated by every backend, and the speedup of each over the heapq baseline.
+The summary lists, for each graph, the values of W at which the bucket queue Dial
+backends beat heapq.
+
+Examples
+--------
+    python3 benchmarks.py                           # V up to 100,000
+    python3 benchmarks.py --sizes 1000 10000 --weights 1 1000 --json bench.json
+    python3 benchmarks.py --backends dial-lists heapq --no-memory
+"""
+from __future__ import annotations
+
+import argparse
+import heapq
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+import networkx as nx
+import numpy as np
+
+from bucket_queue import BucketQueue
+from dial import _dial_lists, _dial_vectorized, dial_csr
+from graph import CSRGraph
+from radix_heap import RadixHeap
+from utils import generate_complete_weighted_graph
+
+SIZES = [1_000, 10_000, 100_000]
+WEIGHTS = [1, 10, 100, 1000]
+
+# Average number of edges per vertex added to a random spanning tree, as
+# generate_connected_weighted_graph does with probability degree / (V - 1).
+# "complete" stands for generate_complete_weighted_graph.
+DENSITIES: list[int | str] = [0, 4, 32, 256, "complete"]
+
+# Graphs with more (undirected) edges are skipped, as Python graphs of this size
+# take several GB of memory.
+MAX_EDGES = 3_000_000
+
+# Timed runs of every backend, of which the fastest is reported
+REPEAT = 3
+
+
+def make_graph(num_nodes: int, density: int | str, max_edge_weight: int,
+               seed: int = 0) -> nx.Graph:
+    """Returns a random graph of the families of utils.py.
+
+    generate_connected_weighted_graph tries every pair of vertices, which takes
+    Theta(V^2) time, so sparse graphs draw the same distribution from a random tree and
+    nx.fast_gnp_random_graph instead, in time linear in their size.
+    """
+    if density == "complete":
+        random.seed(seed)
+        return generate_complete_weighted_graph(num_nodes, max_edge_weight)
+    rng = random.Random(seed)
+    G = nx.random_labeled_tree(num_nodes, seed=seed)
+    if density and num_nodes > 1:
+        extra = nx.fast_gnp_random_graph(num_nodes, min(density / (num_nodes - 1), 1),
+                                         seed=seed)
+        G.add_edges_from(extra.edges)
+    for u, v in G.edges:
+        G[u][v]["weight"] = rng.randint(1, max_edge_weight)
+    return G
+
+
+def num_edges(num_nodes: int, density: int | str) -> int:
+    """Expected number of edges of make_graph(num_nodes, density, ...)."""
+    if density == "complete":
+        return num_nodes * (num_nodes - 1) // 2
+    return num_nodes - 1 + min(density * num_nodes // 2, num_nodes * (num_nodes - 1) // 2)
+
+
+def heapq_dijkstra(graph: CSRGraph, source: int) -> np.ndarray:
+    """Dijkstra's algorithm on a binary heap with lazy deletion, over the same lists as
+    the Dial backends, in O((V + E) log V) time."""
+    offsets, targets, weights = graph.lists
+    distances = [float('inf')] * graph.num_nodes
+    distances[source] = 0
+    heap = [(0, source)]
+    while heap:
+        curr_dist, u = heapq.heappop(heap)
+        if curr_dist > distances[u]:
+            continue
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            distance = curr_dist + weights[i]
+            if distance < distances[v]:
+                distances[v] = distance
+                heapq.heappush(heap, (distance, v))
+    return np.array(distances, dtype=np.float64)
+
+
+# Name -> function of the graph, the source and W, returning the distances.
+BACKENDS: dict[str, Callable[[CSRGraph, int, int], np.ndarray]] = {
+    "dial-lists": lambda graph, source, w: _dial_lists(graph, [source], BucketQueue(w))[0],
+    "dial-numpy": lambda graph, source, w: _dial_vectorized(graph, [source], BucketQueue(w))[0],
+    "radix": lambda graph, source, w: _dial_lists(graph, [source], RadixHeap(w))[0],
+    "auto": lambda graph, source, w: dial_csr(graph, source, w),
+    "heapq": lambda graph, source, w: heapq_dijkstra(graph, source),
+}
+BASELINE = "heapq"
+
+
+def _run(function: Callable, *args, measure_memory: bool,
+         repeat: int = 1) -> tuple[Any, float, int | None]:
+    """Calls function(*args) and returns its result, best wall time over repeat calls and
+    peak allocated bytes.
+
+    Memory is measured in another call, so tracing does not slow down the timed ones.
+    """
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(graph: CSRGraph, backends: list[str] | None = None,
+              measure_memory: bool = True, repeat: int = REPEAT) -> list[dict[str, Any]]:
+    """Runs every backend from vertex 0 of graph.
+
+    Parameters
+    ----------
+    graph : CSRGraph
+        The graph, whose lists are built before timing.
+    backends : Optional[list[str]], optional
+        Keys of the backends in BACKENDS, by default all of them.
+    measure_memory : bool, optional
+        Whether to measure peak memory of each backend, by default True.
+    repeat : int, optional
+        Number of timed runs of each backend, by default REPEAT.
+
+    Returns
+    -------
+    results : list[dict[str, Any]]
+        Best time in seconds and, if measured, peak memory in MB of every backend.
+
+    Raises
+    ------
+    AssertionError
+        If some backends disagree on the distances.
+    """
+    graph.lists  # built once, outside the timings
+    max_edge_weight = graph.max_edge_weight
+    results = []
+    expected = None
+    for name in backends or BACKENDS:
+        distances, elapsed, peak = _run(BACKENDS[name], graph, 0, max_edge_weight,
+                                        measure_memory=measure_memory, repeat=repeat)
+        if expected is None:
+            expected = distances
+        assert np.array_equal(distances, expected), f"{name} disagrees on the distances"
+        result = {"backend": name, "seconds": elapsed}
+        if measure_memory:
+            result["peak_mb"] = peak / 1e6
+        results.append(result)
+    return results
+
+
+def run_benchmarks(sizes: list[int] = SIZES, densities: list[int | str] = DENSITIES,
+                   weights: list[int] = WEIGHTS, backends: list[str] | None = None,
+                   measure_memory: bool = True, max_edges: int = MAX_EDGES,
+                   repeat: int = REPEAT, verbose: bool = False) -> list[dict[str, Any]]:
+    """Benchmarks every backend on a graph of every size, density and maximum weight.
+
+    Returns one result per (V, density, W, backend); see benchmark. Results also hold the
+    speedup over the baseline when it runs.
+    """
+    results = []
+    for size in sizes:
+        for density in densities:
+            if num_edges(size, density) > max_edges:
+                continue
+            for max_edge_weight in weights:
+                G = make_graph(size, density, max_edge_weight)
+                graph, convert_time, _ = _run(CSRGraph.from_networkx, G, measure_memory=False)
+                del G
+                runs = benchmark(graph, backends, measure_memory, repeat)
+                baseline = {run["backend"]: run["seconds"] for run in runs}.get(BASELINE)
+                for run in runs:
+                    run.update({"size": size, "density": density, "edges": graph.num_edges // 2,
+                                "max_edge_weight": max_edge_weight,
+                                "convert_seconds": convert_time})
+                    if baseline is not None:
+                        run["speedup"] = baseline / run["seconds"]
+                    results.append(run)
+                    if verbose:
+                        print(format_result(run), flush=True)
+    return results
+
+
+def winning_weights(results: list[dict[str, Any]],
+                    backend: str = "dial-lists") -> dict[tuple, list[int]]:
+    """For each (V, density), the maximum weights W at which backend beats the baseline."""
+    summary: dict[tuple, list[int]] = {}
+    for result in sorted(results, key=lambda result: result["max_edge_weight"]):
+        if result["backend"] != backend or "speedup" not in result:
+            continue
+        wins = summary.setdefault((result["size"], result["density"]), [])
+        if result["speedup"] > 1:
+            wins.append(result["max_edge_weight"])
+    return summary
+
+
+def format_result(result: dict[str, Any]) -> str:
+    line = (f"V {result['size']:>7,} density {str(result['density']):>8} "
+            f"E {result['edges']:>9,} W {result['max_edge_weight']:>5}: "
+            f"{result['backend']:>10} {result['seconds']:8.4f} s")
+    if "speedup" in result:
+        line += f" ({result['speedup']:5.2f}x {BASELINE})"
+    if "peak_mb" in result:
+        line += f" | peak {result['peak_mb']:7.1f} MB"
+    return line
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="numbers of vertices")
+    parser.add_argument("--densities", nargs="+", default=DENSITIES,
+                        type=lambda value: value if value == "complete" else int(value),
+                        help="average extra edges per vertex, or complete")
+    parser.add_argument("--weights", type=int, nargs="+", default=WEIGHTS,
+                        help="maximum edge weights")
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), help="backends to run")
+    parser.add_argument("--max-edges", type=int, default=MAX_EDGES,
+                        help="skip graphs with more edges than this")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help="timed runs of every backend, of which the fastest is reported")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.densities, args.weights, args.backends,
+                             not args.no_memory, args.max_edges, args.repeat, verbose=True)
+    for backend in ("dial-lists", "dial-numpy"):
+        for (size, density), wins in winning_weights(results, backend).items():
+            print(f"{backend} on V {size:,}, density {density}: "
+                  + (f"faster than {BASELINE} at W in {wins}" if wins
+                     else f"slower than {BASELINE} at every W"))
+    if args.json:
+        report = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
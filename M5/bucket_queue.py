@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+
+class BucketQueue:
+    """Monotone priority queue for integer priorities, as used by Dial's algorithm.
+
+    All items in the queue have priorities between the current minimum p and p + W,
+    where W is the largest gap allowed. They fit in W + 1 buckets used circularly:
+    priority q goes to bucket q mod (W + 1). Popping never goes below the last popped
+    priority, so each bucket holds a single priority at a time.
+
+    Changing the priority of an item adds a new entry and leaves the old one behind.
+    Stale entries are skipped when popped, and dropped all at once when they outnumber
+    the live items, so the queue uses O(V + W) memory for V items.
+    Push is O(1) and pop is O(1) amortized plus the number of empty buckets skipped,
+    which is at most the final minimum priority over the whole run.
+
+    Examples
+    --------
+    >>> queue = BucketQueue(max_gap=3)
+    >>> queue.push("a", 2)
+    >>> queue.push("b", 3)
+    >>> queue.push("a", 1)
+    >>> queue.pop()
+    ('a', 1)
+    >>> queue.push("c", 5)
+    Traceback (most recent call last):
+      ...
+    ValueError: Priority 5 is outside [1, 4].
+    >>> queue.peek(), queue.pop(), len(queue)
+    (('b', 3), ('b', 3), 0)
+    """
+
+    def __init__(self, max_gap: int):
+        """Constructs an empty BucketQueue.
+
+        Parameters
+        ----------
+        max_gap : int
+            Largest difference W between the priorities of two items in the queue at
+            the same time. For Dial's algorithm, this is the maximum edge weight.
+        """
+        if max_gap < 0:
+            raise ValueError("The maximum gap must be non-negative.")
+        self.max_gap = max_gap
+        self._buckets: list[list[Hashable]] = [[] for _ in range(max_gap + 1)]
+        self._priority: dict[Hashable, int] = {}
+        self._current = 0
+        self._entries = 0
+
+    def __len__(self) -> int:
+        return len(self._priority)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._priority
+
+    @property
+    def current(self) -> int:
+        """The last popped priority, a lower bound on every priority in the queue."""
+        return self._current
+
+    def push(self, item: Hashable, priority: int):
+        """Inserts item, or changes its priority if it is already in the queue.
+
+        Raises
+        ------
+        ValueError
+            If the queue is not empty and priority is below the last popped priority
+            or more than max_gap above it.
+        """
+        if not self._priority and not self._current <= priority <= self._current + self.max_gap:
+            # An empty queue can restart anywhere.
+            self._current = priority
+        if not self._current <= priority <= self._current + self.max_gap:
+            raise ValueError(
+                f"Priority {priority} is outside [{self._current}, {self._current + self.max_gap}].")
+        self._priority[item] = priority
+        self._buckets[priority % len(self._buckets)].append(item)
+        self._entries += 1
+        if self._entries > 2 * len(self._priority) + len(self._buckets):
+            self._compact()
+
+    def peek(self) -> tuple[Hashable, int]:
+        """Returns an item of minimum priority, with its priority, without removing it.
+
+        Raises
+        ------
+        IndexError
+            If the queue is empty.
+        """
+        bucket = self._advance()
+        return bucket[-1], self._current
+
+    def pop(self) -> tuple[Hashable, int]:
+        """Removes and returns an item of minimum priority, with its priority.
+
+        Raises
+        ------
+        IndexError
+            If the queue is empty.
+        """
+        item = self._advance().pop()
+        self._entries -= 1
+        del self._priority[item]
+        return item, self._current
+
+    def _advance(self) -> list[Hashable]:
+        """Moves to the lowest non-empty bucket and drops stale entries from its end,
+        so that its last entry is a live item of minimum priority, and returns it."""
+        priorities, buckets = self._priority, self._buckets
+        if not priorities:
+            raise IndexError("pop from an empty bucket queue")
+        current = self._current
+        bucket = buckets[current % len(buckets)]
+        while True:
+            while bucket:
+                if priorities.get(bucket[-1]) == current:
+                    self._current = current
+                    return bucket
+                bucket.pop()
+                self._entries -= 1
+            current += 1
+            bucket = buckets[current % len(buckets)]
+
+    def _compact(self):
+        """Drops every stale entry, rebuilding the buckets from the live items."""
+        for bucket in self._buckets:
+            bucket.clear()
+        for item, priority in self._priority.items():
+            self._buckets[priority % len(self._buckets)].append(item)
+        self._entries = len(self._priority)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -1,22 +1,42 @@
 from __future__ import annotations
 
-from typing import Hashable
+from dataclasses import dataclass
+from typing import Hashable, Iterable
 
 import networkx as nx
+import numpy as np
 
-from utils import generate_complete_weighted_graph
+from bucket_queue import BucketQueue
+from graph import CSRGraph
+from radix_heap import RadixHeap
+from utils import generate_complete_weighted_graph, generate_connected_weighted_graph
 
 
+# Average degree from which edges are relaxed with NumPy one vertex at a time,
+# rather than one edge at a time in Python.
+VECTORIZE_MIN_DEGREE = 32
+
+# Maximum edge weight per vertex from which a radix heap replaces the bucket queue.
+# The bucket queue allocates and sweeps Theta(W) buckets, the radix heap spends
+# O(log W) per vertex, and on random graphs the radix heap wins past W ~ 4V.
+RADIX_MIN_WEIGHT_PER_NODE = 4
+
 
 def dial_shortest_path_length(
-    G: nx.Graph, source: Hashable, max_edge_weight: int | None = None
+    G: nx.Graph | CSRGraph, source: Hashable, max_edge_weight: int | None = None
 ) -> dict[Hashable, float]:
     """Compute single-source shortest path distances via Dial's algorithm.
 
+    When the maximum edge weight is more than RADIX_MIN_WEIGHT_PER_NODE times the number
+    of vertices, the bucket queue is replaced by a radix heap, see
+    radix_heap_shortest_path_length.
+
     Parameters
     ----------
-    G : nx.Graph
+    G : nx.Graph | CSRGraph
         An undirected graph with bounded positive integer edge weights.
+        Converting a NetworkX graph takes Theta(V + E) time, so callers running
+        several searches on one graph should convert it once with CSRGraph.from_networkx.
     source : Hashable
         The source vertex.
     max_edge_weight : Optional[int], optional
@@ -36,64 +56,415 @@ def dial_shortest_path_length(
     >>> actual == expected
     True
     """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    return graph.to_dict(dial_csr(graph, graph.index[source], max_edge_weight))
+
+
+def radix_heap_shortest_path_length(
+    G: nx.Graph | CSRGraph, source: Hashable, max_edge_weight: int | None = None
+) -> dict[Hashable, float]:
+    """Compute single-source shortest path distances via Dijkstra's algorithm on a radix heap.
+
+    This takes O(E + V log W) time with O(log W) buckets, against O(E + V * W) time and
+    W + 1 buckets for Dial's algorithm, so it suits large edge weights.
+    dial_shortest_path_length already switches to it when W is large compared to V.
+
+    Parameters
+    ----------
+    G : nx.Graph | CSRGraph
+        An undirected graph with positive integer edge weights.
+    source : Hashable
+        The source vertex.
+    max_edge_weight : Optional[int], optional
+        Maximum edge weight in G, by default None.
+        Will be calculated in Theta(E) time if not provided.
+
+    Returns
+    -------
+    distance : dict[Hashable, float]
+        Shortest path distances from source in G.
+
+    Examples
+    --------
+    >>> G = generate_connected_weighted_graph(n=50, max_edge_weight=100_000)
+    >>> expected = nx.single_source_dijkstra_path_length(G, source=0)
+    >>> radix_heap_shortest_path_length(G, source=0) == expected
+    True
+    """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    distances, _ = _dial(graph, [graph.index[source]], max_edge_weight, RadixHeap)
+    return graph.to_dict(distances)
+
+
+def dial_csr(
+    graph: CSRGraph, source: int, max_edge_weight: int | None = None,
+    return_predecessors: bool = False
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    """Compute single-source shortest path distances via Dial's algorithm on a CSR graph.
+
+    Parameters
+    ----------
+    graph : CSRGraph
+        A graph with bounded positive integer edge weights.
+    source : int
+        Index of the source vertex.
+    max_edge_weight : Optional[int], optional
+        Maximum edge weight in graph, by default None.
+        Will be calculated in Theta(E) time if not provided.
+    return_predecessors : bool, optional
+        Whether to also return the shortest path tree, by default False.
+
+    Returns
+    -------
+    distance : np.ndarray
+        Shortest path distance from source to every vertex, np.inf if unreachable.
+    predecessors : np.ndarray
+        Only if return_predecessors is True. Index of the vertex before each vertex on a
+        shortest path from source, source itself for source and -1 if unreachable.
+        It is recorded on every relaxation, so it costs no extra pass; see extract_path.
+
+    Examples
+    --------
+    >>> G = generate_complete_weighted_graph(n=20, max_edge_weight=5)
+    >>> graph = CSRGraph.from_networkx(G)
+    >>> distances = dial_csr(graph, source=0)
+    >>> graph.to_dict(distances) == nx.single_source_dijkstra_path_length(G, source=0)
+    True
+    """
+    distances, predecessors = _dial(graph, [source], max_edge_weight)
+    return (distances, predecessors) if return_predecessors else distances
+
+
+def dial_multi_source(
+    G: nx.Graph | CSRGraph, sources: Iterable[Hashable], max_edge_weight: int | None = None,
+    return_nearest: bool = False
+) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+    """Compute the distance from every vertex to its nearest source in a single run.
+
+    All sources start in bucket 0, so this costs one run of Dial's algorithm however
+    many sources there are.
+
+    Parameters
+    ----------
+    G : nx.Graph | CSRGraph
+        A graph with bounded positive integer edge weights.
+    sources : Iterable[Hashable]
+        The source vertices, for instance facilities.
+    max_edge_weight : Optional[int], optional
+        Maximum edge weight in G, by default None.
+        Will be calculated in Theta(E) time if not provided.
+    return_nearest : bool, optional
+        Whether to also return the nearest source of every vertex, by default False.
+
+    Returns
+    -------
+    distance : np.ndarray
+        Distance from the nearest source to every vertex, in the order of G.nodes,
+        np.inf if no source reaches it.
+    nearest : np.ndarray
+        Only if return_nearest is True. Index in G.nodes of the nearest source of every
+        vertex, -1 if unreachable. Ties go to any of the nearest sources.
+
+    Examples
+    --------
+    >>> G = nx.path_graph(6)
+    >>> nx.set_edge_attributes(G, 1, "weight")
+    >>> distances, nearest = dial_multi_source(G, [0, 4], return_nearest=True)
+    >>> distances.tolist(), nearest.tolist()
+    ([0.0, 1.0, 2.0, 1.0, 0.0, 1.0], [0, 0, 0, 4, 4, 4])
+    """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    distances, predecessors = _dial(graph, [graph.index[source] for source in sources],
+                                    max_edge_weight)
+    if not return_nearest:
+        return distances
+    # Follow the shortest path tree up to its roots by pointer jumping, in O(V log V).
+    nearest = predecessors.copy()
+    reached = nearest != -1
+    while True:
+        jumped = nearest[nearest[reached]]
+        if np.array_equal(jumped, nearest[reached]):
+            return distances, nearest
+        nearest[reached] = jumped
+
+
+def _dial(graph: CSRGraph, sources: list[int], max_edge_weight: int | None,
+          queue_type: type | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Dial's algorithm from sources, all at distance 0, with the engine suited to graph."""
     if max_edge_weight is None:
-        # Compute max edge weight if not provided
-        max_edge_weight = max(d["weight"] for u, v, d in G.edges(data=True))
-
-    # TODO: Implement Dial's algorithm
-        
-    # Initialize distance dictionary with infinity values since we want to find shortest path
-    distances = {node: float('inf') for node in G.nodes()}
-    distances[source] = 0  # Base Case
-
-    # Initialize buckets with empty lists
-    buckets = [[] for _ in range(max_edge_weight * len(G) + 1)]
-    bucket_idx = {node: None for node in G.nodes()} # To track bucket position
-    
-    # Place source node into the bucket and set initial bucket position to 0
-    bucket_idx[source] = 0 
-    buckets[0].append(source)
-
-    # Cover all possible distances in bucket queue
-    for curr_dist in range(max_edge_weight * len(G) + 1):
-        # Process all nodes at given distance
-        while buckets[curr_dist]:
-            u = buckets[curr_dist].pop(0)  # Get and remove the first node in the current bucket
-            for v, data in G[u].items():   # Iterate through graph
-                weight = data['weight']
-                if distances[u] + weight < distances[v]:   # Check for shorter path
-                    distances[v] = distances[u] + weight   # Update distances
-                    if bucket_idx[v] is not None:
-                        buckets[bucket_idx[v]].remove(v)   # Remove from buckets and update
-                    bucket_idx[v] = distances[v]
-                    buckets[distances[v]].append(v)        
-
-    return distances
+        max_edge_weight = graph.max_edge_weight
+    queue = (queue_type or _queue_type(graph, max_edge_weight))(max_edge_weight)
+    if graph.num_edges >= VECTORIZE_MIN_DEGREE * graph.num_nodes:
+        return _dial_vectorized(graph, sources, queue)
+    return _dial_lists(graph, sources, queue)
+
+
+def _queue_type(graph: CSRGraph, max_edge_weight: int) -> type:
+    """The faster monotone priority queue for searches on graph."""
+    if max_edge_weight > RADIX_MIN_WEIGHT_PER_NODE * graph.num_nodes:
+        return RadixHeap
+    return BucketQueue
+
+
+def extract_path(graph: CSRGraph, predecessors: np.ndarray, target: int) -> list[Hashable]:
+    """Shortest path to target along a shortest path tree, in O(length) time.
+
+    Parameters
+    ----------
+    graph : CSRGraph
+        The graph searched.
+    predecessors : np.ndarray
+        Shortest path tree from dial_csr with return_predecessors=True.
+    target : int
+        Index of the target vertex.
+
+    Returns
+    -------
+    path : list[Hashable]
+        Nodes of a shortest path from the source to target, both included,
+        or an empty list if target is unreachable.
+
+    Examples
+    --------
+    >>> G = nx.Graph()
+    >>> G.add_weighted_edges_from([("a", "b", 1), ("b", "c", 1), ("a", "c", 3), ("x", "y", 1)])
+    >>> graph = CSRGraph.from_networkx(G)
+    >>> distances, predecessors = dial_csr(graph, graph.index["a"], return_predecessors=True)
+    >>> extract_path(graph, predecessors, graph.index["c"])
+    ['a', 'b', 'c']
+    >>> extract_path(graph, predecessors, graph.index["y"])
+    []
+    """
+    if predecessors[target] == -1:
+        return []
+    path = [target]
+    while predecessors[path[-1]] != path[-1]:
+        path.append(int(predecessors[path[-1]]))
+    return [graph.nodes[i] for i in reversed(path)]
+
+
+def _dial_vectorized(graph: CSRGraph, sources: list[int],
+                     queue: BucketQueue | RadixHeap) -> tuple[np.ndarray, np.ndarray]:
+    """Dial's algorithm relaxing all edges of a vertex at once, for dense graphs."""
+    offsets, targets = graph.offsets, graph.targets
+    weights = graph.weights.astype(np.int64)
+    distances = np.full(graph.num_nodes, np.inf)
+    distances[sources] = 0
+    predecessors = np.full(graph.num_nodes, -1, dtype=graph.targets.dtype)
+    predecessors[sources] = sources
+    for source in sources:
+        queue.push(source, 0)
+
+    while queue:
+        u, curr_dist = queue.pop()
+        start, end = offsets[u], offsets[u + 1]
+        neighbors = targets[start:end]
+        new_distances = curr_dist + weights[start:end]
+        shorter = new_distances < distances[neighbors]
+        neighbors, new_distances = neighbors[shorter], new_distances[shorter]
+        distances[neighbors] = new_distances
+        predecessors[neighbors] = u
+        for v, distance in zip(neighbors.tolist(), new_distances.tolist()):
+            queue.push(v, distance)
+    return distances, predecessors
+
+
+def _dial_lists(graph: CSRGraph, sources: list[int],
+                queue: BucketQueue | RadixHeap) -> tuple[np.ndarray, np.ndarray]:
+    """Dial's algorithm relaxing one edge at a time over Python lists, for sparse graphs."""
+    offsets, targets, weights = graph.lists
+    distances = [float('inf')] * graph.num_nodes
+    predecessors = [-1] * graph.num_nodes
+    for source in sources:
+        distances[source] = 0
+        predecessors[source] = source
+        queue.push(source, 0)
+
+    while queue:
+        u, curr_dist = queue.pop()
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            distance = curr_dist + weights[i]
+            if distance < distances[v]:
+                distances[v] = distance
+                predecessors[v] = u
+                queue.push(v, distance)
+    return (np.array(distances, dtype=np.float64),
+            np.array(predecessors, dtype=graph.targets.dtype))
+
+
+@dataclass
+class SearchStats:
+    """Counters filled in by point-to-point searches, summed over every search given them."""
+    settled: int = 0
+
+
+def dial_distance(
+    G: nx.Graph | CSRGraph, source: Hashable, target: Hashable,
+    max_edge_weight: int | None = None, bidirectional: bool = False,
+    stats: SearchStats | None = None
+) -> float:
+    """Compute the shortest path distance between two vertices via Dial's algorithm.
+
+    The search stops once target is settled, so it only settles the vertices closer to
+    source than target. The bidirectional search also runs Dial's algorithm backwards
+    from target and alternates between the two, stopping as soon as no path shorter than
+    the best one found can remain.
+    Tentative distances are kept in dicts, so vertices the search does not reach cost nothing.
+
+    Parameters
+    ----------
+    G : nx.Graph | CSRGraph
+        A graph or directed graph with bounded positive integer edge weights.
+        Callers running several searches on one graph should convert it once with
+        CSRGraph.from_networkx.
+    source : Hashable
+        The source vertex.
+    target : Hashable
+        The target vertex.
+    max_edge_weight : Optional[int], optional
+        Maximum edge weight in G, by default None.
+        Will be calculated in Theta(E) time if not provided.
+    bidirectional : bool, optional
+        Whether to search from both ends, by default False.
+    stats : Optional[SearchStats], optional
+        Counters to add the number of settled vertices to, by default None.
+
+    Returns
+    -------
+    distance : float
+        Shortest path distance from source to target, float("inf") if unreachable.
+
+    Examples
+    --------
+    >>> G = generate_connected_weighted_graph(n=50, max_edge_weight=5)
+    >>> stats = SearchStats()
+    >>> expected = nx.dijkstra_path_length(G, 0, 49)
+    >>> dial_distance(G, 0, 49, bidirectional=True, stats=stats) == expected
+    True
+    >>> 0 < stats.settled <= 50
+    True
+    """
+    graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+    if max_edge_weight is None:
+        max_edge_weight = graph.max_edge_weight
+    search = _bidirectional_distance if bidirectional else _unidirectional_distance
+    distance, settled = search(graph, graph.index[source], graph.index[target], max_edge_weight)
+    if stats is not None:
+        stats.settled += settled
+    return distance
+
+
+def _unidirectional_distance(graph: CSRGraph, source: int, target: int,
+                             max_edge_weight: int) -> tuple[float, int]:
+    """Dial's algorithm stopped once target is settled.
+    Returns the distance and the number of settled vertices."""
+    offsets, targets, weights = graph.lists
+    distances = {source: 0}
+    queue = _queue_type(graph, max_edge_weight)(max_edge_weight)
+    queue.push(source, 0)
+    settled = 0
+
+    while queue:
+        u, curr_dist = queue.pop()
+        settled += 1
+        if u == target:
+            return curr_dist, settled
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            distance = curr_dist + weights[i]
+            if distance < distances.get(v, distance + 1):
+                distances[v] = distance
+                queue.push(v, distance)
+    return float('inf'), settled
+
+
+def _bidirectional_distance(graph: CSRGraph, source: int, target: int,
+                            max_edge_weight: int) -> tuple[float, int]:
+    """Dial's algorithm forwards from source and backwards from target.
+    Returns the distance and the number of vertices settled by both searches."""
+    # Per direction: adjacency lists, tentative distances and queue
+    sides = []
+    for side_graph, start in ((graph, source), (graph.reverse, target)):
+        queue = _queue_type(graph, max_edge_weight)(max_edge_weight)
+        queue.push(start, 0)
+        sides.append((side_graph.lists, {start: 0}, queue))
+    forward, backward = sides
+    # Shortest source-target path through a relaxed edge so far
+    best = 0 if source == target else float('inf')
+    settled = 0
+
+    while forward[2] and backward[2]:
+        # A path not found yet leaves the forward settled set at a vertex of forward
+        # distance at least the smallest forward priority, and likewise backwards.
+        if forward[2].peek()[1] + backward[2].peek()[1] >= best:
+            break
+        # Expand the side with fewer queued vertices.
+        if len(forward[2]) <= len(backward[2]):
+            side, other_distances = forward, backward[1]
+        else:
+            side, other_distances = backward, forward[1]
+        (offsets, targets, weights), distances, queue = side
+        u, curr_dist = queue.pop()
+        settled += 1
+        for i in range(offsets[u], offsets[u + 1]):
+            v = targets[i]
+            distance = curr_dist + weights[i]
+            if distance < distances.get(v, distance + 1):
+                distances[v] = distance
+                queue.push(v, distance)
+                if v in other_distances and distance + other_distances[v] < best:
+                    best = distance + other_distances[v]
+    return best, settled
+
 
 # TODO: Analysis
 
 '''
-Let W be the maximum edge weight.
+Let W be the maximum edge weight and D the largest finite distance from the source.
 
 Runtime:
 
-Initialization: O(V)
+Initialization: O(V + W)
 Main Loop: 
 - Goes through all the edges once, O(E). 
-- Iterates through the entire buckets array once, O(V*W)
-- The bucket queue allows for constant time, O(1), when placing and removing buckets 
-(based on distance).
+- Pops every reachable vertex once. The bucket queue (see bucket_queue.py) keeps W + 1
+buckets used circularly, so push is O(1) and pop is O(1) plus the empty buckets it skips.
+The minimum priority never decreases and stops at D, so at most D <= (V - 1) * W buckets
+are skipped over the whole run. The search stops as soon as the queue is empty,
+without scanning the remaining buckets.
+- A vertex whose distance decreases leaves a stale entry behind, which is skipped in O(1)
+when popped. Every relaxation adds at most one entry, so this costs O(E) in total.
+
+Overall running time: O(E + V + min(D, V * W)) = O(E + V * W)
+
+
+Space Complexity: O(V + W)
+
+The bucket queue has W + 1 buckets. Stale entries are dropped whenever they outnumber
+the vertices in the queue, so the buckets hold O(V) entries.
+The distance and predecessor arrays need O(V) space. The CSR copy of the graph needs
+O(V + E) space, which is a copy of the input rather than working space.
+
+The total additional space complexity is then O(V + W)
 
-Overall running time: O(V*W + E)
+When W > 4V, the radix heap (see radix_heap.py) takes over from the bucket queue, for
+O(E + V log W) time and O(V + log W) additional space.
 
 
-Space Complexity: O(V*W)
+Point-to-point queries (dial_distance):
 
-The space we need for the buckets array to hold the vertices and the maximum edge
-weight is O(V*W). In the worst case, evert vertex's edge is of the maximum weight.
-The dictionary containing the positions of the buckets needs O(V) space.
+The search stops when target is popped, so it only settles vertices at distance at most
+d(source, target) and scans their edges. It costs as much as Dial's algorithm on that
+ball, and allocates O(W) for the queue plus O(1) per vertex reached.
 
-The total space complexity is then O(V + V * W) = O(V * W)
+The bidirectional search keeps best, the length of the shortest source-target path seen
+through a relaxed edge. Let a and b be the smallest priorities in the forward and
+backward queues. A shorter path would have to leave the forward settled set through a
+vertex at forward distance >= a and enter the backward settled set from one at backward
+distance >= b, so once a + b >= best no shorter path remains and best is the distance.
+Each side then settles roughly the vertices within half the distance of its end, which on
+large sparse graphs is much less than the full ball.
 
 '''
 
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+
+from dial import SearchStats, _queue_type, dial_csr, extract_path
+from graph import CSRGraph
+
+
+class DynamicShortestPaths:
+    """Shortest path distances and tree from one source, kept up to date while edge
+    weights change.
+
+    - Decrease of (u, v). Only v can get closer through the edge, and then only the
+      vertices whose shortest paths would now go through v. Dial's algorithm runs from
+      v alone, and stops relaxing wherever a distance does not improve.
+    - Increase of (u, v). Nothing changes unless u is the predecessor of v. Then only
+      the subtree of v in the shortest path tree can get farther. Its vertices are reset,
+      each is seeded with its best distance through an in-neighbor outside the subtree,
+      and Dial's algorithm settles them again from those seeds.
+
+    Either way the work is proportional to the vertices whose distance or predecessor
+    changes and their edges, plus sorting the seeds, instead of a full run of Dial's
+    algorithm. The result is the same as a full recompute, though ties may pick another
+    shortest path tree.
+
+    Examples
+    --------
+    >>> G = nx.Graph()
+    >>> G.add_weighted_edges_from([("s", "a", 1), ("a", "b", 1), ("s", "b", 5)])
+    >>> paths = DynamicShortestPaths(G, "s")
+    >>> paths.distance("b"), paths.path("b")
+    (2, ['s', 'a', 'b'])
+    >>> paths.set_weight("a", "b", 7)
+    >>> paths.distance("b"), paths.path("b")
+    (5, ['s', 'b'])
+    >>> paths.set_weight("s", "a", 9)
+    >>> paths.distance("a"), paths.path("a")
+    (9, ['s', 'a'])
+    """
+
+    def __init__(self, G: nx.Graph | CSRGraph, source: Hashable,
+                 max_edge_weight: int | None = None):
+        """Computes the shortest paths from source with Dial's algorithm.
+
+        Parameters
+        ----------
+        G : nx.Graph | CSRGraph
+            A graph or directed graph with bounded positive integer edge weights.
+            Its weights are copied, so later changes do not affect G.
+        source : Hashable
+            The source vertex.
+        max_edge_weight : Optional[int], optional
+            Maximum edge weight in G, by default None.
+            Will be calculated in Theta(E) time if not provided.
+        """
+        self.graph = graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+        self.source = graph.index[source]
+        self.max_edge_weight = graph.max_edge_weight if max_edge_weight is None \
+            else max_edge_weight
+        offsets, targets, weights = graph.lists
+        self._out = (offsets, targets, list(weights))
+        if graph.directed:
+            offsets, targets, weights = graph.reverse.lists
+            self._in = (offsets, targets, list(weights))
+        else:
+            self._in = self._out
+
+        distances, predecessors = dial_csr(graph, self.source, self.max_edge_weight,
+                                           return_predecessors=True)
+        self._distances: list[float] = [int(d) if d != np.inf else d
+                                        for d in distances.tolist()]
+        self._predecessors: list[int] = predecessors.tolist()
+
+    @property
+    def distances(self) -> np.ndarray:
+        """Distance from the source to every vertex, np.inf if unreachable."""
+        return np.array(self._distances, dtype=np.float64)
+
+    @property
+    def predecessors(self) -> np.ndarray:
+        """Shortest path tree, as returned by dial_csr with return_predecessors=True."""
+        return np.array(self._predecessors, dtype=self.graph.targets.dtype)
+
+    def distance(self, node: Hashable) -> float:
+        """Distance from the source to node, float("inf") if unreachable."""
+        return self._distances[self.graph.index[node]]
+
+    def path(self, node: Hashable) -> list[Hashable]:
+        """Nodes of a shortest path from the source to node, empty if unreachable."""
+        return extract_path(self.graph, self._predecessors, self.graph.index[node])
+
+    def set_weight(self, u: Hashable, v: Hashable, weight: int,
+                   stats: SearchStats | None = None):
+        """Changes the weight of the edge from u to v, and repairs the shortest paths.
+
+        Parameters
+        ----------
+        u : Hashable
+            First endpoint of the edge.
+        v : Hashable
+            Second endpoint of the edge.
+        weight : int
+            New weight of the edge, a positive integer.
+        stats : Optional[SearchStats], optional
+            Counters to add the number of vertices settled again to, by default None.
+
+        Raises
+        ------
+        KeyError
+            If there is no edge from u to v.
+        ValueError
+            If weight is not a positive integer.
+        """
+        if weight != int(weight) or weight < 1:
+            raise ValueError("Edge weights must be positive integers.")
+        weight = int(weight)
+        i, j = self.graph.index[u], self.graph.index[v]
+        old = self._set(self._out, i, j, weight)
+        self._set(self._in, j, i, weight)
+        self.max_edge_weight = max(self.max_edge_weight, weight)
+
+        # An undirected edge is also the edge from v to u.
+        ends = [(i, j)] if self.graph.directed else [(i, j), (j, i)]
+        distances, predecessors = self._distances, self._predecessors
+        seeds = []
+        for x, y in ends:
+            if weight < old and distances[x] + weight < distances[y]:
+                distances[y] = distances[x] + weight
+                predecessors[y] = x
+                seeds = [(distances[y], y)]
+            elif weight > old and predecessors[y] == x and y != self.source:
+                seeds = self._reset_subtree(y)
+        settled = self._settle(seeds)
+        if stats is not None:
+            stats.settled += settled
+
+    def _set(self, adjacency: tuple[list[int], list[int], list[int]], i: int, j: int,
+             weight: int) -> int:
+        """Sets the weight of the edge from i to j in adjacency lists, returning the old one."""
+        offsets, targets, weights = adjacency
+        for k in range(offsets[i], offsets[i + 1]):
+            if targets[k] == j:
+                old, weights[k] = weights[k], weight
+                return old
+        raise KeyError(f"No edge from {self.graph.nodes[i]} to {self.graph.nodes[j]}.")
+
+    def _reset_subtree(self, root: int) -> list[tuple[int, int]]:
+        """Resets the distances in the subtree of root, and returns the seeds to settle it
+        again: (distance, vertex) for every vertex with an in-neighbor outside, sorted."""
+        offsets, targets, _ = self._out
+        distances, predecessors = self._distances, self._predecessors
+        subtree = [root]
+        # The children of x are the out-neighbors whose predecessor is x.
+        for x in subtree:
+            for k in range(offsets[x], offsets[x + 1]):
+                y = targets[k]
+                if predecessors[y] == x:
+                    subtree.append(y)
+        for x in subtree:
+            distances[x] = float('inf')
+            predecessors[x] = -1
+
+        in_offsets, sources, weights = self._in
+        seeds = []
+        for x in subtree:
+            for k in range(in_offsets[x], in_offsets[x + 1]):
+                distance = distances[sources[k]] + weights[k]
+                if distance < distances[x]:
+                    distances[x] = distance
+                    predecessors[x] = sources[k]
+            if distances[x] != float('inf'):
+                seeds.append((distances[x], x))
+        seeds.sort()
+        return seeds
+
+    def _settle(self, seeds: list[tuple[int, int]]) -> int:
+        """Runs Dial's algorithm from seeds, sorted (distance, vertex) pairs whose
+        distances are already set, and returns the number of settled vertices."""
+        offsets, targets, weights = self._out
+        distances, predecessors = self._distances, self._predecessors
+        max_gap = self.max_edge_weight
+        queue = _queue_type(self.graph, max_gap)(max_gap)
+        settled = 0
+        next_seed = 0
+
+        while queue or next_seed < len(seeds):
+            # Seeds join the queue once they fit in its window of priorities. Those
+            # left out are above every queued priority, so they cannot be popped yet.
+            while next_seed < len(seeds) and (
+                    not queue or seeds[next_seed][0] <= queue.current + max_gap):
+                distance, x = seeds[next_seed]
+                next_seed += 1
+                # A seed whose vertex was reached by a shorter path is stale.
+                if distances[x] == distance:
+                    queue.push(x, distance)
+            if not queue:
+                continue
+            u, curr_dist = queue.pop()
+            settled += 1
+            for k in range(offsets[u], offsets[u + 1]):
+                v = targets[k]
+                distance = curr_dist + weights[k]
+                if distance < distances[v]:
+                    distances[v] = distance
+                    predecessors[v] = u
+                    queue.push(v, distance)
+        return settled
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain
+from operator import itemgetter
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """A graph with integer edge weights in compressed sparse row (CSR) form.
+
+    Vertices are numbered 0, ..., V - 1. The edges leaving vertex i are
+    targets[offsets[i]:offsets[i + 1]], with weights at the same positions.
+    An undirected edge is stored once in each direction.
+
+    Examples
+    --------
+    >>> G = nx.Graph()
+    >>> G.add_weighted_edges_from([("a", "b", 2), ("b", "c", 3)])
+    >>> graph = CSRGraph.from_networkx(G)
+    >>> graph.offsets, graph.targets, graph.weights
+    (array([0, 1, 3, 4], dtype=int32), array([1, 0, 2, 1], dtype=int32), array([2, 2, 3, 3], dtype=uint8))
+    >>> graph.index["c"], graph.nodes[2]
+    (2, 'c')
+    """
+    offsets: np.ndarray
+    targets: np.ndarray
+    weights: np.ndarray
+    nodes: list[Hashable]
+    index: dict[Hashable, int]
+    directed: bool = False
+
+    @classmethod
+    def from_networkx(cls, G: nx.Graph, weight: str = "weight") -> CSRGraph:
+        """Converts a NetworkX graph, in Theta(V + E) time.
+
+        Parameters
+        ----------
+        G : nx.Graph
+            A graph or directed graph with positive integer edge weights.
+        weight : str, optional
+            Edge attribute holding the weight, by default "weight".
+
+        Returns
+        -------
+        graph : CSRGraph
+            The same graph, with vertices numbered in the order of G.nodes.
+
+        Raises
+        ------
+        ValueError
+            If some edge weight is not a positive integer.
+        """
+        nodes = list(G)
+        index = {node: i for i, node in enumerate(nodes)}
+        adjacency = [neighbors for _, neighbors in G.adjacency()]
+        degrees = np.fromiter(map(len, adjacency), dtype=np.int64, count=len(nodes))
+        num_edges = int(degrees.sum())
+
+        offsets = np.zeros(len(nodes) + 1, dtype=np.int32 if num_edges < 2 ** 31 else np.int64)
+        np.cumsum(degrees, out=offsets[1:])
+        targets = np.fromiter(map(index.__getitem__, chain.from_iterable(adjacency)),
+                              dtype=np.int32, count=num_edges)
+        weights = np.fromiter(
+            map(itemgetter(weight), chain.from_iterable(map(dict.values, adjacency))),
+            dtype=np.float64, count=num_edges)
+        if num_edges and (weights.min() < 1 or (weights != np.round(weights)).any()):
+            raise ValueError("Edge weights must be positive integers.")
+        max_weight = int(weights.max()) if num_edges else 0
+        return cls(offsets, targets, weights.astype(np.min_scalar_type(max_weight)), nodes, index,
+                   G.is_directed())
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.nodes)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of stored (directed) edges, twice the number of undirected edges."""
+        return len(self.targets)
+
+    @property
+    def max_edge_weight(self) -> int:
+        return int(self.weights.max()) if self.num_edges else 0
+
+    @cached_property
+    def lists(self) -> tuple[list[int], list[int], list[int]]:
+        """offsets, targets and weights as Python lists, which are faster to index one
+        element at a time. Built once per graph."""
+        return self.offsets.tolist(), self.targets.tolist(), self.weights.tolist()
+
+    @cached_property
+    def reverse(self) -> CSRGraph:
+        """The graph with every edge reversed, the graph itself if it is undirected."""
+        if not self.directed:
+            return self
+        sources = np.repeat(np.arange(self.num_nodes, dtype=self.targets.dtype),
+                            np.diff(self.offsets))
+        order = np.argsort(self.targets, kind="stable")
+        offsets = np.zeros_like(self.offsets)
+        np.cumsum(np.bincount(self.targets, minlength=self.num_nodes), out=offsets[1:])
+        return CSRGraph(offsets, sources[order], self.weights[order], self.nodes, self.index,
+                        directed=True)
+
+    def to_dict(self, values: np.ndarray) -> dict[Hashable, float]:
+        """Maps an array of distances indexed by vertex to a dict keyed by node.
+
+        Whole distances become ints and unreachable vertices float("inf"),
+        matching nx.single_source_dijkstra_path_length on reachable nodes.
+        """
+        return {node: int(value) if value != np.inf else value
+                for node, value in zip(self.nodes, values.tolist())}
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
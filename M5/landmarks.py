@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+
+from dial import SearchStats, _queue_type, dial_csr
+from graph import CSRGraph
+from utils import generate_connected_weighted_graph
+
+
+class LandmarkOracle:
+    """Shortest path distances for repeated queries on a static graph, with landmarks.
+
+    Preprocessing picks L landmarks, each the vertex farthest from those picked before
+    (and from vertex 0, to start with), and runs Dial's algorithm from each, keeping the
+    distances in L x V arrays.
+    By the triangle inequality, d(v, t) >= d(l, t) - d(l, v) and d(v, t) >= d(v, l) - d(t, l)
+    for every landmark l. The largest of these bounds is a consistent potential h, so an
+    A* search with bucket priorities g(v) + h(v) settles target exactly once, usually
+    after only a small part of the vertices Dial's algorithm would settle (the ALT
+    algorithm of Goldberg and Harrelson).
+
+    Full single-source results computed by single_source are kept in a least recently
+    used cache, which later queries from the same source, or to it on an undirected
+    graph, read directly.
+
+    Examples
+    --------
+    >>> G = generate_connected_weighted_graph(n=200, max_edge_weight=10)
+    >>> oracle = LandmarkOracle(G, num_landmarks=4)
+    >>> len(oracle.landmarks)
+    4
+    >>> oracle.distance(0, 199) == nx.dijkstra_path_length(G, 0, 199)
+    True
+    """
+
+    def __init__(self, G: nx.Graph | CSRGraph, num_landmarks: int = 8,
+                 max_edge_weight: int | None = None, cache_size: int = 16):
+        """Picks the landmarks and computes their distance tables, in L + 1 runs of Dial's
+        algorithm, or 2L + 1 on a directed graph.
+
+        Parameters
+        ----------
+        G : nx.Graph | CSRGraph
+            A graph or directed graph with bounded positive integer edge weights.
+        num_landmarks : int, optional
+            Number L of landmarks, by default 8. At most the number of vertices are used.
+        max_edge_weight : Optional[int], optional
+            Maximum edge weight in G, by default None.
+            Will be calculated in Theta(E) time if not provided.
+        cache_size : int, optional
+            Number of single-source results to keep, by default 16.
+        """
+        self.graph = graph = G if isinstance(G, CSRGraph) else CSRGraph.from_networkx(G)
+        self.max_edge_weight = graph.max_edge_weight if max_edge_weight is None \
+            else max_edge_weight
+        self.cache_size = cache_size
+        self._cache: OrderedDict[int, np.ndarray] = OrderedDict()
+
+        num_landmarks = min(num_landmarks, graph.num_nodes)
+        # Distances from and to every landmark, by landmark
+        self._from_landmarks = np.empty((num_landmarks, graph.num_nodes))
+        self._to_landmarks = self._from_landmarks if not graph.directed \
+            else np.empty((num_landmarks, graph.num_nodes))
+        landmarks = []
+        # Distance from vertex 0 and the landmarks picked so far. Vertices they do not
+        # reach are at distance inf, so every component gets a landmark first.
+        nearest = dial_csr(graph, 0, self.max_edge_weight) if num_landmarks else None
+        for i in range(num_landmarks):
+            landmark = int(np.argmax(nearest))
+            landmarks.append(landmark)
+            self._from_landmarks[i] = dial_csr(graph, landmark, self.max_edge_weight)
+            if graph.directed:
+                self._to_landmarks[i] = dial_csr(graph.reverse, landmark, self.max_edge_weight)
+            np.minimum(nearest, self._from_landmarks[i], out=nearest)
+        self.landmarks: list[Hashable] = [graph.nodes[i] for i in landmarks]
+
+    def lower_bounds(self, target: Hashable) -> np.ndarray:
+        """Lower bound on the distance from every vertex to target, in O(LV) time.
+
+        Vertices which provably cannot reach target get np.inf.
+        """
+        t = self.graph.index[target]
+        with np.errstate(invalid='ignore'):
+            # inf - inf, for vertices and targets no landmark reaches, gives no bound.
+            bounds = np.fmax(
+                np.fmax.reduce(self._from_landmarks[:, [t]] - self._from_landmarks, axis=0),
+                np.fmax.reduce(self._to_landmarks - self._to_landmarks[:, [t]], axis=0))
+        bounds[np.isnan(bounds)] = 0
+        return np.maximum(bounds, 0)
+
+    def single_source(self, source: Hashable) -> np.ndarray:
+        """Shortest path distances from source to every vertex, np.inf if unreachable,
+        from the cache or from a run of Dial's algorithm that is then cached."""
+        s = self.graph.index[source]
+        if s in self._cache:
+            self._cache.move_to_end(s)
+            return self._cache[s]
+        distances = dial_csr(self.graph, s, self.max_edge_weight)
+        if self.cache_size > 0:
+            self._cache[s] = distances
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return distances
+
+    def distance(self, source: Hashable, target: Hashable,
+                 stats: SearchStats | None = None) -> float:
+        """Compute the shortest path distance between two vertices.
+
+        Parameters
+        ----------
+        source : Hashable
+            The source vertex.
+        target : Hashable
+            The target vertex.
+        stats : Optional[SearchStats], optional
+            Counters to add the number of settled vertices to, by default None.
+
+        Returns
+        -------
+        distance : float
+            Shortest path distance from source to target, float("inf") if unreachable.
+        """
+        s, t = self.graph.index[source], self.graph.index[target]
+        cached = self._cached(s, t)
+        if cached is not None:
+            return int(cached) if cached != np.inf else float('inf')
+
+        offsets, targets, weights = self.graph.lists
+        bounds = self.lower_bounds(target)
+        finite = bounds[bounds != np.inf]
+        bounds = bounds.tolist()
+        if bounds[s] == float('inf'):
+            return float('inf')
+        # Along an edge (u, v) of weight w, the priority grows by w + h(v) - h(u) >= 0,
+        # which is at most 2w on an undirected graph.
+        max_gap = self.max_edge_weight + (
+            int(finite.max()) if self.graph.directed else self.max_edge_weight)
+        queue = _queue_type(self.graph, max_gap)(max_gap)
+        distances = {s: 0}
+        queue.push(s, int(bounds[s]))
+        settled = 0
+
+        while queue:
+            u, _ = queue.pop()
+            settled += 1
+            if u == t:
+                break
+            curr_dist = distances[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                bound = bounds[v]
+                if bound == float('inf'):
+                    continue
+                distance = curr_dist + weights[i]
+                if distance < distances.get(v, distance + 1):
+                    distances[v] = distance
+                    queue.push(v, distance + int(bound))
+        if stats is not None:
+            stats.settled += settled
+        return distances.get(t, float('inf'))
+
+    def _cached(self, s: int, t: int) -> float | None:
+        """The distance from s to t if a cached result holds it, otherwise None."""
+        if s in self._cache:
+            self._cache.move_to_end(s)
+            return self._cache[s][t]
+        if not self.graph.directed and t in self._cache:
+            self._cache.move_to_end(t)
+            return self._cache[t][s]
+        return None
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
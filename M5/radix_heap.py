@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Hashable
+
+
+class RadixHeap:
+    """Monotone priority queue for integer priorities with a large maximum gap.
+
+    This is the radix heap of Ahuja, Mehlhorn, Orlin and Tarjan. With p the last popped
+    priority and W the largest gap allowed, the priorities in the queue lie in
+    [p, p + W]. They are split into B + 1 buckets, B = bit_length(W) + 1, covering
+    consecutive ranges of widths 1, 1, 2, 4, ..., 2 ** (B - 2) from p on, and a last
+    bucket for anything above. Popping from an empty bucket 0 finds the smallest
+    priority d in the first non-empty bucket j, whose range is less than 2 ** (j - 1)
+    wide, and spreads that range over buckets 0, ..., j - 1 from d on. Its items all move
+    to lower buckets, so every item moves O(log W) times in total.
+
+    Each bucket is a dict, so changing the priority of an item moves it to its new
+    bucket rather than leaving a stale entry behind.
+    Push is O(log log W), lowering a priority O(1) plus the moves it saves later, and
+    pop O(log W) amortized. A run of Dijkstra's algorithm then takes O(E + V log W) time
+    and O(V + log W) space.
+
+    Examples
+    --------
+    >>> queue = RadixHeap(max_gap=1000)
+    >>> queue.push("a", 900)
+    >>> queue.push("b", 30)
+    >>> queue.push("a", 7)
+    >>> queue.pop()
+    ('a', 7)
+    >>> queue.push("c", 1500)
+    Traceback (most recent call last):
+      ...
+    ValueError: Priority 1500 is outside [7, 1007].
+    >>> queue.peek(), queue.pop(), len(queue)
+    (('b', 30), ('b', 30), 0)
+    """
+
+    def __init__(self, max_gap: int):
+        """Constructs an empty RadixHeap.
+
+        Parameters
+        ----------
+        max_gap : int
+            Largest difference W between the priorities of two items in the queue at
+            the same time. For Dijkstra's algorithm, this is the maximum edge weight.
+        """
+        if max_gap < 0:
+            raise ValueError("The maximum gap must be non-negative.")
+        self.max_gap = max_gap
+        num_buckets = max_gap.bit_length() + 2
+        self._buckets: list[dict[Hashable, int]] = [{} for _ in range(num_buckets)]
+        # Largest priority of each bucket; the last bucket has no bound.
+        self._upper: list[float] = [float('inf')] * num_buckets
+        self._bucket_of: dict[Hashable, int] = {}
+        self._spread(0, num_buckets - 1, float('inf'))
+
+    def __len__(self) -> int:
+        return len(self._bucket_of)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._bucket_of
+
+    @property
+    def current(self) -> int:
+        """The last popped priority, a lower bound on every priority in the queue."""
+        return self._upper[0]
+
+    def push(self, item: Hashable, priority: int):
+        """Inserts item, or changes its priority if it is already in the queue.
+
+        Raises
+        ------
+        ValueError
+            If the queue is not empty and priority is below the last popped priority
+            or more than max_gap above it.
+        """
+        current = self._upper[0]
+        if not self._bucket_of and not current <= priority <= current + self.max_gap:
+            # An empty queue can restart anywhere.
+            self._spread(priority, len(self._buckets) - 1, float('inf'))
+        elif not current <= priority <= current + self.max_gap:
+            raise ValueError(
+                f"Priority {priority} is outside [{current}, {current + self.max_gap}].")
+        old = self._bucket_of.get(item)
+        if old is None:
+            bucket = bisect_left(self._upper, priority)
+        else:
+            del self._buckets[old][item]
+            # Lowering a priority only scans the buckets below the old one.
+            bucket = bisect_left(self._upper, priority, 0, old + 1) \
+                if priority <= self._upper[old] else bisect_left(self._upper, priority)
+        self._buckets[bucket][item] = priority
+        self._bucket_of[item] = bucket
+
+    def peek(self) -> tuple[Hashable, int]:
+        """Returns an item of minimum priority, with its priority, without removing it.
+
+        Raises
+        ------
+        IndexError
+            If the queue is empty.
+        """
+        bucket = self._advance()
+        item = next(reversed(bucket))
+        return item, bucket[item]
+
+    def pop(self) -> tuple[Hashable, int]:
+        """Removes and returns an item of minimum priority, with its priority.
+
+        Raises
+        ------
+        IndexError
+            If the queue is empty.
+        """
+        item, priority = self._advance().popitem()
+        del self._bucket_of[item]
+        return item, priority
+
+    def _advance(self) -> dict[Hashable, int]:
+        """Makes bucket 0 non-empty, holding the items of minimum priority, and returns it."""
+        buckets = self._buckets
+        if buckets[0]:
+            return buckets[0]
+        if not self._bucket_of:
+            raise IndexError("pop from an empty radix heap")
+        j = 1
+        while not buckets[j]:
+            j += 1
+        moved = buckets[j]
+        buckets[j] = {}
+        self._spread(min(moved.values()), j, self._upper[j])
+        upper, bucket_of = self._upper, self._bucket_of
+        for item, priority in moved.items():
+            bucket = bisect_left(upper, priority, 0, j)
+            buckets[bucket][item] = priority
+            bucket_of[item] = bucket
+        return buckets[0]
+
+    def _spread(self, start: int, j: int, limit: float):
+        """Makes buckets 0, ..., j - 1 cover priorities from start to limit, with
+        widths 1, 1, 2, 4, ..."""
+        upper = self._upper
+        upper[0] = start
+        for i in range(1, j):
+            upper[i] = min(upper[i - 1] + (1 << (i - 1)), limit)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,54 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from batch import dial_distance_matrix
+from dial import dial_multi_source
+from graph import CSRGraph
+from utils import generate_complete_weighted_graph, generate_connected_weighted_graph
+
+
+def expected_matrix(G, sources):
+    lengths = [nx.single_source_dijkstra_path_length(G, source) for source in sources]
+    return np.array([[row.get(v, np.inf) for v in G] for row in lengths])
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_distance_matrix(generate, max_workers):
+    G = generate(n=100, max_edge_weight=10)
+    sources = list(range(0, 100, 3))
+    actual = dial_distance_matrix(G, sources, max_workers=max_workers)
+    assert np.array_equal(actual, expected_matrix(G, sources))
+
+
+def test_all_pairs():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    graph = CSRGraph.from_networkx(G)
+    actual = dial_distance_matrix(graph, max_workers=2)
+    assert actual.shape == (5, 5)
+    assert np.array_equal(actual, expected_matrix(G, G))
+
+
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_multi_source(generate):
+    G = generate(n=300, max_edge_weight=10)
+    graph = CSRGraph.from_networkx(G)
+    sources = [5, 17, 123, 250]
+    matrix = expected_matrix(G, sources)
+    distances, nearest = dial_multi_source(graph, sources, return_nearest=True)
+    assert np.array_equal(distances, matrix.min(axis=0))
+    assert set(nearest.tolist()) <= set(sources)
+    rows = [sources.index(s) for s in nearest.tolist()]
+    assert np.array_equal(matrix[rows, np.arange(300)], distances)
+
+
+def test_multi_source_unreachable():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    distances, nearest = dial_multi_source(G, ["c", "a"], return_nearest=True)
+    assert distances.tolist() == [0, 1, 0, np.inf, np.inf]
+    assert nearest.tolist() == [0, 2, 2, -1, -1]
@@ -0,0 +1,35 @@
+import json
+
+import networkx as nx
+import pytest
+
+import benchmarks
+
+
+@pytest.mark.parametrize("density", [0, 4, "complete"])
+def test_make_graph(density):
+    G = benchmarks.make_graph(200, density, max_edge_weight=7)
+    assert G.number_of_nodes() == 200
+    assert nx.is_connected(G)
+    assert all(1 <= w <= 7 for _, _, w in G.edges(data="weight"))
+    if density == 0:
+        assert nx.is_tree(G)
+    if density == "complete":
+        assert G.number_of_edges() == benchmarks.num_edges(200, density)
+
+
+def test_run_benchmarks(tmp_path):
+    path = tmp_path / "bench.json"
+    benchmarks.main(["--sizes", "300", "--densities", "0", "complete", "--weights", "1", "50",
+                     "--max-edges", "10000", "--repeat", "1", "--json", str(path)])
+    with open(path) as f:
+        report = json.load(f)
+    results = report["results"]
+    # The complete graph has 44,850 edges, over the limit.
+    assert len(results) == 2 * len(benchmarks.BACKENDS)
+    for result in results:
+        assert result["size"] == 300 and result["density"] == 0
+        assert result["seconds"] > 0 and result["speedup"] > 0
+        assert result["peak_mb"] >= 0
+    wins = benchmarks.winning_weights(results)
+    assert list(wins) == [(300, 0)] and set(wins[300, 0]) <= {1, 50}
@@ -0,0 +1,56 @@
+import heapq
+import random
+
+import pytest
+
+from bucket_queue import BucketQueue
+
+
+def test_matches_heap():
+    # Dijkstra-like use: priorities at most max_gap above the last popped one.
+    rng = random.Random(0)
+    queue, heap, priority = BucketQueue(max_gap=7), [], {}
+    current = 0
+    for _ in range(20000):
+        if priority and rng.random() < 0.4:
+            while heap[0][0] != priority.get(heap[0][1]):
+                heapq.heappop(heap)
+            item, current = queue.pop()
+            expected_priority = heap[0][0]
+            assert current == expected_priority
+            assert priority.pop(item) == current
+        else:
+            item = rng.randrange(100)
+            new_priority = current + rng.randint(0, 7)
+            if item in priority and priority[item] <= new_priority:
+                continue
+            queue.push(item, new_priority)
+            priority[item] = new_priority
+            heapq.heappush(heap, (new_priority, item))
+        assert len(queue) == len(priority)
+
+
+def test_stale_entries_are_dropped():
+    queue = BucketQueue(max_gap=1000)
+    for priority in range(1000, 0, -1):
+        queue.push("a", priority)
+    assert len(queue) == 1
+    assert queue._entries <= 2 + 1001
+    assert queue.pop() == ("a", 1)
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_priority_window():
+    queue = BucketQueue(max_gap=2)
+    queue.push(0, 5)
+    queue.push(1, 6)
+    with pytest.raises(ValueError):
+        queue.push(2, 8)
+    queue.pop()
+    with pytest.raises(ValueError):
+        queue.push(2, 4)
+    queue.pop()
+    # Once empty, the queue can restart anywhere.
+    queue.push(1, 4)
+    assert 1 in queue
@@ -2,7 +2,11 @@
 import pytest
 import networkx as nx
 from utils import generate_complete_weighted_graph, generate_connected_weighted_graph
-from dial import dial_shortest_path_length
+from bucket_queue import BucketQueue
+from dial import (SearchStats, _queue_type, dial_csr, dial_distance, dial_shortest_path_length,
+                  extract_path, radix_heap_shortest_path_length)
+from radix_heap import RadixHeap
+from graph import CSRGraph
 
 
 @pytest.mark.parametrize("size", [10, 20, 50, 100, 500, 1000])
@@ -19,3 +23,122 @@ def test_connected(size):
     expected = nx.single_source_dijkstra_path_length(G, source=0)
     actual = dial_shortest_path_length(G, source=0, max_edge_weight=10)
     assert actual == expected
+
+
+@pytest.mark.parametrize("size", [10, 100, 1000])
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_csr(size, generate):
+    G = generate(n=size, max_edge_weight=10)
+    graph = CSRGraph.from_networkx(G)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    assert graph.to_dict(dial_csr(graph, source=0)) == expected
+    assert dial_shortest_path_length(graph, source=0) == expected
+
+
+def test_unreachable():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    assert dial_shortest_path_length(G, "a") == {"a": 0, "b": 3, "c": 4,
+                                                 "x": float("inf"), "y": float("inf")}
+
+
+def test_large_weights():
+    # Only W + 1 buckets are allocated, however long the paths get.
+    G = generate_connected_weighted_graph(n=300, max_edge_weight=10_000, edge_probability=0.01)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    assert dial_shortest_path_length(G, source=0) == expected
+
+
+def test_max_edge_weight_too_small():
+    G = nx.Graph()
+    G.add_weighted_edges_from([(0, 1, 1), (0, 2, 2), (1, 3, 5)])
+    with pytest.raises(ValueError):
+        dial_shortest_path_length(G, source=0, max_edge_weight=2)
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_distance(generate, bidirectional):
+    G = generate(n=200, max_edge_weight=10)
+    graph = CSRGraph.from_networkx(G)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    for target in range(0, 200, 7):
+        assert dial_distance(graph, 0, target, bidirectional=bidirectional) == expected[target]
+
+
+@pytest.mark.parametrize("bidirectional", [False, True])
+def test_distance_unreachable(bidirectional):
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    assert dial_distance(G, "a", "c", bidirectional=bidirectional) == 4
+    assert dial_distance(G, "a", "y", bidirectional=bidirectional) == float("inf")
+    assert dial_distance(G, "x", "x", bidirectional=bidirectional) == 0
+
+
+def test_distance_directed():
+    G = nx.gnp_random_graph(300, 0.02, seed=1, directed=True)
+    for u, v in G.edges:
+        G[u][v]["weight"] = (u * 7 + v * 3) % 10 + 1
+    graph = CSRGraph.from_networkx(G)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    for target in range(300):
+        actual = dial_distance(graph, 0, target, bidirectional=True)
+        assert actual == expected.get(target, float("inf"))
+
+
+def test_settled_counter():
+    # On a grid, a search settles a disk around its start: the bidirectional search
+    # settles two disks of half the radius, about half as many vertices.
+    G = nx.grid_2d_graph(101, 101)
+    nx.set_edge_attributes(G, 1, "weight")
+    one_way, two_way = SearchStats(), SearchStats()
+    assert dial_distance(G, (50, 40), (50, 60), stats=one_way) == 20
+    assert dial_distance(G, (50, 40), (50, 60), bidirectional=True, stats=two_way) == 20
+    assert 2 * 19 * 20 < one_way.settled <= 2 * 20 * 21 + 1
+    assert two_way.settled < 0.6 * one_way.settled
+
+
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_predecessors(generate):
+    G = generate(n=300, max_edge_weight=10)
+    graph = CSRGraph.from_networkx(G)
+    distances, predecessors = dial_csr(graph, source=0, return_predecessors=True)
+    assert graph.to_dict(distances) == nx.single_source_dijkstra_path_length(G, source=0)
+    assert predecessors.dtype == graph.targets.dtype
+    for target in G:
+        path = extract_path(graph, predecessors, graph.index[target])
+        assert path[0] == 0 and path[-1] == target
+        assert nx.path_weight(G, path, "weight") == distances[graph.index[target]]
+
+
+def test_predecessors_unreachable():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    graph = CSRGraph.from_networkx(G)
+    _, predecessors = dial_csr(graph, graph.index["a"], return_predecessors=True)
+    assert predecessors.tolist() == [0, 0, 1, -1, -1]
+    assert extract_path(graph, predecessors, graph.index["a"]) == ["a"]
+    assert extract_path(graph, predecessors, graph.index["c"]) == ["a", "b", "c"]
+    assert extract_path(graph, predecessors, graph.index["y"]) == []
+
+
+@pytest.mark.parametrize("max_edge_weight", [1, 10, 100_000])
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_radix_heap(generate, max_edge_weight):
+    G = generate(n=200, max_edge_weight=max_edge_weight)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    assert radix_heap_shortest_path_length(G, source=0) == expected
+
+
+def test_queue_selection():
+    graph = CSRGraph.from_networkx(generate_connected_weighted_graph(n=300, max_edge_weight=10))
+    assert _queue_type(graph, 10) is BucketQueue
+    assert _queue_type(graph, 100_000) is RadixHeap
+    G = generate_connected_weighted_graph(n=300, max_edge_weight=100_000)
+    expected = nx.single_source_dijkstra_path_length(G, source=0)
+    assert dial_shortest_path_length(G, source=0) == expected
+    assert dial_distance(G, 0, 299, bidirectional=True) == expected[299]
@@ -0,0 +1,92 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from dial import SearchStats
+from dynamic import DynamicShortestPaths
+from utils import generate_complete_weighted_graph, generate_connected_weighted_graph
+
+
+def check(paths, G, source):
+    expected = nx.single_source_dijkstra_path_length(G, source)
+    graph = paths.graph
+    assert graph.to_dict(paths.distances) == {v: expected.get(v, float("inf")) for v in G}
+    # The predecessors form a shortest path tree.
+    for v in G:
+        path = paths.path(v)
+        if v in expected:
+            assert path[0] == source and path[-1] == v
+            assert nx.path_weight(G, path, "weight") == expected[v]
+        else:
+            assert path == []
+
+
+@pytest.mark.parametrize("max_edge_weight", [1, 10, 100_000])
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_random_updates(generate, max_edge_weight):
+    G = generate(n=100, max_edge_weight=max_edge_weight)
+    paths = DynamicShortestPaths(G, 0)
+    rng = random.Random(max_edge_weight)
+    edges = list(G.edges)
+    for _ in range(100):
+        u, v = rng.choice(edges)
+        weight = rng.randint(1, 2 * max_edge_weight)
+        paths.set_weight(u, v, weight)
+        G[u][v]["weight"] = weight
+        check(paths, G, 0)
+
+
+def test_directed():
+    G = nx.gnp_random_graph(100, 0.05, seed=2, directed=True)
+    for u, v in G.edges:
+        G[u][v]["weight"] = (u * 7 + v * 3) % 10 + 1
+    paths = DynamicShortestPaths(G, 0)
+    rng = random.Random(0)
+    edges = list(G.edges)
+    for _ in range(200):
+        u, v = rng.choice(edges)
+        weight = rng.randint(1, 20)
+        paths.set_weight(u, v, weight)
+        G[u][v]["weight"] = weight
+        check(paths, G, 0)
+
+
+def test_local_repair():
+    # A path with a shortcut to its far end: only the vertices past the shortcut change.
+    G = nx.path_graph(1000)
+    nx.set_edge_attributes(G, 1, "weight")
+    G.add_edge(0, 990, weight=985)
+    paths = DynamicShortestPaths(G, 0)
+    assert paths.distance(995) == 990
+    stats = SearchStats()
+    paths.set_weight(0, 990, 980, stats=stats)
+    assert paths.distance(995) == 985 and paths.distance(985) == 985
+    paths.set_weight(0, 990, 2000, stats=stats)
+    assert paths.distance(995) == 995
+    assert stats.settled < 50
+    G[0][990]["weight"] = 2000
+    check(paths, G, 0)
+
+
+def test_disconnect():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("s", "a", 1), ("a", "b", 1), ("x", "y", 2)])
+    paths = DynamicShortestPaths(G, "s")
+    paths.set_weight("s", "a", 3)
+    assert paths.distance("b") == 4 and paths.distance("x") == float("inf")
+    assert paths.predecessors.tolist() == [0, 0, 1, -1, -1]
+    assert np.array_equal(paths.distances, [0, 3, 4, np.inf, np.inf])
+
+
+def test_invalid():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("s", "a", 1), ("a", "b", 1)])
+    paths = DynamicShortestPaths(G, "s")
+    with pytest.raises(KeyError):
+        paths.set_weight("s", "b", 1)
+    with pytest.raises(ValueError):
+        paths.set_weight("s", "a", 0)
+    assert paths.distance("b") == 2
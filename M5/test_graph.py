@@ -0,0 +1,49 @@
+import networkx as nx
+import numpy as np
+import pytest
+
+from graph import CSRGraph
+from utils import generate_connected_weighted_graph
+
+
+def test_from_networkx():
+    G = generate_connected_weighted_graph(n=50, max_edge_weight=300)
+    graph = CSRGraph.from_networkx(G)
+    assert graph.num_nodes == 50
+    assert graph.num_edges == 2 * G.number_of_edges()
+    assert graph.weights.dtype == np.uint16
+    for u in G:
+        i = graph.index[u]
+        start, end = graph.offsets[i], graph.offsets[i + 1]
+        neighbors = {graph.nodes[j]: w for j, w in zip(graph.targets[start:end],
+                                                        graph.weights[start:end])}
+        assert neighbors == {v: d["weight"] for v, d in G[u].items()}
+
+
+def test_directed():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from([(0, 1, 1), (1, 2, 1)])
+    graph = CSRGraph.from_networkx(G)
+    assert graph.offsets.tolist() == [0, 1, 2, 2]
+
+
+@pytest.mark.parametrize("weight", [0, -1, 1.5])
+def test_invalid_weights(weight):
+    G = nx.Graph()
+    G.add_edge(0, 1, weight=weight)
+    with pytest.raises(ValueError):
+        CSRGraph.from_networkx(G)
+
+
+def test_reverse():
+    G = nx.DiGraph()
+    G.add_weighted_edges_from([("a", "b", 2), ("b", "c", 3), ("a", "c", 7)])
+    graph = CSRGraph.from_networkx(G)
+    reverse = graph.reverse
+    edges = {(graph.nodes[i], graph.nodes[int(j)], int(w))
+             for i in range(reverse.num_nodes)
+             for j, w in zip(reverse.targets[reverse.offsets[i]:reverse.offsets[i + 1]],
+                             reverse.weights[reverse.offsets[i]:reverse.offsets[i + 1]])}
+    assert edges == {("b", "a", 2), ("c", "b", 3), ("c", "a", 7)}
+    undirected = CSRGraph.from_networkx(G.to_undirected())
+    assert undirected.reverse is undirected
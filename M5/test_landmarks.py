@@ -0,0 +1,88 @@
+import random
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from dial import SearchStats, dial_distance
+from graph import CSRGraph
+from landmarks import LandmarkOracle
+from utils import generate_complete_weighted_graph, generate_connected_weighted_graph
+
+
+@pytest.mark.parametrize("generate", [generate_complete_weighted_graph,
+                                      generate_connected_weighted_graph])
+def test_distance(generate):
+    G = generate(n=200, max_edge_weight=10)
+    oracle = LandmarkOracle(G, num_landmarks=4)
+    rng = random.Random(0)
+    for _ in range(50):
+        s, t = rng.randrange(200), rng.randrange(200)
+        assert oracle.distance(s, t) == nx.dijkstra_path_length(G, s, t)
+
+
+def test_lower_bounds():
+    G = generate_connected_weighted_graph(n=200, max_edge_weight=10)
+    oracle = LandmarkOracle(G)
+    expected = nx.single_source_dijkstra_path_length(G, 7)
+    bounds = oracle.lower_bounds(7)
+    assert bounds[7] == 0
+    assert all(bounds[v] <= expected[v] for v in G)
+    # A landmark's own table is exact.
+    landmark = oracle.landmarks[0]
+    assert oracle.lower_bounds(landmark)[oracle.graph.index[7]] == expected[landmark]
+
+
+def test_directed():
+    G = nx.gnp_random_graph(300, 0.02, seed=1, directed=True)
+    for u, v in G.edges:
+        G[u][v]["weight"] = (u * 7 + v * 3) % 10 + 1
+    oracle = LandmarkOracle(G, num_landmarks=6)
+    for s in range(0, 300, 37):
+        expected = nx.single_source_dijkstra_path_length(G, s)
+        for t in range(300):
+            assert oracle.distance(s, t) == expected.get(t, float("inf"))
+
+
+def test_disconnected():
+    G = nx.Graph()
+    G.add_weighted_edges_from([("a", "b", 3), ("b", "c", 1), ("x", "y", 2)])
+    oracle = LandmarkOracle(G, num_landmarks=2)
+    # The second landmark goes to the component the first one does not reach.
+    assert {oracle.landmarks[0] in "abc", oracle.landmarks[1] in "abc"} == {True, False}
+    assert oracle.distance("a", "c") == 4
+    assert oracle.distance("a", "y") == float("inf")
+    assert oracle.distance("x", "x") == 0
+
+
+def test_fewer_settled():
+    G = nx.grid_2d_graph(60, 60)
+    rng = random.Random(0)
+    for u, v in G.edges:
+        G[u][v]["weight"] = rng.randint(1, 10)
+    graph = CSRGraph.from_networkx(G)
+    oracle = LandmarkOracle(graph)
+    guided, plain = SearchStats(), SearchStats()
+    nodes = list(G)
+    for _ in range(20):
+        s, t = rng.choice(nodes), rng.choice(nodes)
+        assert oracle.distance(s, t, stats=guided) == dial_distance(graph, s, t, stats=plain)
+    assert guided.settled < plain.settled / 3
+
+
+def test_cache():
+    G = generate_connected_weighted_graph(n=100, max_edge_weight=10)
+    oracle = LandmarkOracle(G, num_landmarks=2, cache_size=2)
+    for source in (0, 1, 2):
+        assert oracle.single_source(source) is oracle.single_source(source)
+    assert list(oracle._cache) == [1, 2]
+    oracle.single_source(1)
+    oracle.single_source(3)
+    assert list(oracle._cache) == [1, 3]
+    stats = SearchStats()
+    expected = nx.single_source_dijkstra_path_length(G, 3)
+    # Queries from or to a cached source are answered from the cache.
+    assert [oracle.distance(3, t, stats=stats) for t in G] == [expected[t] for t in G]
+    assert [oracle.distance(t, 3, stats=stats) for t in G] == [expected[t] for t in G]
+    assert stats.settled == 0
+    assert np.array_equal(oracle.single_source(3), [expected[t] for t in G])
@@ -0,0 +1,57 @@
+import heapq
+import random
+
+import pytest
+
+from radix_heap import RadixHeap
+
+
+@pytest.mark.parametrize("max_gap", [0, 1, 7, 1000, 100_000])
+def test_matches_heap(max_gap):
+    # Dijkstra-like use: priorities at most max_gap above the last popped one,
+    # with some priorities raised as well as lowered.
+    rng = random.Random(max_gap)
+    queue, heap, priority = RadixHeap(max_gap=max_gap), [], {}
+    current = 0
+    for _ in range(20000):
+        if priority and rng.random() < 0.4:
+            while heap[0][0] != priority.get(heap[0][1]):
+                heapq.heappop(heap)
+            assert queue.peek()[1] == heap[0][0]
+            item, current = queue.pop()
+            assert current == heap[0][0] == queue.current
+            assert priority.pop(item) == current
+        else:
+            item = rng.randrange(100)
+            new_priority = current + rng.randint(0, max_gap)
+            if item in priority and priority[item] <= new_priority and rng.random() < 0.8:
+                continue
+            queue.push(item, new_priority)
+            priority[item] = new_priority
+            heapq.heappush(heap, (new_priority, item))
+        assert len(queue) == len(priority)
+
+
+def test_buckets():
+    queue = RadixHeap(max_gap=100_000)
+    assert len(queue._buckets) == 19
+    for item in range(1000):
+        queue.push(item, 100_000 - item)
+    assert [queue.pop()[1] for _ in range(1000)] == list(range(99_001, 100_001))
+    with pytest.raises(IndexError):
+        queue.pop()
+
+
+def test_priority_window():
+    queue = RadixHeap(max_gap=2)
+    queue.push(0, 5)
+    queue.push(1, 6)
+    with pytest.raises(ValueError):
+        queue.push(2, 8)
+    queue.pop()
+    with pytest.raises(ValueError):
+        queue.push(2, 4)
+    queue.pop()
+    # Once empty, the queue can restart anywhere.
+    queue.push(1, 4)
+    assert 1 in queue and queue.pop() == (1, 4)
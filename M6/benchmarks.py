@@ -0,0 +1,241 @@
+"""Benchmarks for the edge scheduling of segment_image, on wave.png and a 4K synthetic image.
+
+segment_image processes the edges of the 8-neighbor pixel graph from the lightest to
+the heaviest. Every scheduler orders the edges of an image by weight: the general
+comparison sort over edge tuples, NumPy's default sort, and the counting sort of
+edge_buckets. For each image, the suite reports the time and the peak memory allocated
+by every scheduler, its speedup over the comparison sort, and the time segment_image
+takes in total.
+
+Examples
+--------
+    python3 benchmarks.py                           # wave.png and 3840 x 2160
+    python3 benchmarks.py --images wave.png --k 500 --json bench.json
+    python3 benchmarks.py --schedulers argsort buckets --no-segment
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from segment import edge_buckets, image_edges, segment_image
+from utils import load_image_as_grayscale_array
+
+IMAGES = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "wave.png"), "4k"]
+
+# Size (rows, columns) of the synthetic images
+SYNTHETIC_SHAPES = {"4k": (2160, 3840), "1080p": (1080, 1920), "small": (64, 96)}
+
+# The comparison sort over edge tuples takes several GB of memory on larger images,
+# so it is skipped on them.
+SORTED_MAX_EDGES = 10_000_000
+
+K = 1000
+
+# Timed runs of every scheduler, of which the fastest is reported
+REPEAT = 3
+
+
+def make_image(shape: Tuple[int, int], seed: int = 0) -> np.ndarray:
+    """
+    Returns a grayscale image of smooth gradients and blobs with noise, so that edge
+    weights are mostly small, as in photographs, with a tail up to 255.
+    """
+    rng = np.random.default_rng(seed)
+    rows, cols = shape
+    y, x = np.mgrid[0:rows, 0:cols]
+    image = 96 * (x / max(cols - 1, 1)) + 64 * (y / max(rows - 1, 1))
+    for _ in range(8):
+        cy, cx = rng.integers(0, rows), rng.integers(0, cols)
+        radius = rng.uniform(0.05, 0.25) * min(rows, cols)
+        image += np.where((y - cy) ** 2 + (x - cx) ** 2 < radius ** 2, 80, 0)
+    image += rng.normal(0, 4, shape)
+    return np.clip(image, 0, 255).astype(np.uint8)
+
+
+def load_image(name: str) -> np.ndarray:
+    """Returns the synthetic image called name, or the image in the file name."""
+    if name in SYNTHETIC_SHAPES:
+        return make_image(SYNTHETIC_SHAPES[name])
+    return load_image_as_grayscale_array(name).astype(np.uint8)
+
+
+def _sorted(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Comparison sort of (u, v, weight) tuples by weight, as with a NetworkX graph."""
+    edges = sorted(zip(sources.tolist(), targets.tolist(), weights.tolist()),
+                   key=lambda edge: edge[2])
+    return np.array([edge[2] for edge in edges], dtype=np.uint8)
+
+
+def _argsort(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    return weights[np.argsort(weights)]
+
+
+def _buckets(sources: np.ndarray, targets: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    order, _ = edge_buckets(weights)
+    return weights[order]
+
+
+# Name -> function of the edges returning their weights in the order they are scheduled
+SCHEDULERS: Dict[str, Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]] = {
+    "sorted": _sorted,
+    "argsort": _argsort,
+    "buckets": _buckets,
+}
+BASELINE = "sorted"
+
+
+def _run(function: Callable, *args, measure_memory: bool,
+         repeat: int = 1) -> Tuple[Any, float, Optional[int]]:
+    """
+    Calls function(*args) and returns its result, best wall time over repeat calls and
+    peak allocated bytes.
+
+    Memory is measured in another call, so tracing does not slow down the timed ones.
+    """
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    peak = None
+    if measure_memory:
+        tracemalloc.start()
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def benchmark(image: np.ndarray, schedulers: Optional[List[str]] = None,
+              measure_memory: bool = True, repeat: int = REPEAT,
+              sorted_max_edges: int = SORTED_MAX_EDGES) -> List[Dict[str, Any]]:
+    """
+    Runs every scheduler on the edges of image
+
+    Parameters
+    ----------
+    image : np.ndarray
+        Two dimensional grayscale image, whose edges are built before timing
+    schedulers : Optional[List[str]], optional
+        Keys of the schedulers in SCHEDULERS, by default all of them
+    measure_memory : bool, optional
+        Whether to measure peak memory of each scheduler, by default True
+    repeat : int, optional
+        Number of timed runs of each scheduler, by default REPEAT
+    sorted_max_edges : int, optional
+        Skip the comparison sort on images with more edges than this, by default
+        SORTED_MAX_EDGES
+
+    Returns
+    -------
+    results : List[Dict[str, Any]]
+        Best time in seconds and, if measured, peak memory in MB of every scheduler
+
+    Raises
+    ------
+    AssertionError
+        If some scheduler does not order the edges by weight
+    """
+    edges = image_edges(image)
+    expected = np.sort(edges[2])
+    results = []
+    for name in schedulers or SCHEDULERS:
+        if name == "sorted" and len(expected) > sorted_max_edges:
+            continue
+        scheduled, elapsed, peak = _run(SCHEDULERS[name], *edges,
+                                        measure_memory=measure_memory, repeat=repeat)
+        assert np.array_equal(scheduled, expected), f"{name} does not sort the edges"
+        result = {"scheduler": name, "seconds": elapsed}
+        if measure_memory:
+            result["peak_mb"] = peak / 1e6
+        results.append(result)
+    return results
+
+
+def run_benchmarks(images: List[str] = IMAGES, schedulers: Optional[List[str]] = None,
+                   k: Optional[float] = K, measure_memory: bool = True, repeat: int = REPEAT,
+                   sorted_max_edges: int = SORTED_MAX_EDGES,
+                   verbose: bool = False) -> List[Dict[str, Any]]:
+    """
+    Benchmarks every scheduler on every image, and segment_image with parameter k
+    unless k is None.
+
+    Returns one result per (image, scheduler); see benchmark. Results also hold the
+    speedup over the baseline when it runs, and the total time of segment_image.
+    """
+    results = []
+    for name in images:
+        image = load_image(name)
+        segment_seconds = num_segments = None
+        if k is not None:
+            segments, segment_seconds, _ = _run(segment_image, k, image, measure_memory=False)
+            num_segments = int(segments.max()) + 1
+        num_edges = len(image_edges(image)[2])
+        runs = benchmark(image, schedulers, measure_memory, repeat, sorted_max_edges)
+        baseline = {run["scheduler"]: run["seconds"] for run in runs}.get(BASELINE)
+        for run in runs:
+            run.update({"image": os.path.basename(name), "rows": image.shape[0],
+                        "cols": image.shape[1], "edges": num_edges})
+            if segment_seconds is not None:
+                run.update({"k": k, "segment_seconds": segment_seconds,
+                            "segments": num_segments})
+            if baseline is not None:
+                run["speedup"] = baseline / run["seconds"]
+            results.append(run)
+            if verbose:
+                print(format_result(run), flush=True)
+    return results
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    line = (f"{result['image']:>10} {result['rows']:>5} x {result['cols']:<5} "
+            f"E {result['edges']:>10,}: {result['scheduler']:>8} {result['seconds']:8.4f} s")
+    if "speedup" in result:
+        line += f" ({result['speedup']:6.2f}x {BASELINE})"
+    if "peak_mb" in result:
+        line += f" | peak {result['peak_mb']:7.1f} MB"
+    if "segment_seconds" in result:
+        line += (f" | segment_image {result['segment_seconds']:7.2f} s, "
+                 f"{result['segments']:,} segments")
+    return line
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--images", nargs="+", default=IMAGES,
+                        help="image files, or synthetic images: " + ", ".join(SYNTHETIC_SHAPES))
+    parser.add_argument("--schedulers", nargs="+", choices=list(SCHEDULERS),
+                        help="schedulers to run")
+    parser.add_argument("--k", type=float, default=K, help="parameter k of segment_image")
+    parser.add_argument("--no-segment", action="store_true", help="skip timing segment_image")
+    parser.add_argument("--sorted-max-edges", type=int, default=SORTED_MAX_EDGES,
+                        help="skip the comparison sort on images with more edges than this")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help="timed runs of every scheduler, of which the fastest is reported")
+    parser.add_argument("--no-memory", action="store_true", help="skip peak memory measurement")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.images, args.schedulers, None if args.no_segment else args.k,
+                             not args.no_memory, args.repeat, args.sorted_max_edges,
+                             verbose=True)
+    if args.json:
+        report = {
+            "python": sys.version,
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
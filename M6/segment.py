@@ -1,6 +1,6 @@
-from typing import List, Hashable
+from array import array
+from typing import List, Hashable, Sequence, Tuple, Union
 
-import networkx as nx
 import numpy as np
 
 #import utils
@@ -28,87 +28,243 @@ def segment_image(k: int, image: np.ndarray) -> np.ndarray:
     """
     assert len(image.shape) == 2
 
-
-    # TODO
-
-    # Initialize a graph G:
-    G = nx.Graph()
     rows, cols = image.shape
+    sources, targets, weights = image_edges(image)
+    # Sort edges by weight, and group the edges of every weight
+    if weights.dtype == np.uint8:
+        order, bounds = edge_buckets(weights)
+        values = np.flatnonzero(np.diff(bounds))
+        starts, ends = bounds[values], bounds[values + 1]
+    else:
+        order = np.argsort(weights, kind='stable')
+        values, starts = np.unique(weights[order], return_index=True)
+        ends = np.append(starts[1:], len(weights))
+
+    # Vertices are the flat pixel indices i * cols + j
+    uf = ArrayUnionFind(image)
+
+    # Edges of weight values[i] are order[starts[i]:ends[i]], in the order image_edges built them
+    for weight, start, end in zip(values.tolist(), starts.tolist(), ends.tolist()):
+        bucket = order[start:end]
+        for u, v in zip(sources[bucket].tolist(), targets[bucket].tolist()):
+            if uf.find(u) != uf.find(v):  # Check if u and v belong to different segments
+                threshold = min(uf.max_diff(u) + k / uf.size(u), uf.max_diff(v) + k / uf.size(v))  # Compute threshold weight
+                if weight <= threshold:
+                    uf.union(u, v) # Call union to combine u and v into one segment
+
+            #Else: Do nothing
+
+    # Segmented Image: Each entry is an integer label for a segment, numbered from 0
+    roots = np.fromiter(map(uf.find, range(rows * cols)), dtype=np.int32, count=rows * cols)
+    _, labels = np.unique(roots, return_inverse=True)
+    return labels.reshape(rows, cols)
+
+
+# Offsets (row, column) of the neighbors every pixel links to. Every edge of the
+# 8-neighbor graph links a pixel to exactly one of these neighbors.
+FORWARD_NEIGHBORS = [(0, 1), (1, -1), (1, 0), (1, 1)]
+
+
+def image_edges(image: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the edges between the 8 neighbors of every pixel of an image, each edge once.
 
-    # Initialize the vertices in the graph
-    for i in range(rows):
-        for j in range(cols):
-            G.add_node((i, j), value=image[i, j])
-
-    # Compute VALID edges, check for corner and edge cases
-    for i in range(rows):
-        for j in range(cols):
-            neighbors = [(i-1, j-1), # Top left
-                         (i-1, j),   # Top
-                         (i-1, j+1), # Top right
-                         (i, j-1),   # Left
-                         (i, j+1),   # Right
-                         (i+1, j-1), # Bottom left
-                         (i+1, j),   # Bottom
-                         (i+1, j+1)] # Bottom Right
-            
-            # For weight computations:
-            for x, y in neighbors:
-                if 0 <= x and x < rows and 0 <= y and y < cols: # Check boundary conditions
-                    weight = abs(image[i, j] - image[x, y])  # Compute weights 
-                    G.add_edge((i, j), (x, y), weight=weight)  # Add weighted edge
-
-    sorted_edges = sorted(G.edges(data=True), key=lambda edge: edge[2]['weight']) # Sort edges by weight
-    
-    vertices = [(x, y) for x in range(rows) for y in range(cols)]     # Initilize vertices
-    values = [image[x, y] for x in range(rows) for y in range(cols)]  # Initilize greyscale values
+    Each direction of FORWARD_NEIGHBORS takes the image and the image shifted by that
+    offset, so the edges come out as whole arrays without a Python loop over pixels.
 
-    uf = UnionFind(vertices, values) # Call unionfind
+    Parameters
+    ----------
+    image : np.ndarray
+        Two dimensions NumPy array representing a grayscale image
 
-    for u, v, weights in sorted_edges:
-        if uf.find(u) != uf.find(v):  # Check if u and v belong to different segments
-            weight = weights['weight'] 
-            threshold = min(uf.max_diff(u) + k / uf.size(u), uf.max_diff(v) + k / uf.size(v))  # Compute threshold weight
-            if weight <= threshold:
-                uf.union(u, v) # Call union to combine u and v into one segment
+    Returns
+    -------
+    sources : np.ndarray
+        Flat index i * cols + j of the first pixel of every edge
+    targets : np.ndarray
+        Flat index of the second pixel of every edge
+    weights : np.ndarray
+        Absolute difference of the grayscale values of the two pixels. This is uint8 for
+        images of integers from 0 to 255, and int64 or float64 for other images.
+
+    Examples
+    --------
+    >>> sources, targets, weights = image_edges(np.array([[0, 10], [30, 60]]))
+    >>> sources.tolist(), targets.tolist(), weights.tolist()
+    ([0, 2, 1, 0, 1, 0], [1, 3, 2, 2, 3, 3], [10, 30, 20, 30, 50, 60])
+    """
+    rows, cols = image.shape
+    index = np.arange(rows * cols, dtype=np.int32 if rows * cols < 2 ** 31 else np.int64)
+    index = index.reshape(rows, cols)
+    grayscale = image.size == 0 or (image.min() >= 0 and image.max() <= 255)
+    if image.dtype.kind in "iub" and grayscale:
+        pixels, dtype = image.astype(np.int16), np.uint8
+    elif image.dtype.kind in "iub":
+        pixels, dtype = image.astype(np.int64), np.int64
+    else:
+        pixels, dtype = image.astype(np.float64), np.float64
+    sources, targets, weights = [], [], []
+    for di, dj in FORWARD_NEIGHBORS:
+        # Pixels (i, j) with a neighbor (i + di, j + dj) in the image, and those neighbors
+        first = (slice(0, rows - di), slice(max(-dj, 0), cols - max(dj, 0)))
+        second = (slice(di, rows), slice(max(dj, 0), cols + min(dj, 0)))
+        sources.append(index[first].ravel())
+        targets.append(index[second].ravel())
+        weights.append(np.abs(pixels[first] - pixels[second]).astype(dtype).ravel())
+    return np.concatenate(sources), np.concatenate(targets), np.concatenate(weights)
+
+
+def edge_buckets(weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group edges by weight with a stable counting sort
 
-        #Else: Do nothing
+    Edge weights are grayscale differences, so there are at most 256 distinct ones. NumPy
+    sorts 8-bit integers stably with a radix sort, in linear time, and the size of every
+    bucket is counted with np.bincount.
 
+    Parameters
+    ----------
+    weights : np.ndarray
+        One dimensional array of uint8 edge weights, as from image_edges
 
-    # For mapping uf segments to the 2D array
-                
-    seg_img = np.zeros_like(image)
-    seg_label = {}
-    mapping = {}
+    Returns
+    -------
+    order : np.ndarray
+        Indices of the edges sorted by weight. Edges of the same weight keep their order.
+    bounds : np.ndarray
+        Array of length max(weights) + 2. The edges of weight w are
+        order[bounds[w]:bounds[w + 1]].
+
+    Examples
+    --------
+    >>> order, bounds = edge_buckets(np.array([2, 0, 2, 1, 0], dtype=np.uint8))
+    >>> order.tolist(), bounds.tolist()
+    ([1, 4, 3, 0, 2], [0, 2, 3, 5])
+    """
+    order = np.argsort(weights, kind='stable')
+    counts = np.bincount(weights, minlength=int(weights.max(initial=0)) + 1)
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    return order, bounds
 
-    # Initialize vertices from our graph G:
-    for u in G.nodes:
-        seg_label[u] =  uf.find(u)
 
-    # Map vertices to their value
-    for data, v in enumerate(seg_label.values()):
-        mapping[v] = data
+class ArrayUnionFind:
+    """
+    Union-Find data structure over the vertices 0, ..., n - 1, stored in flat buffers
 
-    # Segmented Image: Each entry is an integer label for a segment
-    for (x, y), label in seg_label.items():
-        seg_img[x, y] = mapping[label]
+    Each buffer holds one machine integer per vertex, so there are no per-vertex Python
+    objects. `find` halves paths iteratively, so it never recurses, and `union` links the
+    smaller segment under the larger one, which keeps paths O(log n) long.
 
-    return seg_img
-    
+    Attributes
+    ----------
+    parent : np.ndarray
+        int32 parent of every vertex, a view of the buffer used by find()
+    sizes : np.ndarray
+        int32 number of vertices in the segment of every representative
+    min_values : np.ndarray
+        Minimum value in the segment of every representative, uint8 for grayscale values
+    max_values : np.ndarray
+        Maximum value in the segment of every representative, uint8 for grayscale values
+
+    Examples
+    --------
+    >>> uf = ArrayUnionFind([10, 200, 40])
+    >>> uf.union(0, 2)
+    >>> uf.find(2) == uf.find(0), uf.size(2), uf.max_diff(0)
+    (True, 2, 30)
+    >>> uf.min_values.dtype
+    dtype('uint8')
+    """
+    def __init__(self, values: Union[np.ndarray, Sequence]):
+        """
+        Parameters
+        ----------
+        values : Union[np.ndarray, Sequence]
+            Grayscale value of each vertex. Values other than integers from 0 to 255
+            are stored as 64-bit integers or floats.
+        """
+        values = np.asarray(values).ravel()
+        n = values.size
+        if n >= 2 ** 31:
+            raise ValueError("At most 2 ** 31 - 1 vertices are supported.")
+        if values.dtype.kind not in "iub":
+            typecode = "d"
+        elif n == 0 or (values.min() >= 0 and values.max() <= 255):
+            typecode = "B"
+        else:
+            typecode = "q"
+        values = values.astype(typecode).tobytes()
+        self._parent = array("i", np.arange(n, dtype=np.int32).tobytes())
+        self._sizes = array("i", np.ones(n, dtype=np.int32).tobytes())
+        self._min_values = array(typecode, values)
+        self._max_values = array(typecode, values)
+
+    @property
+    def parent(self) -> np.ndarray:
+        return np.frombuffer(self._parent, dtype=np.int32)
+
+    @property
+    def sizes(self) -> np.ndarray:
+        return np.frombuffer(self._sizes, dtype=np.int32)
+
+    @property
+    def min_values(self) -> np.ndarray:
+        return np.frombuffer(self._min_values, dtype=self._min_values.typecode)
+
+    @property
+    def max_values(self) -> np.ndarray:
+        return np.frombuffer(self._max_values, dtype=self._max_values.typecode)
+
+    def find(self, x: int) -> int:
+        """
+        Given a vertex `x`, return the representative of the segment it belongs
+        """
+        parent = self._parent
+        while parent[x] != x:
+            # Path halving: point x to its grandparent and move there.
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, x: int, y: int) -> None:
+        """
+        Combines the segments of `x` and `y` into one segment
+        """
+        x = self.find(x)
+        y = self.find(y)
+        if x == y:
+            return
+        sizes = self._sizes
+        if sizes[x] < sizes[y]:
+            x, y = y, x
+        self._parent[y] = x
+        sizes[x] += sizes[y]
+        if self._min_values[y] < self._min_values[x]:
+            self._min_values[x] = self._min_values[y]
+        if self._max_values[y] > self._max_values[x]:
+            self._max_values[x] = self._max_values[y]
+
+    def max_diff(self, x: int) -> int:
+        """
+        Given a vertex, returns the largest difference in values between
+        any vertices in the segment `x` belongs to
+        """
+        root = self.find(x)
+        return self._max_values[root] - self._min_values[root]
+
+    def size(self, x: int) -> int:
+        """
+        Given a vertex, returns the number of vertices in its segment
+        """
+        return self._sizes[self.find(x)]
 
 
 class UnionFind:
     """
-    Union-Find data structure
+    Union-Find data structure over any hashable vertices
 
-    Attributes
-    ----------
-    parent : Dict[Hashable, Hashable]
-        Dictionary pointing to a vertex to its representative
-    min_values : Dict[Hashable, any]
-        Minimum value in each segment
-    max_values : Dict[Hashable, any]
-        Maximum value in each segment
+    This wraps an `ArrayUnionFind` over the positions of the vertices in the list
+    they are given in.
 
     Methods
     -------
@@ -119,6 +275,8 @@ class UnionFind:
     max_diff(x: Hashable) -> int
         Given a vertex, returns the largest difference in values between
         any vertices in the segment `x` belongs to
+    size(x: Hashable) -> int
+        Given a vertex, returns the number of vertices in its segment
     """
     def __init__(self, vertices: List[Hashable], values: List):
         """
@@ -129,17 +287,9 @@ class UnionFind:
         values : List
             Grayscale values for each vertex
         """
-        # the parent of x, used by find() to retrieve x's segment
-        self.parent = {x: x for x in vertices}
-        # the smallest value in x's segment
-        self.min_values = {x: values[idx] for idx, x in enumerate(vertices)}
-        # the largest value in x's segment
-        self.max_values = {x: values[idx] for idx, x in enumerate(vertices)}
-
-
-        # initialize the rank for each vertex
-        self.rank = {x: 1 for x in vertices}
-        
+        self.vertices = list(vertices)
+        self.index = {x: i for i, x in enumerate(self.vertices)}
+        self.segments = ArrayUnionFind(values)
 
     def find(self, x: Hashable) -> Hashable:
         """
@@ -155,14 +305,7 @@ class UnionFind:
         representative : Hashable
             The representative of the segment that `x` belongs to
         """
-        # TODO: Make sure you use path compression
-        ...
-    
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])  # Path compression
-        return self.parent[x]
-
-
+        return self.vertices[self.segments.find(self.index[x])]
 
     def union(self, x: Hashable, y: Hashable) -> None:
         """
@@ -175,28 +318,7 @@ class UnionFind:
         y : Hashable
             Another vertex
         """
-        # TODO: Combine the two segments into one if they are different
-        #       Make sure to update al relevant auxiliary variables
-        ...
-        x_p = self.find(x)
-        y_p = self.find(y)
-
-        if x_p != y_p:
-            if self.rank[x_p] < self.rank[y_p]:   # To see which tree to merge to
-                self.parent[x_p] = y_p  # reassign parent
-                self.rank[y_p] += self.rank[x_p]  # update rank
-                self.min_values[y_p] = min(self.min_values[x_p], self.min_values[y_p]) # Update min values
-                self.max_values[y_p] = max(self.max_values[x_p], self.max_values[y_p]) # Update max values
-            else:
-                self.parent[y_p] = x_p
-                self.rank[x_p] += self.rank[y_p]
-                self.min_values[x_p] = min(self.min_values[x_p], self.min_values[y_p]) # Update min values
-                self.max_values[x_p] = max(self.max_values[x_p], self.max_values[y_p]) # Update max values
-
-                if self.rank[x_p] == self.rank[y_p]:  
-                    self.rank[x_p] += 1
-
-
+        self.segments.union(self.index[x], self.index[y])
 
     def max_diff(self, x: Hashable) -> int:
         """
@@ -213,15 +335,13 @@ class UnionFind:
         diff : int
             Largest difference in values between any vertices in the segment `x` belongs to
         """
-        return self.max_values[self.find(x)] - self.min_values[self.find(x)]
-
+        return self.segments.max_diff(self.index[x])
 
-    # Helper function find the the size (rank) of the vertex's segment
     def size(self, x: Hashable) -> int:
-        root = self.find(x)
-        return self.rank[root]
-    
-    
+        """
+        Given a vertex, returns the number of vertices in its segment
+        """
+        return self.segments.size(self.index[x])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+import segment
+
+
+class ReferenceUnionFind:
+    def __init__(self, values):
+        self.segments = [{i} for i in range(len(values))]
+        self.values = list(values)
+
+    def segment(self, x):
+        return next(segment for segment in self.segments if x in segment)
+
+    def union(self, x, y):
+        a, b = self.segment(x), self.segment(y)
+        if a is not b:
+            self.segments.remove(b)
+            a |= b
+
+    def max_diff(self, x):
+        values = [self.values[i] for i in self.segment(x)]
+        return max(values) - min(values)
+
+
+def test_buffers():
+    uf = segment.ArrayUnionFind(np.array([[3, 250], [0, 7]]))
+    assert uf.parent.dtype == np.int32 and uf.sizes.dtype == np.int32
+    assert uf.min_values.dtype == uf.max_values.dtype == np.uint8
+    assert uf.parent.tolist() == [0, 1, 2, 3]
+    assert uf.max_values.tolist() == [3, 250, 0, 7]
+
+
+@pytest.mark.parametrize("values, dtype", [([-1, 300], np.int64), ([0.5, 2.0], np.float64)])
+def test_wide_values(values, dtype):
+    uf = segment.ArrayUnionFind(values)
+    assert uf.min_values.dtype == dtype
+    uf.union(0, 1)
+    assert uf.max_diff(1) == values[1] - values[0]
+
+
+def test_random_unions():
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 256, 200)
+    uf = segment.ArrayUnionFind(values)
+    reference = ReferenceUnionFind(values.tolist())
+    for x, y in rng.integers(0, 200, (300, 2)).tolist():
+        uf.union(x, y)
+        reference.union(x, y)
+        for z in (x, y):
+            assert uf.size(z) == len(reference.segment(z))
+            assert uf.max_diff(z) == reference.max_diff(z)
+    for segment_ in reference.segments:
+        assert len({uf.find(x) for x in segment_}) == 1
+    assert len({uf.find(x) for x in range(200)}) == len(reference.segments)
+
+
+def test_union_by_size():
+    # Unions of singletons into one segment keep every path one link long.
+    uf = segment.ArrayUnionFind([0] * 100)
+    for x in range(1, 100):
+        uf.union(x, 0)
+    root = uf.find(0)
+    assert (uf.parent == root).all()
@@ -0,0 +1,33 @@
+import numpy as np
+
+import benchmarks
+
+
+def test_make_image():
+    image = benchmarks.make_image((30, 40))
+    assert image.shape == (30, 40) and image.dtype == np.uint8
+    assert np.array_equal(image, benchmarks.make_image((30, 40)))
+
+
+def test_run_benchmarks():
+    results = benchmarks.run_benchmarks(["small"], k=100, measure_memory=True, repeat=1)
+    assert [result["scheduler"] for result in results] == list(benchmarks.SCHEDULERS)
+    for result in results:
+        assert result["edges"] == 4 * 64 * 96 - 3 * (64 + 96) + 2
+        assert result["seconds"] > 0 and result["peak_mb"] >= 0 and result["speedup"] > 0
+        assert result["segments"] >= 1
+        benchmarks.format_result(result)
+
+
+def test_skip_sorted():
+    results = benchmarks.run_benchmarks(["small"], k=None, measure_memory=False, repeat=1,
+                                        sorted_max_edges=100)
+    assert [result["scheduler"] for result in results] == ["argsort", "buckets"]
+    assert all("speedup" not in result and "segments" not in result for result in results)
+
+
+def test_main(tmp_path):
+    output = tmp_path / "bench.json"
+    benchmarks.main(["--images", "small", "--repeat", "1", "--no-memory",
+                     "--json", str(output)])
+    assert output.exists()
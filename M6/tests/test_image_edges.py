@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+import segment
+
+
+def brute_force_edges(image):
+    rows, cols = image.shape
+    edges = {}
+    for i in range(rows):
+        for j in range(cols):
+            for x in (i - 1, i, i + 1):
+                for y in (j - 1, j, j + 1):
+                    if (x, y) != (i, j) and 0 <= x < rows and 0 <= y < cols:
+                        edge = frozenset([i * cols + j, x * cols + y])
+                        edges[edge] = abs(image[i, j].item() - image[x, y].item())
+    return edges
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 5), (5, 1), (2, 2), (7, 9)])
+def test_image_edges(shape):
+    image = np.random.default_rng(0).integers(0, 256, shape)
+    sources, targets, weights = segment.image_edges(image)
+    assert weights.dtype == np.uint8
+    edges = {frozenset([u, v]): w for u, v, w in
+             zip(sources.tolist(), targets.tolist(), weights.tolist())}
+    # Every edge comes out once.
+    assert len(edges) == len(sources)
+    assert edges == brute_force_edges(image)
+
+
+def test_uint8_image():
+    image = np.array([[0, 255], [255, 0]], dtype=np.uint8)
+    _, _, weights = segment.image_edges(image)
+    assert sorted(weights.tolist()) == [0, 0, 255, 255, 255, 255]
+
+
+@pytest.mark.parametrize("size", [0, 1, 1000])
+def test_edge_buckets(size):
+    weights = np.random.default_rng(size).integers(0, 256, size).astype(np.uint8)
+    order, bounds = segment.edge_buckets(weights)
+    assert order.tolist() == np.argsort(weights, kind='stable').tolist()
+    assert bounds[0] == 0 and bounds[-1] == size
+    for weight in range(len(bounds) - 1):
+        assert (weights[order[bounds[weight]:bounds[weight + 1]]] == weight).all()
+        assert bounds[weight + 1] - bounds[weight] == (weights == weight).sum()
+
+
+def brute_force_segments(k, image):
+    # The baseline: Kruskal over the edges in the order of a stable sort by exact weight.
+    edges = sorted(brute_force_edges(image).items(), key=lambda edge: edge[1])
+    uf = segment.UnionFind(list(range(image.size)), image.ravel().tolist())
+    for (u, v), weight in ((tuple(sorted(edge)), w) for edge, w in edges):
+        if uf.find(u) != uf.find(v):
+            if weight <= min(uf.max_diff(u) + k / uf.size(u), uf.max_diff(v) + k / uf.size(v)):
+                uf.union(u, v)
+    return len({uf.find(x) for x in range(image.size)})
+
+
+@pytest.mark.parametrize("image, dtype", [
+    (np.array([[0.2, 0.9], [0.9, 0.2]]), np.float64),
+    (np.array([[0, 300], [300, 0]]), np.int64),
+    (np.array([[-5, 250], [7, 0]]), np.int64),
+])
+def test_wide_images(image, dtype):
+    sources, targets, weights = segment.image_edges(image)
+    assert weights.dtype == dtype
+    edges = {frozenset([u, v]): w for u, v, w in
+             zip(sources.tolist(), targets.tolist(), weights.tolist())}
+    assert edges == pytest.approx(brute_force_edges(image))
+    segments = segment.segment_image(0, image)
+    assert segments.max() + 1 == brute_force_segments(0, image)
+
+
+def test_float_image_segments():
+    # Differences below 1 must not be truncated to 0.
+    image = np.array([[0.2, 0.9], [0.9, 0.2]])
+    assert segment.segment_image(0, image).tolist() == [[0, 1], [1, 0]]